@@ -2,8 +2,9 @@ from .app import app
 
 pass
 
-from .annotations import Annotations
-from .client import Client
+from .annotation_columns import AnnotationColumns
+from .annotations import Annotations, CVATLinks
+from .client import AsyncClient, Client, FrameCache
 from .types import (
     Attribute,
     Box,
@@ -0,0 +1,806 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from pydantic import BaseModel
+
+from . import annotations_dataset
+from .annotations import (
+    SHAPE_FIELD_CONVERTERS,
+    SHAPE_TAGS,
+    Annotations,
+    _AnnotationsFilter,
+    _convert_shape_fields,
+    _iterparse_elements,
+    _load_job_status,
+    _parse_project,
+    _parse_tasks,
+)
+from .annotations_dataset import DatasetFormat
+from .annotations_writer import SHAPE_ELEMENTS
+from .types import (
+    Attribute,
+    Box,
+    Ellipse,
+    ImageAnnotation,
+    JobStatus,
+    Mask,
+    Polygon,
+    Polyline,
+    Project,
+    Tag,
+    Task,
+)
+from .xml_backend import XMLBackend, XMLBackendName
+
+IMAGE_FIELDS = ("id", "name", "subset", "task_id", "job_id", "width", "height")
+
+GEOMETRY_FIELDS = {
+    "box": ("xtl", "ytl", "xbr", "ybr"),
+    "polygon": (),
+    "mask": ("top", "left", "height", "width"),
+    "polyline": (),
+    "ellipse": ("cx", "cy", "rx", "ry"),
+    "tag": (),
+}
+
+
+class AttributeColumns(BaseModel, arbitrary_types_allowed=True):
+    """Attributes of all shapes of one kind.
+
+    The attributes of shape `i` are the rows `offsets[i]:offsets[i + 1]`.
+
+    Attributes:
+        offsets: Start row of each shape's attributes (int64), one longer than
+            the number of shapes
+        name: Attribute names (object array of str)
+        value: Attribute values (object array of str or None)
+        spec_id: CVAT attribute spec ids, -1 where unset (int64)
+    """
+
+    offsets: np.ndarray
+    name: np.ndarray
+    value: np.ndarray
+    spec_id: np.ndarray
+
+    def attributes(self, index: int) -> List[Attribute]:
+        """Attributes of the shape at row `index`."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return [
+            Attribute(name=name, value=value, spec_id=None if spec_id < 0 else spec_id)
+            for name, value, spec_id in zip(
+                self.name[start:end].tolist(),
+                self.value[start:end].tolist(),
+                self.spec_id[start:end].tolist(),
+            )
+        ]
+
+
+class TagColumns(BaseModel, arbitrary_types_allowed=True):
+    """Tags of all images, one row per tag.
+
+    Rows are stored in image order, so the tags of an image are a contiguous
+    range of rows (see `rows`).
+
+    Attributes:
+        image_index: Row of the image in `AnnotationColumns.images` (int32)
+        label: Index into `AnnotationColumns.labels` (int32)
+        source: Index into `AnnotationColumns.sources` (int32)
+        attributes: Attributes of each row
+    """
+
+    image_index: np.ndarray
+    label: np.ndarray
+    source: np.ndarray
+    attributes: AttributeColumns
+
+    def __len__(self) -> int:
+        return len(self.image_index)
+
+    def rows(self, image_index: int) -> range:
+        """Rows of the shapes that belong to an image."""
+        start, end = np.searchsorted(
+            self.image_index, [image_index, image_index + 1]
+        ).tolist()
+        return range(start, end)
+
+    def shape(self, index: int, labels: List[str], sources: List[str]) -> Tag:
+        """Convert a row back to a model."""
+        return Tag(**self._fields(index, labels, sources))
+
+    def _fields(
+        self, index: int, labels: List[str], sources: List[str]
+    ) -> Dict[str, Any]:
+        return dict(
+            label=labels[self.label[index]],
+            source=sources[self.source[index]],
+            attributes=self.attributes.attributes(index),
+        )
+
+
+class ShapeColumns(TagColumns):
+    """Common columns of all shapes with geometry.
+
+    Attributes:
+        occluded: Whether the shape is occluded (uint8)
+        z_order: Drawing order (int32)
+    """
+
+    occluded: np.ndarray
+    z_order: np.ndarray
+
+    def _fields(
+        self, index: int, labels: List[str], sources: List[str]
+    ) -> Dict[str, Any]:
+        return dict(
+            super()._fields(index, labels, sources),
+            occluded=self.occluded[index].item(),
+            z_order=self.z_order[index].item(),
+        )
+
+
+class BoxColumns(ShapeColumns):
+    """Bounding boxes, one row per box.
+
+    Attributes:
+        xtl: X-coordinate of the top-left corner (float64)
+        ytl: Y-coordinate of the top-left corner (float64)
+        xbr: X-coordinate of the bottom-right corner (float64)
+        ybr: Y-coordinate of the bottom-right corner (float64)
+    """
+
+    xtl: np.ndarray
+    ytl: np.ndarray
+    xbr: np.ndarray
+    ybr: np.ndarray
+
+    def width(self) -> np.ndarray:
+        return self.xbr - self.xtl
+
+    def height(self) -> np.ndarray:
+        return self.ybr - self.ytl
+
+    def area(self) -> np.ndarray:
+        return self.width() * self.height()
+
+    def shape(self, index: int, labels: List[str], sources: List[str]) -> Box:
+        return Box(
+            **self._fields(index, labels, sources),
+            xtl=self.xtl[index].item(),
+            ytl=self.ytl[index].item(),
+            xbr=self.xbr[index].item(),
+            ybr=self.ybr[index].item(),
+        )
+
+
+class PointColumns(ShapeColumns):
+    """Shapes defined by a list of points.
+
+    The points of shape `i` are the rows `point_offsets[i]:point_offsets[i + 1]`
+    of `points`.
+
+    Attributes:
+        point_offsets: Start row of each shape's points (int64), one longer than
+            the number of shapes
+        points: `(x, y)` coordinates of all shapes (float64, shape `(n, 2)`)
+    """
+
+    point_offsets: np.ndarray
+    points: np.ndarray
+
+    def n_points(self) -> np.ndarray:
+        return np.diff(self.point_offsets)
+
+    def _fields(
+        self, index: int, labels: List[str], sources: List[str]
+    ) -> Dict[str, Any]:
+        start, end = self.point_offsets[index], self.point_offsets[index + 1]
+        return dict(
+            super()._fields(index, labels, sources),
+            points=self.points[start:end].tolist(),
+        )
+
+    def _next_point(self) -> np.ndarray:
+        """Index of the next point, wrapping around at the end of each shape."""
+        has_points = self.n_points() > 0
+        starts = self.point_offsets[:-1][has_points]
+        ends = self.point_offsets[1:][has_points]
+
+        next_point = np.arange(1, len(self.points) + 1)
+        next_point[ends - 1] = starts
+        return next_point
+
+
+class PolygonColumns(PointColumns):
+    """Polygons, one row per polygon (see `PointColumns`)."""
+
+    def area(self) -> np.ndarray:
+        """Polygon areas with the shoelace formula."""
+        x, y = self.points[:, 0], self.points[:, 1]
+        next_point = self._next_point()
+        cross = x * y[next_point] - x[next_point] * y
+        return 0.5 * np.abs(segment_sums(cross, self.point_offsets))
+
+    def shape(self, index: int, labels: List[str], sources: List[str]) -> Polygon:
+        return Polygon(**self._fields(index, labels, sources))
+
+
+class PolylineColumns(PointColumns):
+    """Polylines, one row per polyline (see `PointColumns`)."""
+
+    def length(self) -> np.ndarray:
+        """Total length of the line segments of each polyline."""
+        steps = np.zeros(len(self.points))
+        steps[:-1] = np.hypot(*np.diff(self.points, axis=0).T)
+        # The last point of a polyline does not connect to the next polyline
+        steps[self.point_offsets[1:][self.n_points() > 0] - 1] = 0
+        return segment_sums(steps, self.point_offsets)
+
+    def shape(self, index: int, labels: List[str], sources: List[str]) -> Polyline:
+        return Polyline(**self._fields(index, labels, sources))
+
+
+class MaskColumns(ShapeColumns):
+    """Run-length encoded masks, one row per mask.
+
+    The runs of mask `i` are `rle[rle_offsets[i]:rle_offsets[i + 1]]`. Runs
+    alternate between background and foreground, starting with background.
+
+    Attributes:
+        top: Top coordinate of the mask's bounding box (int32)
+        left: Left coordinate of the mask's bounding box (int32)
+        height: Height of the mask's bounding box (int32)
+        width: Width of the mask's bounding box (int32)
+        rle_offsets: Start of each mask's runs (int64), one longer than the
+            number of masks
+        rle: Run lengths of all masks (uint32)
+    """
+
+    top: np.ndarray
+    left: np.ndarray
+    height: np.ndarray
+    width: np.ndarray
+    rle_offsets: np.ndarray
+    rle: np.ndarray
+
+    def area(self) -> np.ndarray:
+        """Number of foreground pixels of each mask (int64)."""
+        n_runs = np.diff(self.rle_offsets)
+        run_position = np.arange(len(self.rle)) - np.repeat(
+            self.rle_offsets[:-1], n_runs
+        )
+        foreground = np.where(run_position % 2 == 1, self.rle, 0).astype(np.int64)
+        return segment_sums(foreground, self.rle_offsets)
+
+    def shape(self, index: int, labels: List[str], sources: List[str]) -> Mask:
+        start, end = self.rle_offsets[index], self.rle_offsets[index + 1]
+        return Mask(
+            **self._fields(index, labels, sources),
+            rle=self.rle[start:end].copy(),
+            top=self.top[index].item(),
+            left=self.left[index].item(),
+            height=self.height[index].item(),
+            width=self.width[index].item(),
+        )
+
+
+class EllipseColumns(ShapeColumns):
+    """Ellipses, one row per ellipse.
+
+    Attributes:
+        cx: X-coordinate of the center (float64)
+        cy: Y-coordinate of the center (float64)
+        rx: Radius in X direction (float64)
+        ry: Radius in Y direction (float64)
+    """
+
+    cx: np.ndarray
+    cy: np.ndarray
+    rx: np.ndarray
+    ry: np.ndarray
+
+    def area(self) -> np.ndarray:
+        return np.pi * self.rx * self.ry
+
+    def shape(self, index: int, labels: List[str], sources: List[str]) -> Ellipse:
+        return Ellipse(
+            **self._fields(index, labels, sources),
+            cx=self.cx[index].item(),
+            cy=self.cy[index].item(),
+            rx=self.rx[index].item(),
+            ry=self.ry[index].item(),
+        )
+
+
+class ImageColumns(BaseModel, arbitrary_types_allowed=True):
+    """Image metadata, one row per image.
+
+    Attributes:
+        id: Image ids (object array of str)
+        name: Image file names (object array of str)
+        subset: Subsets (object array of str or None)
+        task_id: Task ids (object array of str or None)
+        job_id: Job ids (object array of str or None)
+        width: Image widths in pixels (int32)
+        height: Image heights in pixels (int32)
+    """
+
+    id: np.ndarray
+    name: np.ndarray
+    subset: np.ndarray
+    task_id: np.ndarray
+    job_id: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+class AnnotationColumns(BaseModel, arbitrary_types_allowed=True):
+    """Columnar (struct-of-arrays) representation of CVAT annotations.
+
+    Every shape kind is stored as one NumPy array per field instead of one
+    pydantic model per shape, which uses a fraction of the memory and makes
+    statistics over millions of shapes vectorized. Labels and sources are stored
+    as integer codes into `labels` and `sources`. Shapes are stored in image
+    order and can be converted back to `ImageAnnotation` on demand.
+
+    Attributes:
+        version: Version of the CVAT annotations format
+        project: Project metadata and labels
+        tasks: List of tasks in the project
+        job_status: List of job status information
+        labels: Label names, indexed by the `label` codes of the shape columns
+        sources: Source names, indexed by the `source` codes of the shape columns
+        images: Image metadata
+        boxes: Bounding boxes
+        polygons: Polygons
+        masks: Run-length encoded masks
+        polylines: Polylines
+        ellipses: Ellipses
+        tags: Tags
+
+    Example:
+        ```python
+        columns = AnnotationColumns.from_path("annotations.xml")
+
+        # Vectorized statistics
+        counts = columns.label_counts()
+        box_areas = columns.boxes.area()
+        histogram, edges = np.histogram(columns.masks.area(), bins=20)
+        cars = columns.boxes.label == columns.labels.index("car")
+
+        # Back to models for a single image
+        image = columns.image(0)
+        ```
+    """
+
+    version: str
+    project: Project
+    tasks: List[Task] = []
+    job_status: List[JobStatus] = []
+    labels: List[str]
+    sources: List[str]
+    images: ImageColumns
+    boxes: BoxColumns
+    polygons: PolygonColumns
+    masks: MaskColumns
+    polylines: PolylineColumns
+    ellipses: EllipseColumns
+    tags: TagColumns
+
+    @classmethod
+    def from_path(
+        cls,
+        xml_annotation_path: Union[str, Path],
+        job_status_path: Optional[Union[str, Path]] = None,
+        labels: Optional[Iterable[str]] = None,
+        task_ids: Optional[Iterable[Union[str, int]]] = None,
+        subsets: Optional[Iterable[str]] = None,
+        shapes: Optional[Iterable[str]] = None,
+        backend: XMLBackendName = "auto",
+    ) -> AnnotationColumns:
+        """Build the columns directly from a CVAT XML file.
+
+        The file is parsed incrementally and shapes are appended to the columns
+        without creating a pydantic model per shape. Filters work as in
+        `Annotations.from_path`.
+
+        Args:
+            xml_annotation_path: Path to the CVAT XML annotations file
+            job_status_path: Optional path to the job status JSON file
+            labels: Only keep shapes and tags with one of these labels
+            task_ids: Only keep images belonging to one of these tasks
+            subsets: Only keep images in one of these subsets
+            shapes: Only keep these shape kinds (see `Annotations.from_path`)
+            backend: XML implementation (see `Annotations.from_path`)
+        """
+        annotations_filter = _AnnotationsFilter.create(
+            labels=labels, task_ids=task_ids, subsets=subsets, shapes=shapes
+        )
+
+        builder = _ColumnsBuilder()
+        version = None
+        project = None
+        tasks = []
+        task_job_mapping = {}
+        for element in _iterparse_elements(
+            xml_annotation_path, XMLBackend.from_name(backend)
+        ):
+            if element.tag == "version":
+                version = element.text
+            elif element.tag == "meta":
+                project = _parse_project(element.find("project"))
+                tasks, task_job_mapping = _parse_tasks(element)
+                builder.add_labels_(label.name for label in project.labels)
+            elif element.tag == "image" and annotations_filter.includes_image(element):
+                builder.add_image_element_(
+                    element, task_job_mapping, annotations_filter
+                )
+
+        return builder.build(
+            version=version,
+            project=project,
+            tasks=tasks,
+            job_status=_load_job_status(job_status_path),
+        )
+
+    @classmethod
+    def from_annotations(cls, annotations: Annotations) -> AnnotationColumns:
+        """Build the columns from loaded annotations."""
+        builder = _ColumnsBuilder()
+        builder.add_labels_(label.name for label in annotations.project.labels)
+        for image in annotations.images:
+            builder.add_image_(image)
+
+        return builder.build(
+            version=annotations.version,
+            project=annotations.project,
+            tasks=annotations.tasks,
+            job_status=annotations.job_status,
+        )
+
+    @classmethod
+    def from_dataset(
+        cls, directory: Union[str, Path], filter: Optional[Any] = None
+    ) -> AnnotationColumns:
+        """Load columns from a Parquet or Arrow dataset written by
+        `save_dataset_`. Requires pyarrow.
+
+        Args:
+            directory: Dataset directory
+            filter: Optional `pyarrow.compute.Expression` on the "subset" and
+                "task_id" fields, pushed down to partitions and row groups
+
+        Example:
+            ```python
+            import pyarrow.compute as pc
+
+            train = AnnotationColumns.from_dataset(
+                "dataset", filter=pc.field("subset") == "train"
+            )
+            ```
+        """
+        return annotations_dataset.load_dataset(directory, filter=filter)
+
+    def save_dataset_(
+        self,
+        directory: Union[str, Path],
+        format: DatasetFormat = "parquet",
+        partition_by: Optional[Iterable[str]] = None,
+    ) -> AnnotationColumns:
+        """Write the columns to a directory of Parquet or Arrow IPC files.
+
+        Every table (`images`, `boxes`, `polygons`, `masks`, `polylines`,
+        `ellipses` and `tags`) is written as its own dataset that can be
+        scanned by DuckDB, Spark or `pyarrow.dataset`. Version, project, tasks,
+        labels and sources are stored in `meta` and job status in `job_status`.
+        Requires pyarrow.
+
+        Args:
+            directory: Output directory, files of a previous export are replaced
+            format: "parquet" or "arrow" (Arrow IPC / Feather v2)
+            partition_by: Hive-partition all tables on "subset" and/or "task_id"
+
+        Example:
+            ```python
+            columns.save_dataset_("dataset", partition_by=["subset"])
+            ```
+        """
+        annotations_dataset.save_dataset_(
+            self, directory, format=format, partition_by=partition_by
+        )
+        return self
+
+    def to_arrow(self) -> Dict[str, Any]:
+        """Convert the columns to a dict of `pyarrow.Table` by table name, see
+        `save_dataset_`. Requires pyarrow."""
+        return annotations_dataset.to_tables(self)
+
+    def image(self, index: int) -> ImageAnnotation:
+        """Convert the image at row `index` and its shapes back to a model.
+
+        Mask run lengths are copied out of the shared `rle` column, so the
+        returned masks do not keep the columns alive.
+        """
+        image = {
+            field: _item(getattr(self.images, field), index) for field in IMAGE_FIELDS
+        }
+        for field, tag in SHAPE_ELEMENTS + [("tags", "tag")]:
+            columns = getattr(self, field)
+            image[field] = [
+                columns.shape(row, self.labels, self.sources)
+                for row in columns.rows(index)
+            ]
+        return ImageAnnotation(**image)
+
+    def iter_images(self) -> Generator[ImageAnnotation, None, None]:
+        """Lazily convert all images back to models in order."""
+        for index in range(len(self.images)):
+            yield self.image(index)
+
+    def to_annotations(self) -> Annotations:
+        """Convert all images back to an `Annotations` object."""
+        return Annotations(
+            version=self.version,
+            project=self.project,
+            tasks=self.tasks,
+            images=list(self.iter_images()),
+            job_status=self.job_status,
+        )
+
+    def label_counts(self, shapes: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Count shapes per label.
+
+        Args:
+            shapes: Shape kinds to count (see `Annotations.from_path`), all
+                kinds by default
+
+        Returns:
+            Number of shapes for each label in `labels`, including zeros
+        """
+        if shapes is None:
+            shapes = SHAPE_TAGS
+        elif isinstance(shapes, str):
+            shapes = [shapes]
+
+        fields = {tag: field for field, tag in SHAPE_ELEMENTS + [("tags", "tag")]}
+
+        counts = np.zeros(len(self.labels), dtype=np.int64)
+        for tag in shapes:
+            counts += np.bincount(
+                getattr(self, fields[tag]).label, minlength=len(self.labels)
+            )
+        return dict(zip(self.labels, counts.tolist()))
+
+
+def segment_sums(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Sum `values[offsets[i]:offsets[i + 1]]` for each `i`, allowing empty
+    segments (which `np.add.reduceat` does not)."""
+    sums = np.zeros(len(offsets) - 1, dtype=values.dtype)
+    non_empty = np.diff(offsets) > 0
+    if np.any(non_empty):
+        sums[non_empty] = np.add.reduceat(values, offsets[:-1][non_empty])
+    return sums
+
+
+def _item(array: np.ndarray, index: int) -> Any:
+    """Element as a Python object, also for numeric arrays."""
+    return array[index : index + 1].tolist()[0]
+
+
+def _code(codes: Dict[str, int], name: str) -> int:
+    code = codes.get(name)
+    if code is None:
+        code = codes[name] = len(codes)
+    return code
+
+
+def _offsets(counts: List[int]) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+class _ColumnsBuilder:
+    """Accumulates rows in Python lists and converts them to arrays once."""
+
+    def __init__(self):
+        self.labels: Dict[str, int] = {}
+        self.sources: Dict[str, int] = {}
+        self.images: Dict[str, list] = defaultdict(list)
+        self.shapes: Dict[str, Dict[str, list]] = {
+            tag: defaultdict(list) for tag in SHAPE_TAGS
+        }
+
+    def add_labels_(self, labels: Iterable[str]) -> None:
+        for label in labels:
+            _code(self.labels, label)
+
+    def add_image_element_(
+        self,
+        image: Any,
+        task_job_mapping: Dict[str, str],
+        annotations_filter: _AnnotationsFilter,
+    ) -> None:
+        task_id = image.get("task_id")
+        image_index = self._add_image_fields(
+            dict(
+                id=image.get("id"),
+                name=image.get("name"),
+                subset=image.get("subset"),
+                task_id=task_id,
+                job_id=task_job_mapping.get(task_id) if task_id else None,
+                width=int(image.get("width")),
+                height=int(image.get("height")),
+            )
+        )
+
+        for shape in image:
+            if not annotations_filter.includes_shape(shape):
+                continue
+
+            if shape.tag == "tag":
+                values = dict(
+                    Tag(
+                        label=shape.get("label"),
+                        source=shape.get("source", "manual"),
+                        attributes=[],
+                    )
+                )
+            elif shape.tag in SHAPE_FIELD_CONVERTERS:
+                try:
+                    values = _convert_shape_fields(shape.tag, shape.attrib)
+                except (KeyError, ValueError):
+                    model, _ = SHAPE_FIELD_CONVERTERS[shape.tag]
+                    values = dict(model(**shape.attrib, attributes=[]))
+            else:
+                continue
+
+            self._add_shape(
+                shape.tag,
+                image_index,
+                values,
+                [
+                    (attr.get("name"), attr.text, None)
+                    for attr in shape.findall("attribute")
+                ],
+            )
+
+    def add_image_(self, image: ImageAnnotation) -> None:
+        image_index = self._add_image_fields(
+            {field: getattr(image, field) for field in IMAGE_FIELDS}
+        )
+        for field, tag in SHAPE_ELEMENTS + [("tags", "tag")]:
+            for shape in getattr(image, field):
+                self._add_shape(
+                    tag,
+                    image_index,
+                    dict(shape),
+                    [
+                        (attr.name, attr.value, attr.spec_id)
+                        for attr in shape.attributes
+                    ],
+                )
+
+    def _add_image_fields(self, values: Mapping[str, Any]) -> int:
+        image_index = len(self.images["id"])
+        for field in IMAGE_FIELDS:
+            self.images[field].append(values[field])
+        return image_index
+
+    def _add_shape(
+        self,
+        tag: str,
+        image_index: int,
+        values: Mapping[str, Any],
+        attributes: List[Tuple[str, Optional[str], Optional[int]]],
+    ) -> None:
+        columns = self.shapes[tag]
+        columns["image_index"].append(image_index)
+        columns["label"].append(_code(self.labels, values["label"]))
+        columns["source"].append(_code(self.sources, values["source"]))
+        if tag != "tag":
+            columns["occluded"].append(values["occluded"])
+            columns["z_order"].append(values["z_order"])
+        for field in GEOMETRY_FIELDS[tag]:
+            columns[field].append(values[field])
+
+        if tag in ("polygon", "polyline"):
+            points = values["points"]
+            columns["n_points"].append(len(points))
+            columns["points"].extend(
+                coordinate for point in points for coordinate in point
+            )
+        elif tag == "mask":
+            rle = values["rle"]
+            columns["n_runs"].append(len(rle))
+            columns["rle"].append(rle)
+
+        columns["n_attributes"].append(len(attributes))
+        for name, value, spec_id in attributes:
+            columns["attribute_name"].append(name)
+            columns["attribute_value"].append(value)
+            columns["attribute_spec_id"].append(-1 if spec_id is None else spec_id)
+
+    def build(
+        self,
+        version: str,
+        project: Project,
+        tasks: List[Task],
+        job_status: List[JobStatus],
+    ) -> AnnotationColumns:
+        images = self.images
+        shapes = {tag: self._build_shape_fields(tag) for tag in SHAPE_TAGS}
+        return AnnotationColumns(
+            version=version,
+            project=project,
+            tasks=tasks,
+            job_status=job_status,
+            labels=list(self.labels),
+            sources=list(self.sources),
+            images=ImageColumns(
+                **{
+                    field: np.array(images[field], dtype=object)
+                    for field in ("id", "name", "subset", "task_id", "job_id")
+                },
+                width=np.array(images["width"], dtype=np.int32),
+                height=np.array(images["height"], dtype=np.int32),
+            ),
+            boxes=BoxColumns(**shapes["box"]),
+            polygons=PolygonColumns(**shapes["polygon"]),
+            masks=MaskColumns(**shapes["mask"]),
+            polylines=PolylineColumns(**shapes["polyline"]),
+            ellipses=EllipseColumns(**shapes["ellipse"]),
+            tags=TagColumns(**shapes["tag"]),
+        )
+
+    def _build_shape_fields(self, tag: str) -> Dict[str, Any]:
+        columns = self.shapes[tag]
+        fields = dict(
+            image_index=np.array(columns["image_index"], dtype=np.int32),
+            label=np.array(columns["label"], dtype=np.int32),
+            source=np.array(columns["source"], dtype=np.int32),
+            attributes=AttributeColumns(
+                offsets=_offsets(columns["n_attributes"]),
+                name=np.array(columns["attribute_name"], dtype=object),
+                value=np.array(columns["attribute_value"], dtype=object),
+                spec_id=np.array(columns["attribute_spec_id"], dtype=np.int64),
+            ),
+        )
+        if tag != "tag":
+            fields["occluded"] = np.array(columns["occluded"], dtype=np.uint8)
+            fields["z_order"] = np.array(columns["z_order"], dtype=np.int32)
+
+        dtype = np.int32 if tag == "mask" else np.float64
+        for field in GEOMETRY_FIELDS[tag]:
+            fields[field] = np.array(columns[field], dtype=dtype)
+
+        if tag in ("polygon", "polyline"):
+            fields["point_offsets"] = _offsets(columns["n_points"])
+            fields["points"] = np.array(columns["points"], dtype=np.float64).reshape(
+                -1, 2
+            )
+        elif tag == "mask":
+            fields["rle_offsets"] = _offsets(columns["n_runs"])
+            fields["rle"] = (
+                np.concatenate(columns["rle"])
+                if columns["rle"]
+                else np.zeros(0, dtype=np.uint32)
+            )
+
+        return fields
@@ -1,12 +1,37 @@
 from __future__ import annotations
 
+import io
 import json
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from xml.etree import ElementTree
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
+from . import annotations_cache
+from .annotations_dataset import DatasetFormat
+from .annotations_writer import AnnotationsWriter
+from .xml_backend import XMLBackend, XMLBackendName
 from .types import (
     Attribute,
     Box,
@@ -21,6 +46,23 @@ from .types import (
     Tag,
     Task,
 )
+from .types.mask import parse_rle
+
+
+class CVATLinks(BaseModel):
+    """Result of `Annotations.create_cvat_links`.
+
+    Attributes:
+        links: CVAT links by image name
+        missing: Image names without an image, task or job
+        ambiguous: Image names that match more than one image, with the full
+            names of the matching images. These are not linked since the frame
+            depends on which image was meant.
+    """
+
+    links: Dict[str, str] = {}
+    missing: List[str] = []
+    ambiguous: Dict[str, List[str]] = {}
 
 
 class Annotations(BaseModel):
@@ -59,17 +101,73 @@ class Annotations(BaseModel):
     images: List[ImageAnnotation]
     job_status: List[JobStatus] = []
 
+    @model_validator(mode="after")
+    def track_mutations(self) -> Annotations:
+        """Wrap the lists in `_TrackedList` so that in-place changes invalidate
+        the lookup indexes."""
+        for field in TRACKED_FIELDS:
+            setattr(self, field, getattr(self, field))
+        return self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Lists assigned after validation get their own, empty indexes
+        if (
+            name in TRACKED_FIELDS
+            and isinstance(value, list)
+            and not isinstance(value, _TrackedList)
+        ):
+            value = _TrackedList(value)
+        super().__setattr__(name, value)
+
     @classmethod
     def from_path(
         cls,
         xml_annotation_path: Union[str, Path],
         job_status_path: Optional[Union[str, Path]] = None,
+        labels: Optional[Iterable[str]] = None,
+        task_ids: Optional[Iterable[Union[str, int]]] = None,
+        subsets: Optional[Iterable[str]] = None,
+        shapes: Optional[Iterable[str]] = None,
+        cache: bool = False,
+        workers: int = 1,
+        backend: XMLBackendName = "auto",
+        validate: bool = True,
     ) -> Annotations:
         """Load annotations from XML file and optionally include job status information.
 
+        The XML file is parsed incrementally and each `<image>` element is released
+        as soon as it has been converted to an `ImageAnnotation`, so the parser
+        never holds more than one image subtree in memory.
+
+        The optional filters are applied while parsing: images and shapes that
+        are filtered out are skipped before any model is built. The project and
+        task metadata is always loaded in full.
+
         Args:
             xml_annotation_path: Path to the CVAT XML annotations file
             job_status_path: Optional path to the job status JSON file
+            labels: Only keep shapes and tags with one of these labels
+            task_ids: Only keep images belonging to one of these tasks
+            subsets: Only keep images in one of these subsets
+            shapes: Only keep these shape kinds ("box", "polygon", "mask",
+                "polyline", "ellipse", "tag")
+            cache: Store the parsed result in a binary cache file next to the
+                XML file (`annotations.xml.cache`) and reuse it on later calls.
+                The cache is invalidated when the XML file, the job status file
+                or the filters change. Only use it for files you trust since the
+                cache is a pickle.
+            workers: Number of processes used to parse the images. With more
+                than one worker the `<image>` elements are split into byte
+                ranges that are parsed in a process pool and merged back in file
+                order. The result is identical to the serial parse.
+            backend: XML implementation, "auto" uses lxml when it is installed
+                and falls back to the standard library (see `XMLBackend`)
+            validate: Run pydantic validation on every parsed model. With
+                `validate=False` the XML attributes are converted to the field
+                types directly and models are built without validation. Shapes
+                that are missing a required attribute or cannot be converted
+                still go through validation. Only use it for files exported by
+                CVAT.
 
         Returns:
             Annotations object containing the loaded data
@@ -84,324 +182,267 @@ class Annotations(BaseModel):
                 "annotations.xml",
                 "job_status.json"
             )
+
+            # Load only the vegetation masks of two tasks
+            annotations = Annotations.from_path(
+                "annotations.xml",
+                labels=["vegetation"],
+                task_ids=["906591", "906592"],
+                shapes=["mask"],
+            )
+
+            # Reuse the parsed result on the next run
+            annotations = Annotations.from_path("annotations.xml", cache=True)
+
+            # Parse a large export on 16 cores
+            annotations = Annotations.from_path("annotations.xml", workers=16)
+
+            # Skip validation for a trusted CVAT export
+            annotations = Annotations.from_path("annotations.xml", validate=False)
             ```
         """
-        tree = ElementTree.parse(str(xml_annotation_path))
-        root = tree.getroot()
-
-        # Parse project details
-        project = root.find("meta/project")
-        labels = []
-        for label in project.findall("labels/label"):
-            attributes = [
-                Attribute(**attr.attrib)
-                for attr in label.findall("attributes/attribute")
-                if len(attr.keys()) >= 1
-            ]
-            label_data = Label(
-                name=label.find("name").text,
-                color=label.find("color").text,
-                type=label.find("type").text,
-                attributes=attributes,
+        annotations_filter = _AnnotationsFilter.create(
+            labels=labels, task_ids=task_ids, subsets=subsets, shapes=shapes
+        )
+        backend = XMLBackend.from_name(backend)
+
+        if not cache:
+            return cls._parse(
+                xml_annotation_path,
+                job_status_path,
+                annotations_filter,
+                workers,
+                backend,
+                validate,
             )
-            labels.append(label_data)
-
-        project_data = Project(
-            id=project.find("id").text,
-            name=project.find("name").text,
-            created=project.find("created").text,
-            updated=project.find("updated").text,
-            labels=labels,
+
+        cache_options = annotations_filter.cache_options(validate=validate)
+        annotations = annotations_cache.load(
+            xml_annotation_path, job_status_path, cache_options
         )
+        if annotations is None:
+            cache_key = annotations_cache.create_key(
+                xml_annotation_path, job_status_path, cache_options
+            )
+            annotations = cls._parse(
+                xml_annotation_path,
+                job_status_path,
+                annotations_filter,
+                workers,
+                backend,
+                validate,
+            )
+            annotations_cache.save_(
+                annotations,
+                xml_annotation_path,
+                job_status_path,
+                cache_options,
+                key=cache_key,
+            )
+        return annotations
 
-        # Parse tasks and store task_id to job_id mapping
-        tasks = []
-        task_job_mapping = {}
-        task_locations = ["meta/tasks/task", "meta/project/tasks/task"]
-        for location in task_locations:
-            for task in root.findall(location):
-                task_id = task.find("id").text
-                name = task.find("name").text
-                url_tag = task.find("segments/segment/url")
-                if url_tag is not None:
-                    task_instance = Task(task_id=task_id, name=name, url=url_tag.text)
-                    tasks.append(task_instance)
-                    # Extract job_id from URL if available
-                    if url_tag.text:
-                        try:
-                            job_id = url_tag.text.split("/")[-1]
-                            task_job_mapping[task_id] = job_id
-                        except (IndexError, AttributeError):
-                            pass
-
-        # Parse image annotations
-        images = []
-        for image in root.findall("image"):
-            boxes = []
-            for box in image.findall("box"):
-                box_attributes = [
-                    Attribute(name=attr.get("name"), value=attr.text)
-                    for attr in box.findall("attribute")
-                ]
-                boxes.append(Box(**box.attrib, attributes=box_attributes))
-
-            polygons = []
-            for polygon in image.findall("polygon"):
-                polygon_attributes = [
-                    Attribute(name=attr.get("name"), value=attr.text)
-                    for attr in polygon.findall("attribute")
-                ]
-                polygons.append(
-                    Polygon(**polygon.attrib, attributes=polygon_attributes)
-                )
+    @classmethod
+    def _parse(
+        cls,
+        xml_annotation_path: Union[str, Path],
+        job_status_path: Optional[Union[str, Path]],
+        annotations_filter: _AnnotationsFilter,
+        workers: int,
+        backend: XMLBackend,
+        validate: bool = True,
+    ) -> Annotations:
+        if workers > 1:
+            version, project, tasks, images = _parse_xml_parallel(
+                xml_annotation_path, annotations_filter, workers, backend, validate
+            )
+        else:
+            version, project, tasks, images = _parse_xml(
+                xml_annotation_path, annotations_filter, backend, validate
+            )
 
-            masks = []
-            for mask in image.findall("mask"):
-                mask_attributes = [
-                    Attribute(name=attr.get("name"), value=attr.text)
-                    for attr in mask.findall("attribute")
-                ]
-                masks.append(Mask(**mask.attrib, attributes=mask_attributes))
-
-            polylines = []
-            for polyline in image.findall("polyline"):
-                polyline_attributes = [
-                    Attribute(name=attr.get("name"), value=attr.text)
-                    for attr in polyline.findall("attribute")
-                ]
-                polylines.append(
-                    Polyline(**polyline.attrib, attributes=polyline_attributes)
-                )
+        return cls(
+            version=version,
+            project=project,
+            tasks=tasks,
+            images=images,
+            job_status=_load_job_status(job_status_path),
+        )
 
-            ellipses = []
-            for ellipse in image.findall("ellipse"):
-                ellipse_attributes = [
-                    Attribute(name=attr.get("name"), value=attr.text)
-                    for attr in ellipse.findall("attribute")
-                ]
-                ellipses.append(
-                    Ellipse(**ellipse.attrib, attributes=ellipse_attributes)
-                )
+    @classmethod
+    def header_from_path(
+        cls,
+        xml_annotation_path: Union[str, Path],
+        job_status_path: Optional[Union[str, Path]] = None,
+        backend: XMLBackendName = "auto",
+    ) -> Annotations:
+        """Load the version, project and tasks without any images.
 
-            # Parse tags
-            tags = []
-            for tag in image.findall("tag"):
-                tag_attributes = [
-                    Attribute(name=attr.get("name"), value=attr.text)
-                    for attr in tag.findall("attribute")
-                ]
-                tags.append(
-                    Tag(
-                        label=tag.get("label"),
-                        source=tag.get("source", "manual"),
-                        attributes=tag_attributes,
-                    )
-                )
+        Parsing stops at the first `<image>` element, so this is cheap even for
+        very large files.
 
-            # Get job_id from task_job_mapping if available
-            task_id = image.get("task_id")
-            job_id = task_job_mapping.get(task_id) if task_id else None
-
-            images.append(
-                ImageAnnotation(
-                    id=image.get("id"),
-                    name=image.get("name"),
-                    subset=image.get("subset"),
-                    task_id=task_id,
-                    job_id=job_id,
-                    width=int(image.get("width")),
-                    height=int(image.get("height")),
-                    boxes=boxes,
-                    polygons=polygons,
-                    masks=masks,
-                    polylines=polylines,
-                    ellipses=ellipses,
-                    tags=tags,
-                )
-            )
+        Args:
+            xml_annotation_path: Path to the CVAT XML annotations file
+            job_status_path: Optional path to the job status JSON file
+            backend: XML implementation (see `from_path`)
 
-        # Load job status if provided
-        job_status = []
-        if job_status_path:
-            with open(job_status_path) as f:
-                job_status_data = json.load(f)
-                job_status = [JobStatus(**status) for status in job_status_data]
+        Returns:
+            Annotations object with an empty list of images
+        """
+        version = None
+        project = None
+        tasks = []
+        for kind, value in _iterparse_annotations(
+            xml_annotation_path,
+            _AnnotationsFilter(),
+            XMLBackend.from_name(backend),
+        ):
+            if kind == "version":
+                version = value
+            elif kind == "meta":
+                project, tasks, _ = value
+            elif kind == "image":
+                break
 
         return cls(
-            version=root.find("version").text,
-            project=project_data,
+            version=version,
+            project=project,
             tasks=tasks,
-            images=images,
-            job_status=job_status,
+            images=[],
+            job_status=_load_job_status(job_status_path),
         )
 
-    def save_xml_(self, path: Union[str, Path]) -> Annotations:
+    @classmethod
+    def iter_images(
+        cls,
+        xml_annotation_path: Union[str, Path],
+        labels: Optional[Iterable[str]] = None,
+        task_ids: Optional[Iterable[Union[str, int]]] = None,
+        subsets: Optional[Iterable[str]] = None,
+        shapes: Optional[Iterable[str]] = None,
+        backend: XMLBackendName = "auto",
+        validate: bool = True,
+    ) -> Generator[ImageAnnotation, None, None]:
+        """Lazily iterate over the image annotations in an XML file.
+
+        The `meta/project` and `meta/tasks` header is read first so that job ids
+        can be resolved, then images are parsed and yielded one at a time in file
+        order. Only the image currently being parsed is kept in memory.
+
+        Args:
+            xml_annotation_path: Path to the CVAT XML annotations file
+            labels: Only keep shapes and tags with one of these labels
+            task_ids: Only yield images belonging to one of these tasks
+            subsets: Only yield images in one of these subsets
+            shapes: Only keep these shape kinds (see `from_path`)
+            backend: XML implementation (see `from_path`)
+            validate: Run pydantic validation on every parsed model (see
+                `from_path`)
+
+        Yields:
+            ImageAnnotation objects in the order they appear in the file
+
+        Example:
+            ```python
+            for image in Annotations.iter_images("annotations.xml"):
+                print(image.name, len(image.masks))
+            ```
+        """
+        annotations_filter = _AnnotationsFilter.create(
+            labels=labels, task_ids=task_ids, subsets=subsets, shapes=shapes
+        )
+        for kind, value in _iterparse_annotations(
+            xml_annotation_path,
+            annotations_filter,
+            XMLBackend.from_name(backend),
+            validate=validate,
+        ):
+            if kind == "image":
+                yield value
+
+    def save_xml_(
+        self, path: Union[str, Path], backend: XMLBackendName = "auto"
+    ) -> Annotations:
         """
         Save annotations to XML file in CVAT format.
 
+        The header is written first and each image is then serialized straight
+        to the file, see `xml_writer`.
+
         Args:
             path: Path where to save the XML file
+            backend: XML implementation, see `XMLBackend.from_name`. Both
+                backends write identical bytes.
         """
-        root = ElementTree.Element("annotations")
-
-        # Add version
-        version = ElementTree.SubElement(root, "version")
-        version.text = self.version
-
-        # Add meta section with project info
-        meta = ElementTree.SubElement(root, "meta")
-        project = ElementTree.SubElement(meta, "project")
-
-        # Project details
-        project_id = ElementTree.SubElement(project, "id")
-        project_id.text = self.project.id
-
-        project_name = ElementTree.SubElement(project, "name")
-        project_name.text = self.project.name
-
-        created = ElementTree.SubElement(project, "created")
-        created.text = self.project.created
-
-        updated = ElementTree.SubElement(project, "updated")
-        updated.text = self.project.updated
-
-        # Add labels
-        labels_elem = ElementTree.SubElement(project, "labels")
-        for label in self.project.labels:
-            label_elem = ElementTree.SubElement(labels_elem, "label")
-
-            name = ElementTree.SubElement(label_elem, "name")
-            name.text = label.name
-
-            color = ElementTree.SubElement(label_elem, "color")
-            color.text = label.color
-
-            type_elem = ElementTree.SubElement(label_elem, "type")
-            type_elem.text = label.type
-
-            if label.attributes:
-                attrs_elem = ElementTree.SubElement(label_elem, "attributes")
-                for attr in label.attributes:
-                    attr_elem = ElementTree.SubElement(attrs_elem, "attribute")
-                    for key, value in attr.model_dump().items():
-                        if value is not None:
-                            attr_elem.set(key, str(value))
-
-        # Add tasks
-        if self.tasks:
-            tasks_elem = ElementTree.SubElement(meta, "tasks")
-            for task in self.tasks:
-                task_elem = ElementTree.SubElement(tasks_elem, "task")
-                task_id = ElementTree.SubElement(task_elem, "id")
-                task_id.text = task.task_id
-                task_name = ElementTree.SubElement(task_elem, "name")
-                task_name.text = task.name
-
-                segments = ElementTree.SubElement(task_elem, "segments")
-                segment = ElementTree.SubElement(segments, "segment")
-                if task.url:
-                    url = ElementTree.SubElement(segment, "url")
-                    url.text = task.url
-
-        # Add image annotations
-        for image in self.images:
-            image_elem = ElementTree.Element("image")
-            image_elem.set("id", image.id)
-            image_elem.set("name", image.name)
-            if image.subset:
-                image_elem.set("subset", image.subset)
-            if image.task_id:
-                image_elem.set("task_id", image.task_id)
-            if image.job_id:
-                image_elem.set("job_id", image.job_id)
-            image_elem.set("width", str(image.width))
-            image_elem.set("height", str(image.height))
-
-            # Add boxes
-            for box in image.boxes:
-                box_elem = ElementTree.SubElement(image_elem, "box")
-                for key, value in box.model_dump().items():
-                    if key != "attributes" and value is not None:
-                        box_elem.set(key, str(value))
-
-                if box.attributes:
-                    for attr in box.attributes:
-                        attr_elem = ElementTree.SubElement(box_elem, "attribute")
-                        attr_elem.set("name", attr.name)
-                        attr_elem.text = attr.value
-
-            # Add polygons
-            for polygon in image.polygons:
-                poly_elem = ElementTree.SubElement(image_elem, "polygon")
-                for key, value in polygon.model_dump().items():
-                    if key != "attributes" and value is not None:
-                        poly_elem.set(key, str(value))
-
-                if polygon.attributes:
-                    for attr in polygon.attributes:
-                        attr_elem = ElementTree.SubElement(poly_elem, "attribute")
-                        attr_elem.set("name", attr.name)
-                        attr_elem.text = attr.value
-
-            # Add masks
-            for mask in image.masks:
-                mask_elem = ElementTree.SubElement(image_elem, "mask")
-                for key, value in mask.model_dump().items():
-                    if key != "attributes" and value is not None:
-                        mask_elem.set(key, str(value))
-
-                if mask.attributes:
-                    for attr in mask.attributes:
-                        attr_elem = ElementTree.SubElement(mask_elem, "attribute")
-                        attr_elem.set("name", attr.name)
-                        attr_elem.text = attr.value
-
-            # Add polylines
-            for polyline in image.polylines:
-                line_elem = ElementTree.SubElement(image_elem, "polyline")
-                for key, value in polyline.model_dump().items():
-                    if key != "attributes" and value is not None:
-                        line_elem.set(key, str(value))
-
-                if polyline.attributes:
-                    for attr in polyline.attributes:
-                        attr_elem = ElementTree.SubElement(line_elem, "attribute")
-                        attr_elem.set("name", attr.name)
-                        attr_elem.text = attr.value
-
-            # Add ellipses
-            for ellipse in image.ellipses:
-                ellipse_elem = ElementTree.SubElement(image_elem, "ellipse")
-                for key, value in ellipse.model_dump().items():
-                    if key != "attributes" and value is not None:
-                        ellipse_elem.set(key, str(value))
-
-                if ellipse.attributes:
-                    for attr in ellipse.attributes:
-                        attr_elem = ElementTree.SubElement(ellipse_elem, "attribute")
-                        attr_elem.set("name", attr.name)
-                        attr_elem.text = attr.value
-
-            # Add tags
-            for tag in image.tags:
-                tag_elem = ElementTree.SubElement(image_elem, "tag")
-                tag_elem.set("label", tag.label)
-                tag_elem.set("source", tag.source)
-
-                if tag.attributes:
-                    for attr in tag.attributes:
-                        attr_elem = ElementTree.SubElement(tag_elem, "attribute")
-                        attr_elem.set("name", attr.name)
-                        attr_elem.text = attr.value
-
-            root.append(image_elem)
-
-        # Create XML tree and save to file
-        tree = ElementTree.ElementTree(root)
-        tree.write(str(path), encoding="utf-8", xml_declaration=True)
+        with self.xml_writer(path, backend=backend) as writer:
+            writer.write_images_(self.images)
 
         return self
 
+    @classmethod
+    def from_dataset(
+        cls, directory: Union[str, Path], filter: Optional[Any] = None
+    ) -> Annotations:
+        """Load annotations from a Parquet or Arrow dataset written by
+        `save_dataset_`, see `AnnotationColumns.from_dataset`. Requires pyarrow.
+        """
+        from .annotation_columns import AnnotationColumns
+
+        return AnnotationColumns.from_dataset(directory, filter=filter).to_annotations()
+
+    def save_dataset_(
+        self,
+        directory: Union[str, Path],
+        format: DatasetFormat = "parquet",
+        partition_by: Optional[Iterable[str]] = None,
+    ) -> Annotations:
+        """Export annotations to a directory of Parquet or Arrow IPC files, see
+        `AnnotationColumns.save_dataset_`. Requires pyarrow.
+
+        Example:
+            ```python
+            annotations.save_dataset_("dataset", partition_by=["subset"])
+            annotations = Annotations.from_dataset("dataset")
+            ```
+        """
+        from .annotation_columns import AnnotationColumns
+
+        AnnotationColumns.from_annotations(self).save_dataset_(
+            directory, format=format, partition_by=partition_by
+        )
+        return self
+
+    def xml_writer(
+        self, path: Union[str, Path], backend: XMLBackendName = "auto"
+    ) -> AnnotationsWriter:
+        """Create an incremental XML writer with the version, project and tasks of
+        these annotations as header. The images of these annotations are not
+        written, pass them (or any other iterable of images) to the writer.
+
+        Args:
+            path: Path where to save the XML file
+            backend: XML implementation, see `XMLBackend.from_name`
+
+        Returns:
+            An unopened AnnotationsWriter, use it as a context manager
+
+        Example:
+            ```python
+            header = Annotations.header_from_path("annotations.xml")
+
+            with header.xml_writer("vegetation.xml") as writer:
+                writer.write_images_(
+                    Annotations.iter_images("annotations.xml", labels=["vegetation"])
+                )
+            ```
+        """
+        return AnnotationsWriter(
+            path=path,
+            version=self.version,
+            project=self.project,
+            tasks=self.tasks,
+            backend=backend,
+        )
+
     def get_task_status(self, task_id: str) -> Dict[str, str]:
         """Get the status of all jobs for a given task.
 
@@ -418,20 +459,16 @@ class Annotations(BaseModel):
             ```
         """
         # Find the job ID from the task URL
-        job_id = None
-        for task in self.tasks:
-            if task.task_id == task_id and task.url:
-                job_id = task.url.split("/")[-1]
-                break
-
+        job_id = self._index("task_job_ids", "tasks", _task_job_ids).get(task_id)
         if job_id is None:
             return {}
 
         # Map the job ID to its status
         return {
             job_id: status.state
-            for status in self.job_status
-            if status.task_id == task_id
+            for status in self._index(
+                "task_job_status", "job_status", _task_job_status
+            ).get(task_id, [])
         }
 
     def get_completed_tasks(self) -> List[Task]:
@@ -449,7 +486,7 @@ class Annotations(BaseModel):
                 print(f"Task {task.task_id}: {task.name}")
             ```
         """
-        completed_task_ids = self.get_completed_task_ids()
+        completed_task_ids = set(self.get_completed_task_ids())
         return [task for task in self.tasks if task.task_id in completed_task_ids]
 
     def get_completed_task_ids(self) -> List[str]:
@@ -466,16 +503,13 @@ class Annotations(BaseModel):
             # Returns: ["1234", "5678"]
             ```
         """
-        task_statuses = {}
-        for status in self.job_status:
-            if status.task_id not in task_statuses:
-                task_statuses[status.task_id] = []
-            task_statuses[status.task_id].append(status.state)
-
         return [
             task_id
-            for task_id, states in task_statuses.items()
-            if len(states) > 0 and all(state == "completed" for state in states)
+            for task_id, statuses in self._index(
+                "task_job_status", "job_status", _task_job_status
+            ).items()
+            if len(statuses) > 0
+            and all(status.state == "completed" for status in statuses)
         ]
 
     def get_images_from_completed_tasks(self) -> List[ImageAnnotation]:
@@ -491,7 +525,7 @@ class Annotations(BaseModel):
                 print(f"Image {image.name} from task {image.task_id}")
             ```
         """
-        completed_task_ids = self.get_completed_task_ids()
+        completed_task_ids = set(self.get_completed_task_ids())
         return [image for image in self.images if image.task_id in completed_task_ids]
 
     def create_cvat_link(self, image_name: str) -> str:
@@ -512,28 +546,728 @@ class Annotations(BaseModel):
             # Returns: "https://app.cvat.ai/tasks/453747/jobs/520016?frame=0"
             ```
         """
-        images = list(sorted(self.images, key=lambda image: image.name))
-
-        # lookup task id for the given image name
-        task_id = None
-        job_id = None
-        for image in images:
-            if Path(image.name).name == image_name:
-                job_id = image.job_id
-                task_id = image.task_id
-                break
-
-        frame_index = 0
-        for image in images:
-            if image.task_id == task_id:
-                if Path(image.name).name == image_name:
-                    break
-                frame_index += 1
+        # First image with the name (in name order) and its index in the task
+        image, frame_index = self._index("image_frames", "images", _image_frames).get(
+            image_name, [(None, None)]
+        )[0]
 
+        task_id = None if image is None else image.task_id
         if task_id is None:
             raise ValueError(f"Image {image_name} not found")
 
+        job_id = image.job_id
+
         if job_id is None:
             raise ValueError(f"No job found for task {task_id}")
 
         return f"https://app.cvat.ai/tasks/{task_id}/jobs/{job_id}?frame={frame_index}"
+
+    def create_cvat_links(self, image_names: Iterable[str]) -> CVATLinks:
+        """Create CVAT links for many image names at once.
+
+        Frame indices are computed once for all tasks instead of once per
+        image, and names that cannot be linked are collected instead of
+        raising on the first one.
+
+        Args:
+            image_names: Names of the images, duplicates are linked once
+
+        Returns:
+            Links by image name, names that are missing and names that match
+            more than one image
+
+        Example:
+            ```python
+            result = annotations.create_cvat_links(flagged_image_names)
+            for image_name, link in result.links.items():
+                print(image_name, link)
+
+            print(f"Not found: {result.missing}")
+            ```
+        """
+        image_frames = self._index("image_frames", "images", _image_frames)
+
+        links = {}
+        missing = []
+        ambiguous = {}
+        for image_name in dict.fromkeys(image_names):
+            matches = image_frames.get(image_name, [])
+            if len(matches) > 1:
+                ambiguous[image_name] = [image.name for image, _ in matches]
+                continue
+
+            image, frame_index = matches[0] if matches else (None, None)
+            if image is None or image.task_id is None or image.job_id is None:
+                missing.append(image_name)
+            else:
+                links[image_name] = (
+                    f"https://app.cvat.ai/tasks/{image.task_id}"
+                    f"/jobs/{image.job_id}?frame={frame_index}"
+                )
+
+        return CVATLinks(links=links, missing=missing, ambiguous=ambiguous)
+
+    def _index(self, name: str, field: str, build: Callable[[list], Any]) -> Any:
+        """Lookup index over one of the lists, built on first use and rebuilt
+        after the list has been replaced or mutated in place.
+
+        The indexes are stored on the list rather than the model, so they are
+        not part of equality comparisons. Changes to the attributes of the
+        items themselves are not tracked.
+        """
+        values = getattr(self, field)
+        if not isinstance(values, _TrackedList):
+            return build(values)
+
+        index = values.indexes.get(name)
+        if index is None:
+            index = values.indexes[name] = build(values)
+        return index
+
+
+TRACKED_FIELDS = ("tasks", "images", "job_status")
+
+
+class _TrackedList(list):
+    """List that drops its lookup indexes when it is mutated in place, see
+    `Annotations._index`."""
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.indexes: Dict[str, Any] = {}
+
+    def __reduce__(self):
+        # Pickle and copy the items only, the indexes are rebuilt on use
+        return (_TrackedList, (list(self),))
+
+    def _mutated(self) -> None:
+        self.indexes.clear()
+
+    def append(self, *args):
+        self._mutated()
+        return super().append(*args)
+
+    def extend(self, *args):
+        self._mutated()
+        return super().extend(*args)
+
+    def insert(self, *args):
+        self._mutated()
+        return super().insert(*args)
+
+    def remove(self, *args):
+        self._mutated()
+        return super().remove(*args)
+
+    def pop(self, *args):
+        self._mutated()
+        return super().pop(*args)
+
+    def clear(self):
+        self._mutated()
+        return super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._mutated()
+        return super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._mutated()
+        return super().reverse()
+
+    def __setitem__(self, *args):
+        self._mutated()
+        return super().__setitem__(*args)
+
+    def __delitem__(self, *args):
+        self._mutated()
+        return super().__delitem__(*args)
+
+    def __iadd__(self, *args):
+        self._mutated()
+        return super().__iadd__(*args)
+
+    def __imul__(self, *args):
+        self._mutated()
+        return super().__imul__(*args)
+
+
+def _image_frames(
+    images: List[ImageAnnotation],
+) -> Dict[str, List[Tuple[ImageAnnotation, int]]]:
+    """Map file names to the images with that name in name order and their
+    frame indices within their tasks."""
+    image_frames = {}
+    task_frame_counts = {}
+    for image in sorted(images, key=lambda image: image.name):
+        frame_index = task_frame_counts.get(image.task_id, 0)
+        task_frame_counts[image.task_id] = frame_index + 1
+        image_frames.setdefault(Path(image.name).name, []).append((image, frame_index))
+    return image_frames
+
+
+def _task_job_ids(tasks: List[Task]) -> Dict[str, str]:
+    """Map task ids to the job id in the URL of the first task with a URL."""
+    task_job_ids = {}
+    for task in tasks:
+        if task.url:
+            task_job_ids.setdefault(task.task_id, task.url.split("/")[-1])
+    return task_job_ids
+
+
+def _task_job_status(job_status: List[JobStatus]) -> Dict[str, List[JobStatus]]:
+    task_job_status = {}
+    for status in job_status:
+        task_job_status.setdefault(status.task_id, []).append(status)
+    return task_job_status
+
+
+SHAPE_TAGS = ("box", "polygon", "mask", "polyline", "ellipse", "tag")
+
+
+class _AnnotationsFilter(BaseModel, frozen=True):
+    """Selection of images and shapes applied while parsing.
+
+    `None` means that the corresponding property is not filtered on.
+    """
+
+    labels: Optional[FrozenSet[str]] = None
+    task_ids: Optional[FrozenSet[str]] = None
+    subsets: Optional[FrozenSet[str]] = None
+    shapes: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def create(
+        cls,
+        labels: Optional[Iterable[str]] = None,
+        task_ids: Optional[Iterable[Union[str, int]]] = None,
+        subsets: Optional[Iterable[str]] = None,
+        shapes: Optional[Iterable[str]] = None,
+    ) -> _AnnotationsFilter:
+        if isinstance(labels, str):
+            labels = [labels]
+        if isinstance(task_ids, (str, int)):
+            task_ids = [task_ids]
+        if isinstance(subsets, str):
+            subsets = [subsets]
+        if isinstance(shapes, str):
+            shapes = [shapes]
+
+        if shapes is not None:
+            shapes = frozenset(shapes)
+            unknown_shapes = shapes.difference(SHAPE_TAGS)
+            if unknown_shapes:
+                raise ValueError(
+                    f"Unknown shape kinds {sorted(unknown_shapes)}, "
+                    f"expected some of {list(SHAPE_TAGS)}"
+                )
+
+        return cls(
+            labels=None if labels is None else frozenset(labels),
+            task_ids=None if task_ids is None else frozenset(map(str, task_ids)),
+            subsets=None if subsets is None else frozenset(subsets),
+            shapes=shapes,
+        )
+
+    def cache_options(self, **options: Any) -> str:
+        """Deterministic string representation used in cache keys.
+
+        Args:
+            options: Other JSON serializable parse options the result depends on
+        """
+        return json.dumps(
+            {
+                **{
+                    name: None if values is None else sorted(values)
+                    for name, values in self
+                },
+                **options,
+            },
+            sort_keys=True,
+        )
+
+    def includes_image(self, image: ElementTree.Element) -> bool:
+        return (self.task_ids is None or image.get("task_id") in self.task_ids) and (
+            self.subsets is None or image.get("subset") in self.subsets
+        )
+
+    def includes_shape(self, shape: ElementTree.Element) -> bool:
+        return (self.shapes is None or shape.tag in self.shapes) and (
+            self.labels is None or shape.get("label") in self.labels
+        )
+
+
+def _iterparse_annotations(
+    source: Union[str, Path, BinaryIO],
+    annotations_filter: Optional[_AnnotationsFilter] = None,
+    backend: Optional[XMLBackend] = None,
+    task_job_mapping: Optional[Dict[str, str]] = None,
+    validate: bool = True,
+) -> Generator[Tuple[str, Any], None, None]:
+    """Incrementally parse a CVAT XML file.
+
+    Yields `("version", str)`, `("meta", (Project, List[Task], Dict[str, str]))`
+    and one `("image", ImageAnnotation)` per image, in document order. Top-level
+    elements are cleared from the tree once they have been converted, and images
+    excluded by the filter are dropped without being converted.
+
+    Args:
+        source: Path or binary file object with the XML document
+        annotations_filter: Images and shapes to keep
+        backend: XML implementation, defaults to automatic selection
+        task_job_mapping: Task id to job id mapping for documents without a
+            `meta` element, such as the image chunks of the parallel loader
+        validate: Validate image models, see `_parse_image`
+    """
+    if annotations_filter is None:
+        annotations_filter = _AnnotationsFilter()
+    if task_job_mapping is None:
+        task_job_mapping = {}
+
+    for element in _iterparse_elements(source, backend):
+        if element.tag == "version":
+            yield "version", element.text
+        elif element.tag == "meta":
+            project = _parse_project(element.find("project"))
+            tasks, task_job_mapping = _parse_tasks(element)
+            yield "meta", (project, tasks, task_job_mapping)
+        elif element.tag == "image" and annotations_filter.includes_image(element):
+            yield "image", _parse_image(
+                element, task_job_mapping, annotations_filter, validate
+            )
+
+
+def _iterparse_elements(
+    source: Union[str, Path, BinaryIO], backend: Optional[XMLBackend] = None
+) -> Generator[ElementTree.Element, None, None]:
+    """Yield the fully parsed children of the root element in document order.
+
+    Each element (and anything before it) is cleared from the tree when the
+    generator is resumed, so convert it before asking for the next one.
+    """
+    if backend is None:
+        backend = XMLBackend.from_name("auto")
+    if not hasattr(source, "read"):
+        source = str(source)
+
+    root = None
+    depth = 0
+    for event, element in backend.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        yield element
+
+        # Drop the converted element (and anything before it) from the tree
+        root.clear()
+
+
+def _load_job_status(job_status_path: Optional[Union[str, Path]]) -> List[JobStatus]:
+    # Load job status if provided
+    job_status = []
+    if job_status_path:
+        with open(job_status_path) as f:
+            job_status_data = json.load(f)
+            job_status = [JobStatus(**status) for status in job_status_data]
+    return job_status
+
+
+def _parse_xml(
+    source: Union[str, Path, BinaryIO],
+    annotations_filter: _AnnotationsFilter,
+    backend: XMLBackend,
+    validate: bool = True,
+) -> Tuple[str, Project, List[Task], List[ImageAnnotation]]:
+    version = None
+    project = None
+    tasks = []
+    images = []
+    for kind, value in _iterparse_annotations(
+        source, annotations_filter, backend, validate=validate
+    ):
+        if kind == "version":
+            version = value
+        elif kind == "meta":
+            project, tasks, _ = value
+        elif kind == "image":
+            images.append(value)
+
+    return version, project, tasks, images
+
+
+IMAGE_START_PATTERN = re.compile(rb"<image[\s/>]")
+
+
+def _parse_xml_parallel(
+    xml_annotation_path: Union[str, Path],
+    annotations_filter: _AnnotationsFilter,
+    workers: int,
+    backend: XMLBackend,
+    validate: bool = True,
+    chunks_per_worker: int = 4,
+) -> Tuple[str, Project, List[Task], List[ImageAnnotation]]:
+    """Parse the images of a CVAT XML file in a process pool.
+
+    The file is split into a header (everything before the first `<image>`) and
+    byte ranges that each start at an `<image>` element. Chunks are parsed by
+    `_parse_image_chunk` and concatenated in file order.
+    """
+    header, ranges = _split_image_ranges(
+        xml_annotation_path, n_chunks=workers * chunks_per_worker
+    )
+
+    version = None
+    project = None
+    tasks = []
+    task_job_mapping = {}
+    for kind, value in _iterparse_annotations(
+        io.BytesIO(header), annotations_filter, backend
+    ):
+        if kind == "version":
+            version = value
+        elif kind == "meta":
+            project, tasks, task_job_mapping = value
+
+    images = []
+    if ranges:
+        with annotations_cache.paused_gc(), ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges))
+        ) as executor:
+            for chunk_images in executor.map(
+                _parse_image_chunk,
+                repeat(str(xml_annotation_path)),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                repeat(annotations_filter),
+                repeat(backend),
+                repeat(task_job_mapping),
+                repeat(validate),
+            ):
+                images.extend(chunk_images)
+
+    return version, project, tasks, images
+
+
+def _split_image_ranges(
+    xml_annotation_path: Union[str, Path], n_chunks: int
+) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """Split a CVAT XML file into its header and byte ranges of whole images.
+
+    Returns:
+        The header as a standalone XML document and a list of `(start, end)`
+        byte offsets. Each range starts at an `<image>` element and the last one
+        ends before the closing `</annotations>` tag.
+    """
+    with open(xml_annotation_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        first_image = IMAGE_START_PATTERN.search(data)
+        if first_image is None:
+            return data[:], []
+
+        start = first_image.start()
+        end = data.rfind(b"</annotations>")
+        header = data[:start] + b"</annotations>"
+
+        boundaries = [start]
+        step = max((end - start) // n_chunks, 1)
+        for index in range(1, n_chunks):
+            match = IMAGE_START_PATTERN.search(
+                data, max(start + index * step, boundaries[-1] + 1), end
+            )
+            if match is None:
+                break
+            boundaries.append(match.start())
+        boundaries.append(end)
+
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _parse_image_chunk(
+    xml_annotation_path: str,
+    start: int,
+    end: int,
+    annotations_filter: _AnnotationsFilter,
+    backend: XMLBackend,
+    task_job_mapping: Dict[str, str],
+    validate: bool = True,
+) -> List[ImageAnnotation]:
+    """Parse the `<image>` elements in a byte range of a CVAT XML file."""
+    with open(xml_annotation_path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+
+    document = io.BytesIO(b"<annotations>" + chunk + b"</annotations>")
+    with annotations_cache.paused_gc():
+        return [
+            value
+            for kind, value in _iterparse_annotations(
+                document, annotations_filter, backend, task_job_mapping, validate
+            )
+            if kind == "image"
+        ]
+
+
+def _parse_project(project: ElementTree.Element) -> Project:
+    labels = []
+    for label in project.findall("labels/label"):
+        attributes = [
+            Attribute(**attr.attrib)
+            for attr in label.findall("attributes/attribute")
+            if len(attr.keys()) >= 1
+        ]
+        label_data = Label(
+            name=label.find("name").text,
+            color=label.find("color").text,
+            type=label.find("type").text,
+            attributes=attributes,
+        )
+        labels.append(label_data)
+
+    return Project(
+        id=project.find("id").text,
+        name=project.find("name").text,
+        created=project.find("created").text,
+        updated=project.find("updated").text,
+        labels=labels,
+    )
+
+
+def _parse_tasks(meta: ElementTree.Element) -> Tuple[List[Task], Dict[str, str]]:
+    """Parse tasks and the task_id to job_id mapping from the meta element."""
+    tasks = []
+    task_job_mapping = {}
+    task_locations = ["tasks/task", "project/tasks/task"]
+    for location in task_locations:
+        for task in meta.findall(location):
+            task_id = task.find("id").text
+            name = task.find("name").text
+            url_tag = task.find("segments/segment/url")
+            if url_tag is not None:
+                task_instance = Task(task_id=task_id, name=name, url=url_tag.text)
+                tasks.append(task_instance)
+                # Extract job_id from URL if available
+                if url_tag.text:
+                    try:
+                        job_id = url_tag.text.split("/")[-1]
+                        task_job_mapping[task_id] = job_id
+                    except (IndexError, AttributeError):
+                        pass
+
+    return tasks, task_job_mapping
+
+
+def _parse_points(points: str) -> List[Tuple[float, float]]:
+    """Parse CVAT's "x1,y1;x2,y2;..." format in a single split."""
+    coordinates = list(map(float, points.replace(";", ",").split(",")))
+    if len(coordinates) % 2 != 0:
+        raise ValueError(f"Odd number of coordinates in points {points}")
+    return list(zip(coordinates[::2], coordinates[1::2]))
+
+
+# XML attribute converters for the trusted parse path, see `_construct_shape`
+SHAPE_FIELD_CONVERTERS: Dict[str, Tuple[Type[BaseModel], Dict[str, Any]]] = {
+    "box": (
+        Box,
+        dict(
+            label=str,
+            xtl=float,
+            ytl=float,
+            xbr=float,
+            ybr=float,
+            occluded=int,
+            z_order=int,
+            source=str,
+        ),
+    ),
+    "polygon": (
+        Polygon,
+        dict(label=str, source=str, occluded=int, points=_parse_points, z_order=int),
+    ),
+    "mask": (
+        Mask,
+        dict(
+            label=str,
+            source=str,
+            occluded=int,
+            z_order=int,
+            rle=parse_rle,
+            top=int,
+            left=int,
+            height=int,
+            width=int,
+        ),
+    ),
+    "polyline": (
+        Polyline,
+        dict(label=str, source=str, occluded=int, points=_parse_points, z_order=int),
+    ),
+    "ellipse": (
+        Ellipse,
+        dict(
+            label=str,
+            source=str,
+            occluded=int,
+            cx=float,
+            cy=float,
+            rx=float,
+            ry=float,
+            z_order=int,
+        ),
+    ),
+}
+
+SHAPE_FIELD_DEFAULTS = {
+    tag: {
+        name: model.model_fields[name].default
+        for name in converters
+        if not model.model_fields[name].is_required()
+    }
+    for tag, (model, converters) in SHAPE_FIELD_CONVERTERS.items()
+}
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _construct(
+    model: Type[ModelT], fields: Dict[str, Any], fields_set: Set[str]
+) -> ModelT:
+    """Cheaper equivalent of `model.model_construct(**fields)`.
+
+    `model_construct` resolves defaults, aliases and extra fields in Python and
+    is slower than validating. Here `fields` must already contain a value for
+    every field of the model, in field order, and the model must not have
+    extra fields or private attributes.
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", fields)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def _convert_shape_fields(tag: str, values: Mapping[str, str]) -> Dict[str, Any]:
+    """Convert the XML attributes of a shape to its field values (except
+    `attributes`) without validation.
+
+    Raises:
+        KeyError: If a required attribute is missing
+        ValueError: If an attribute cannot be converted
+    """
+    _, converters = SHAPE_FIELD_CONVERTERS[tag]
+    defaults = SHAPE_FIELD_DEFAULTS[tag]
+    return {
+        name: convert(values[name]) if name in values else defaults[name]
+        for name, convert in converters.items()
+    }
+
+
+def _construct_shape(
+    tag: str, values: Mapping[str, str], attributes: List[Attribute]
+) -> BaseModel:
+    """Build a shape from XML attributes without pydantic validation.
+
+    The only schema check is that all required attributes are present and can be
+    converted. Otherwise the validating constructor is used so that malformed
+    shapes raise the same `ValidationError` as with validation enabled.
+    """
+    model, converters = SHAPE_FIELD_CONVERTERS[tag]
+    try:
+        fields = _convert_shape_fields(tag, values)
+    except (KeyError, ValueError):
+        return model(**values, attributes=attributes)
+
+    fields["attributes"] = attributes
+    fields_set = converters.keys() & values.keys()
+    fields_set.add("attributes")
+    return _construct(model, fields, fields_set)
+
+
+def _parse_attributes(
+    element: ElementTree.Element, validate: bool = True
+) -> List[Attribute]:
+    attributes = []
+    for attr in element.findall("attribute"):
+        name = attr.get("name")
+        if validate or name is None:
+            attributes.append(Attribute(name=name, value=attr.text))
+        else:
+            attributes.append(
+                _construct(
+                    Attribute,
+                    dict(name=name, value=attr.text, spec_id=None),
+                    {"name", "value"},
+                )
+            )
+    return attributes
+
+
+def _parse_image(
+    image: ElementTree.Element,
+    task_job_mapping: Dict[str, str],
+    annotations_filter: _AnnotationsFilter,
+    validate: bool = True,
+) -> ImageAnnotation:
+    """Convert an `<image>` element to an `ImageAnnotation`.
+
+    With `validate=False` the models are built without validation after
+    converting the XML attribute strings, see `_construct_shape`.
+    """
+    shapes = dict(box=[], polygon=[], mask=[], polyline=[], ellipse=[], tag=[])
+    for shape in image:
+        if not annotations_filter.includes_shape(shape):
+            continue
+
+        attributes = _parse_attributes(shape, validate)
+        if shape.tag == "tag":
+            label = shape.get("label")
+            source = shape.get("source", "manual")
+            if validate or label is None:
+                tag = Tag(label=label, source=source, attributes=attributes)
+            else:
+                tag = _construct(
+                    Tag,
+                    dict(label=label, source=source, attributes=attributes),
+                    {"label", "source", "attributes"},
+                )
+            shapes["tag"].append(tag)
+        elif shape.tag in SHAPE_FIELD_CONVERTERS:
+            if validate:
+                model, _ = SHAPE_FIELD_CONVERTERS[shape.tag]
+                shapes[shape.tag].append(model(**shape.attrib, attributes=attributes))
+            else:
+                shapes[shape.tag].append(
+                    _construct_shape(shape.tag, shape.attrib, attributes)
+                )
+
+    # Get job_id from task_job_mapping if available
+    task_id = image.get("task_id")
+    job_id = task_job_mapping.get(task_id) if task_id else None
+
+    image_fields = dict(
+        id=image.get("id"),
+        name=image.get("name"),
+        subset=image.get("subset"),
+        task_id=task_id,
+        job_id=job_id,
+        width=int(image.get("width")),
+        height=int(image.get("height")),
+        boxes=shapes["box"],
+        polygons=shapes["polygon"],
+        masks=shapes["mask"],
+        polylines=shapes["polyline"],
+        ellipses=shapes["ellipse"],
+        tags=shapes["tag"],
+    )
+    if validate or image_fields["id"] is None or image_fields["name"] is None:
+        return ImageAnnotation(**image_fields)
+    else:
+        return _construct(ImageAnnotation, image_fields, set(image_fields))
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import gc
+import hashlib
+import os
+import pickle
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Generator, Optional, Union
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from .annotations import Annotations
+
+CACHE_FORMAT_VERSION = 2
+
+
+class FileFingerprint(BaseModel, frozen=True):
+    """Identity of a file on disk used to validate cached annotations.
+
+    Attributes:
+        size: File size in bytes
+        mtime_ns: Modification time in nanoseconds
+        digest: BLAKE2b digest of the file content
+    """
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path]) -> FileFingerprint:
+        stat = Path(path).stat()
+        return cls(size=stat.st_size, mtime_ns=stat.st_mtime_ns, digest=digest(path))
+
+    def matches(self, path: Union[str, Path]) -> bool:
+        """Check if the file still has this fingerprint.
+
+        The content is only hashed when the size is unchanged but the
+        modification time differs, e.g. after a copy or a `touch`.
+        """
+        try:
+            stat = Path(path).stat()
+        except FileNotFoundError:
+            return False
+
+        if stat.st_size != self.size:
+            return False
+        elif stat.st_mtime_ns == self.mtime_ns:
+            return True
+        else:
+            return digest(path) == self.digest
+
+
+class CacheKey(BaseModel, frozen=True):
+    """Everything a cached parse result depends on."""
+
+    format_version: int = CACHE_FORMAT_VERSION
+    xml_annotation: FileFingerprint
+    job_status: Optional[FileFingerprint] = None
+    options: str
+
+    def matches(
+        self,
+        xml_annotation_path: Union[str, Path],
+        job_status_path: Optional[Union[str, Path]],
+        options: str,
+    ) -> bool:
+        if self.format_version != CACHE_FORMAT_VERSION or self.options != options:
+            return False
+        elif (job_status_path is None) != (self.job_status is None):
+            return False
+        elif not self.xml_annotation.matches(xml_annotation_path):
+            return False
+        elif job_status_path is not None and not self.job_status.matches(
+            job_status_path
+        ):
+            return False
+        else:
+            return True
+
+
+@contextmanager
+def paused_gc() -> Generator[None, None, None]:
+    """Pause the cyclic garbage collector while building many objects.
+
+    Unpickling allocates one container per model and would otherwise trigger
+    repeated full collections over the growing object graph.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def cache_path(xml_annotation_path: Union[str, Path]) -> Path:
+    """Location of the cache file, next to the XML file."""
+    xml_annotation_path = Path(xml_annotation_path)
+    return xml_annotation_path.with_name(xml_annotation_path.name + ".cache")
+
+
+def load(
+    xml_annotation_path: Union[str, Path],
+    job_status_path: Optional[Union[str, Path]],
+    options: str,
+) -> Optional[Annotations]:
+    """Load cached annotations if the cache is still valid for the inputs.
+
+    Returns:
+        The cached annotations or None if there is no valid cache
+    """
+    path = cache_path(xml_annotation_path)
+    try:
+        with open(path, "rb") as f:
+            key = pickle.load(f)
+            if not isinstance(key, CacheKey) or not key.matches(
+                xml_annotation_path, job_status_path, options
+            ):
+                return None
+            with paused_gc():
+                return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        warnings.warn(f"Ignoring unreadable annotations cache {path}: {e}")
+        return None
+
+
+def save_(
+    annotations: Annotations,
+    xml_annotation_path: Union[str, Path],
+    job_status_path: Optional[Union[str, Path]],
+    options: str,
+    key: Optional[CacheKey] = None,
+) -> None:
+    """Write the parsed annotations to the cache file next to the XML file.
+
+    Args:
+        key: Pre-computed cache key. Pass a key built from fingerprints taken
+            before parsing to avoid caching a file that changed mid-parse.
+    """
+    if key is None:
+        key = create_key(xml_annotation_path, job_status_path, options)
+
+    path = cache_path(xml_annotation_path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(annotations, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        warnings.warn(f"Could not write annotations cache {path}: {e}")
+
+
+def create_key(
+    xml_annotation_path: Union[str, Path],
+    job_status_path: Optional[Union[str, Path]],
+    options: str,
+) -> CacheKey:
+    return CacheKey(
+        xml_annotation=FileFingerprint.from_path(xml_annotation_path),
+        job_status=(
+            None
+            if job_status_path is None
+            else FileFingerprint.from_path(job_status_path)
+        ),
+        options=options,
+    )
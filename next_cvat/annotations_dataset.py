@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .types import JobStatus, Project, Task
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+if TYPE_CHECKING:
+    from .annotation_columns import AnnotationColumns
+
+DatasetFormat = Literal["parquet", "arrow"]
+
+SHAPE_TABLES = ("boxes", "polygons", "masks", "polylines", "ellipses", "tags")
+
+# Image fields that are repeated in every table so that datasets can be
+# partitioned and filtered on them
+PARTITION_FIELDS = ("subset", "task_id")
+
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "Arrow and Parquet datasets require pyarrow, install it with "
+            "`pip install next-cvat[dataset]`"
+        )
+
+
+def save_dataset_(
+    columns: AnnotationColumns,
+    directory: Union[str, Path],
+    format: DatasetFormat = "parquet",
+    partition_by: Optional[Iterable[str]] = None,
+) -> None:
+    """Write annotation columns to a directory of Parquet or Arrow IPC files.
+
+    The directory contains one dataset per table (`images`, `boxes`,
+    `polygons`, `masks`, `polylines`, `ellipses` and `tags`), plus the files
+    `meta` (version, project, tasks, labels and sources) and `job_status`.
+    Files from a previous export to the same directory are replaced, other
+    files are left alone.
+
+    Args:
+        columns: Annotations to write
+        directory: Output directory
+        format: "parquet" or "arrow" (Arrow IPC / Feather v2)
+        partition_by: Hive-partition every table on some of the image fields
+            "subset" and "task_id", which are stored in every table
+    """
+    require_pyarrow()
+    if format not in FILE_EXTENSIONS:
+        raise ValueError(f"Unknown dataset format {format}")
+
+    partition_by = [] if partition_by is None else list(partition_by)
+    unknown_fields = set(partition_by).difference(PARTITION_FIELDS)
+    if unknown_fields:
+        raise ValueError(
+            f"Cannot partition on {sorted(unknown_fields)}, "
+            f"expected some of {list(PARTITION_FIELDS)}"
+        )
+
+    directory = Path(directory)
+    _remove_dataset_(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    tables = to_tables(columns)
+    tables["meta"] = tables["meta"].append_column(
+        "partition_by", pa.array([partition_by], pa.list_(pa.string()))
+    )
+    _write_table(tables.pop("meta"), directory / "meta", format)
+    _write_table(tables.pop("job_status"), directory / "job_status", format)
+    for name, table in tables.items():
+        if table.num_rows == 0:
+            # write_dataset writes no files for empty tables, keep the schema
+            (directory / name).mkdir()
+            _write_table(
+                table.drop_columns(partition_by), directory / name / "part-0", format
+            )
+            continue
+
+        ds.write_dataset(
+            table,
+            directory / name,
+            format="ipc" if format == "arrow" else format,
+            partitioning=partition_by or None,
+            partitioning_flavor="hive" if partition_by else None,
+            basename_template=f"part-{{i}}.{FILE_EXTENSIONS[format]}",
+        )
+
+
+def load_dataset(
+    directory: Union[str, Path], filter: Optional[Any] = None
+) -> AnnotationColumns:
+    """Read annotation columns written by `save_dataset_`.
+
+    Args:
+        directory: Dataset directory
+        filter: Optional `pyarrow.compute.Expression` on "subset" and "task_id",
+            e.g. `pc.field("subset") == "train"`. It is pushed down to the
+            partitions and Parquet row groups of every table.
+    """
+    require_pyarrow()
+    directory = Path(directory)
+    format = _detect_format(directory)
+    tables = {
+        "meta": _read_table(directory / "meta", format),
+        "job_status": _read_table(directory / "job_status", format),
+    }
+
+    partition_by = tables["meta"]["partition_by"][0].as_py()
+    partitioning = (
+        ds.partitioning(
+            pa.schema([(field, pa.string()) for field in partition_by]),
+            flavor="hive",
+        )
+        if partition_by
+        else None
+    )
+    for name in ("images",) + SHAPE_TABLES:
+        dataset = ds.dataset(
+            directory / name,
+            format="ipc" if format == "arrow" else format,
+            partitioning=partitioning,
+        )
+        tables[name] = dataset.to_table(filter=filter)
+
+    return from_tables(tables)
+
+
+def to_tables(columns: AnnotationColumns) -> Dict[str, pa.Table]:
+    """Convert annotation columns to Arrow tables.
+
+    Labels and sources are dictionary encoded, polygon and polyline points are
+    `list<struct<x, y>>`, mask runs are `list<uint32>` and shape attributes are
+    `list<struct<name, value, spec_id>>`.
+    """
+    require_pyarrow()
+    images = columns.images
+    tables = {
+        "meta": pa.table(
+            {
+                "version": [columns.version],
+                "project": [columns.project.model_dump_json()],
+                "tasks": [json.dumps([task.model_dump() for task in columns.tasks])],
+                "labels": pa.array([columns.labels], pa.list_(pa.string())),
+                "sources": pa.array([columns.sources], pa.list_(pa.string())),
+            }
+        ),
+        "job_status": pa.table(
+            {
+                "task_id": pa.array(
+                    [status.task_id for status in columns.job_status], pa.string()
+                ),
+                "job_id": pa.array(
+                    [status.job_id for status in columns.job_status], pa.int64()
+                ),
+                "task_name": pa.array(
+                    [status.task_name for status in columns.job_status], pa.string()
+                ),
+                "stage": pa.array(
+                    [status.stage for status in columns.job_status], pa.string()
+                ),
+                "state": pa.array(
+                    [status.state for status in columns.job_status], pa.string()
+                ),
+                "assignee": pa.array(
+                    [
+                        None if status.assignee is None else json.dumps(status.assignee)
+                        for status in columns.job_status
+                    ],
+                    pa.string(),
+                ),
+            }
+        ),
+        "images": pa.table(
+            {
+                "image_index": np.arange(len(images), dtype=np.int32),
+                **{
+                    field: pa.array(getattr(images, field), pa.string())
+                    for field in ("id", "name", "subset", "task_id", "job_id")
+                },
+                "width": images.width,
+                "height": images.height,
+            }
+        ),
+    }
+
+    for name in SHAPE_TABLES:
+        shape_columns = getattr(columns, name)
+        table = {
+            "shape_index": np.arange(len(shape_columns), dtype=np.int64),
+            "image_index": shape_columns.image_index,
+            **{
+                field: pa.array(
+                    getattr(images, field)[shape_columns.image_index], pa.string()
+                )
+                for field in PARTITION_FIELDS
+            },
+        }
+        for field in type(shape_columns).model_fields:
+            values = getattr(shape_columns, field)
+            if field in ("image_index", "point_offsets", "rle_offsets"):
+                continue
+            elif field in ("label", "source"):
+                table[field] = pa.DictionaryArray.from_arrays(
+                    values, pa.array(getattr(columns, f"{field}s"), pa.string())
+                )
+            elif field == "points":
+                table[field] = pa.LargeListArray.from_arrays(
+                    _list_offsets(shape_columns.point_offsets),
+                    pa.StructArray.from_arrays(
+                        [values[:, 0], values[:, 1]], names=["x", "y"]
+                    ),
+                )
+            elif field == "rle":
+                table[field] = pa.LargeListArray.from_arrays(
+                    _list_offsets(shape_columns.rle_offsets), values
+                )
+            elif field == "attributes":
+                table[field] = pa.LargeListArray.from_arrays(
+                    _list_offsets(values.offsets),
+                    pa.StructArray.from_arrays(
+                        [
+                            pa.array(values.name, pa.string()),
+                            pa.array(values.value, pa.string()),
+                            pa.array(values.spec_id, mask=values.spec_id < 0),
+                        ],
+                        names=["name", "value", "spec_id"],
+                    ),
+                )
+            else:
+                table[field] = values
+        tables[name] = pa.table(table)
+
+    return tables
+
+
+def from_tables(tables: Dict[str, pa.Table]) -> AnnotationColumns:
+    """Convert Arrow tables created by `to_tables` back to annotation columns.
+
+    The image and shape tables may be filtered subsets, the image indices are
+    renumbered accordingly.
+    """
+    from .annotation_columns import (
+        AnnotationColumns,
+        AttributeColumns,
+        BoxColumns,
+        EllipseColumns,
+        ImageColumns,
+        MaskColumns,
+        PolygonColumns,
+        PolylineColumns,
+        TagColumns,
+    )
+
+    require_pyarrow()
+    meta = tables["meta"].to_pylist()[0]
+    labels = meta["labels"]
+    sources = meta["sources"]
+
+    images = tables["images"].sort_by("image_index")
+    image_index = _numpy(images["image_index"])
+
+    columns = dict(
+        version=meta["version"],
+        project=Project.model_validate_json(meta["project"]),
+        tasks=[Task(**task) for task in json.loads(meta["tasks"])],
+        job_status=[
+            JobStatus(
+                **dict(
+                    status,
+                    assignee=(
+                        None
+                        if status["assignee"] is None
+                        else json.loads(status["assignee"])
+                    ),
+                )
+            )
+            for status in tables["job_status"].to_pylist()
+        ],
+        labels=labels,
+        sources=sources,
+        images=ImageColumns(
+            **{
+                field: _numpy(images[field], dtype=object)
+                for field in ("id", "name", "subset", "task_id", "job_id")
+            },
+            width=_numpy(images["width"], dtype=np.int32),
+            height=_numpy(images["height"], dtype=np.int32),
+        ),
+    )
+
+    shape_classes = dict(
+        boxes=BoxColumns,
+        polygons=PolygonColumns,
+        masks=MaskColumns,
+        polylines=PolylineColumns,
+        ellipses=EllipseColumns,
+        tags=TagColumns,
+    )
+    for name, shape_class in shape_classes.items():
+        table = tables[name].sort_by("shape_index")
+        fields = {
+            "image_index": np.searchsorted(
+                image_index, _numpy(table["image_index"])
+            ).astype(np.int32),
+        }
+        for field in shape_class.model_fields:
+            if field in ("image_index", "point_offsets", "rle_offsets"):
+                continue
+            elif field in ("label", "source"):
+                categories = labels if field == "label" else sources
+                fields[field] = _numpy(
+                    pc.index_in(
+                        table[field].cast(pa.string()),
+                        value_set=pa.array(categories, pa.string()),
+                    ),
+                    dtype=np.int32,
+                )
+            elif field == "points":
+                fields["point_offsets"], points = _flatten(table[field])
+                fields[field] = np.stack(
+                    [
+                        _numpy(points.field("x"), dtype=np.float64),
+                        _numpy(points.field("y"), dtype=np.float64),
+                    ],
+                    axis=1,
+                ).reshape(-1, 2)
+            elif field == "rle":
+                fields["rle_offsets"], rle = _flatten(table[field])
+                fields[field] = _numpy(rle, dtype=np.uint32)
+            elif field == "attributes":
+                offsets, attributes = _flatten(table[field])
+                fields[field] = AttributeColumns(
+                    offsets=offsets,
+                    name=_numpy(attributes.field("name"), dtype=object),
+                    value=_numpy(attributes.field("value"), dtype=object),
+                    spec_id=_numpy(
+                        attributes.field("spec_id").fill_null(-1), dtype=np.int64
+                    ),
+                )
+            else:
+                fields[field] = _numpy(table[field])
+        columns[name] = shape_class(**fields)
+
+    return AnnotationColumns(**columns)
+
+
+def _list_offsets(offsets: np.ndarray) -> pa.Array:
+    # Large lists have 64-bit offsets, so columns with more than 2**31 runs or
+    # points do not overflow
+    return pa.array(offsets.astype(np.int64), pa.int64())
+
+
+def _flatten(column: pa.ChunkedArray) -> Tuple[np.ndarray, pa.Array]:
+    """Offsets and flattened values of a list column."""
+    column = column.combine_chunks()
+    lengths = _numpy(pc.list_value_length(column).fill_null(0), dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets, pc.list_flatten(column)
+
+
+def _numpy(values: Union[pa.Array, pa.ChunkedArray], dtype: Any = None) -> np.ndarray:
+    return np.asarray(values.to_numpy(zero_copy_only=False), dtype=dtype)
+
+
+def _write_table(table: pa.Table, path: Path, format: DatasetFormat) -> None:
+    path = path.with_suffix(f".{FILE_EXTENSIONS[format]}")
+    if format == "parquet":
+        pq.write_table(table, path)
+    else:
+        feather.write_feather(table, path, compression="uncompressed")
+
+
+def _read_table(path: Path, format: DatasetFormat) -> pa.Table:
+    path = path.with_suffix(f".{FILE_EXTENSIONS[format]}")
+    if format == "parquet":
+        return pq.read_table(path)
+    else:
+        return feather.read_table(path)
+
+
+def _remove_dataset_(directory: Path) -> None:
+    for extension in FILE_EXTENSIONS.values():
+        for name in ("meta", "job_status"):
+            (directory / f"{name}.{extension}").unlink(missing_ok=True)
+    for name in ("images",) + SHAPE_TABLES:
+        if (directory / name).is_dir():
+            shutil.rmtree(directory / name)
+
+
+def _detect_format(directory: Path) -> DatasetFormat:
+    for format, extension in FILE_EXTENSIONS.items():
+        if (directory / f"meta.{extension}").exists():
+            return format
+    raise FileNotFoundError(f"No annotations dataset found in {directory}")
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import IO, Any, Iterable, List, Optional, Union
+
+from pydantic import BaseModel, PrivateAttr
+
+from .types import Attribute, ImageAnnotation, Project, Task
+from .xml_backend import XML_DECLARATION, XMLBackend, XMLBackendName
+
+SHAPE_ELEMENTS = [
+    ("boxes", "box"),
+    ("polygons", "polygon"),
+    ("masks", "mask"),
+    ("polylines", "polyline"),
+    ("ellipses", "ellipse"),
+]
+
+
+class AnnotationsWriter(BaseModel, arbitrary_types_allowed=True):
+    """Incremental writer for CVAT XML annotation files.
+
+    The version and meta header is written once when the writer is opened and
+    each image is then serialized straight to the file, so only one image is
+    held as XML elements at a time. The XML is written to a temporary file next
+    to `path`, which replaces `path` when the writer is closed. Use it as a
+    context manager: if an exception is raised in the `with` block, the
+    temporary file is removed and `path` is left untouched.
+
+    Attributes:
+        path: Path of the XML file to write
+        version: CVAT annotations format version
+        project: Project metadata and labels
+        tasks: Tasks written to the meta section
+        backend: XML implementation, see `XMLBackend.from_name`
+
+    Example:
+        ```python
+        header = Annotations.header_from_path("annotations.xml")
+
+        with header.xml_writer("vegetation.xml") as writer:
+            writer.write_images_(
+                Annotations.iter_images("annotations.xml", labels=["vegetation"])
+            )
+        ```
+    """
+
+    path: Path
+    version: str
+    project: Project
+    tasks: List[Task] = []
+    backend: Union[XMLBackendName, XMLBackend] = "auto"
+
+    _file: Optional[IO[bytes]] = PrivateAttr(default=None)
+    _tmp_path: Optional[Path] = PrivateAttr(default=None)
+    _xml_backend: Optional[XMLBackend] = PrivateAttr(default=None)
+
+    def open_(self) -> AnnotationsWriter:
+        """Open the file and write the XML declaration, version and meta header."""
+        if self._file is not None:
+            raise ValueError(f"Writer for {self.path} is already open")
+
+        self._xml_backend = XMLBackend.from_name(self.backend)
+        etree = self._xml_backend.etree
+
+        version = etree.Element("version")
+        version.text = self.version
+
+        path = Path(self.path)
+        self._tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._file = open(self._tmp_path, "wb", buffering=1 << 20)
+        self._file.write(XML_DECLARATION)
+        self._file.write(b"<annotations>")
+        self._file.write(self._xml_backend.tostring(version))
+        self._file.write(
+            self._xml_backend.tostring(meta_element(etree, self.project, self.tasks))
+        )
+        return self
+
+    def write_image_(self, image: ImageAnnotation) -> AnnotationsWriter:
+        """Serialize one image annotation to the file."""
+        if self._file is None:
+            raise ValueError(f"Writer for {self.path} is not open")
+
+        self._file.write(
+            self._xml_backend.tostring(image_element(self._xml_backend.etree, image))
+        )
+        return self
+
+    def write_images_(self, images: Iterable[ImageAnnotation]) -> AnnotationsWriter:
+        """Serialize image annotations from any iterable, e.g. a generator."""
+        for image in images:
+            self.write_image_(image)
+        return self
+
+    def close_(self) -> None:
+        """Write the closing tag and move the finished file to `path`."""
+        if self._file is None:
+            return
+
+        try:
+            self._file.write(b"</annotations>")
+            self._file.close()
+        except BaseException:
+            self.abort_()
+            raise
+        self._file = None
+        self._tmp_path.replace(self.path)
+        self._tmp_path = None
+
+    def abort_(self) -> None:
+        """Close and remove the unfinished file, `path` is left untouched."""
+        if self._file is None:
+            return
+
+        try:
+            self._file.close()
+        finally:
+            self._file = None
+            self._tmp_path.unlink(missing_ok=True)
+            self._tmp_path = None
+
+    def __enter__(self) -> AnnotationsWriter:
+        return self.open_()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close_()
+        else:
+            self.abort_()
+
+
+def meta_element(etree: Any, project: Project, tasks: List[Task]) -> Any:
+    meta = etree.Element("meta")
+    project_elem = etree.SubElement(meta, "project")
+
+    # Project details
+    project_id = etree.SubElement(project_elem, "id")
+    project_id.text = project.id
+
+    project_name = etree.SubElement(project_elem, "name")
+    project_name.text = project.name
+
+    created = etree.SubElement(project_elem, "created")
+    created.text = project.created
+
+    updated = etree.SubElement(project_elem, "updated")
+    updated.text = project.updated
+
+    # Add labels
+    labels_elem = etree.SubElement(project_elem, "labels")
+    for label in project.labels:
+        label_elem = etree.SubElement(labels_elem, "label")
+
+        name = etree.SubElement(label_elem, "name")
+        name.text = label.name
+
+        color = etree.SubElement(label_elem, "color")
+        color.text = label.color
+
+        type_elem = etree.SubElement(label_elem, "type")
+        type_elem.text = label.type
+
+        if label.attributes:
+            attrs_elem = etree.SubElement(label_elem, "attributes")
+            for attr in label.attributes:
+                attr_elem = etree.SubElement(attrs_elem, "attribute")
+                for key, value in attr.model_dump().items():
+                    if value is not None:
+                        attr_elem.set(key, str(value))
+
+    # Add tasks
+    if tasks:
+        tasks_elem = etree.SubElement(meta, "tasks")
+        for task in tasks:
+            task_elem = etree.SubElement(tasks_elem, "task")
+            task_id = etree.SubElement(task_elem, "id")
+            task_id.text = task.task_id
+            task_name = etree.SubElement(task_elem, "name")
+            task_name.text = task.name
+
+            segments = etree.SubElement(task_elem, "segments")
+            segment = etree.SubElement(segments, "segment")
+            if task.url:
+                url = etree.SubElement(segment, "url")
+                url.text = task.url
+
+    return meta
+
+
+def image_element(etree: Any, image: ImageAnnotation) -> Any:
+    image_elem = etree.Element("image")
+    image_elem.set("id", image.id)
+    image_elem.set("name", image.name)
+    if image.subset:
+        image_elem.set("subset", image.subset)
+    if image.task_id:
+        image_elem.set("task_id", image.task_id)
+    if image.job_id:
+        image_elem.set("job_id", image.job_id)
+    image_elem.set("width", str(image.width))
+    image_elem.set("height", str(image.height))
+
+    for field, tag in SHAPE_ELEMENTS:
+        for shape in getattr(image, field):
+            shape_elem = etree.SubElement(image_elem, tag)
+            for key, value in shape.model_dump().items():
+                if key == "points":
+                    # CVAT format "x1,y1;x2,y2;..."
+                    shape_elem.set(key, ";".join(f"{x},{y}" for x, y in value))
+                elif key != "attributes" and value is not None:
+                    shape_elem.set(key, str(value))
+
+            add_attribute_elements(etree, shape_elem, shape.attributes)
+
+    for tag in image.tags:
+        tag_elem = etree.SubElement(image_elem, "tag")
+        tag_elem.set("label", tag.label)
+        tag_elem.set("source", tag.source)
+
+        add_attribute_elements(etree, tag_elem, tag.attributes)
+
+    return image_elem
+
+
+def add_attribute_elements(
+    etree: Any, element: Any, attributes: List[Attribute]
+) -> None:
+    for attr in attributes:
+        attr_elem = etree.SubElement(element, "attribute")
+        attr_elem.set("name", attr.name)
+        attr_elem.text = attr.value
@@ -1 +1,3 @@
+from .async_client import AsyncClient
 from .client import Client
+from .frame_cache import FrameCache
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, TypeVar
+
+from PIL import Image
+from pydantic import PrivateAttr, model_validator
+
+from .client import Client
+from .frame import Frame
+from .job import Job
+from .job_annotations import JobAnnotations
+from .project import Project
+from .task import Task
+from .transient_state import TransientStateModel
+
+T = TypeVar("T")
+
+
+class AsyncClient(TransientStateModel):
+    """Asyncio interface to the CVAT API.
+
+    The CVAT SDK is blocking, so every call runs in a thread pool with at most
+    `max_concurrency` requests in flight. The threads borrow SDK clients from
+    the pool of `client`, so concurrent requests are pipelined over separate
+    keep-alive connections without logging in again. Calls that are cancelled
+    before they start are never sent. Calls that are already running cannot
+    be interrupted and finish in the background.
+
+    Projects, tasks, jobs and frames are the regular proxies, so they can also
+    be used with blocking calls. The `AsyncClient` can be used in several
+    event loops one after the other, e.g. with repeated `asyncio.run` calls.
+
+    Attributes:
+        client: Client with the credentials. The client is shared, not copied:
+            if it keeps fewer than `max_concurrency` idle SDK clients, its
+            `max_idle_clients` is raised in place with `set_max_idle_clients_`.
+        max_concurrency: Maximum number of concurrent requests
+
+    Example:
+        ```python
+        async with AsyncClient.from_env_file(".env.cvat.secrets") as client:
+            project = client.project(217969)
+            tasks = await client.tasks(project)
+            jobs = await asyncio.gather(*[client.jobs(task) for task in tasks])
+            annotations = await asyncio.gather(
+                *[client.annotations(job) for task_jobs in jobs for job in task_jobs]
+            )
+        ```
+    """
+
+    client: Client
+    max_concurrency: int = 16
+
+    _executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _semaphore: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    _semaphore_loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def keep_idle_clients(self) -> AsyncClient:
+        """Keep an SDK client per concurrent request open between requests.
+
+        Modifies the passed `client` in place, so other users of the same
+        client also keep more idle SDK clients.
+        """
+        if self.client.max_idle_clients < self.max_concurrency:
+            self.client.set_max_idle_clients_(self.max_concurrency)
+        return self
+
+    @classmethod
+    def from_env(
+        cls, env_prefix: str | None = None, max_concurrency: int = 16
+    ) -> AsyncClient:
+        return cls(client=Client.from_env(env_prefix), max_concurrency=max_concurrency)
+
+    @classmethod
+    def from_env_file(cls, env_file: str, max_concurrency: int = 16) -> AsyncClient:
+        return cls(
+            client=Client.from_env_file(env_file), max_concurrency=max_concurrency
+        )
+
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking function in the thread pool, waiting for a free slot
+        if `max_concurrency` calls are already running."""
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.max_concurrency, thread_name_prefix="next-cvat"
+            )
+        # Semaphores are bound to the event loop they are first used in
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(function, *args, **kwargs)
+            )
+
+    def project(self, project_id: int) -> Project:
+        return self.client.project(project_id)
+
+    async def projects(self) -> list:
+        return await self.run(self.client.list_projects)
+
+    async def tasks(self, project: Project) -> List[Task]:
+        return await self.run(project.tasks)
+
+    async def jobs(self, task: Task) -> List[Job]:
+        return await self.run(task.jobs)
+
+    async def frames(self, task: Task) -> List[Frame]:
+        return await self.run(task.frames)
+
+    async def annotations(self, job: Job) -> JobAnnotations:
+        return await self.run(job.annotations)
+
+    async def update_annotations_(self, job: Job, annotations: JobAnnotations):
+        return await self.run(job.update_annotations_, annotations)
+
+    async def frame_image(self, frame: Frame) -> Image.Image:
+        """Download and decode the image of a frame."""
+        return await self.run(_load_image, frame)
+
+    async def close(self) -> None:
+        """Wait for running calls and close the thread pool and SDK clients."""
+        executor, self._executor = self._executor, None
+        self._semaphore = None
+        self._semaphore_loop = None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(executor.shutdown, cancel_futures=True)
+            )
+        self.client.close()
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def _load_image(frame: Frame) -> Image.Image:
+    image = frame.pil_image()
+    image.load()
+    return image
@@ -1,26 +1,66 @@
 from __future__ import annotations
 
+import threading
 from contextlib import contextmanager
-from typing import Any, Generator
+from typing import Any, Generator, Optional
 
 from cvat_sdk import Client as CVATClient
 from cvat_sdk import make_client
-from pydantic import BaseModel
+from pydantic import PrivateAttr
 
 from next_cvat.access_token import AccessToken
 from next_cvat.settings import settings
 
+from .client_pool import ClientPool
 from .frame import Frame
+from .frame_cache import FrameCache
 from .job import Job
 from .job_annotations import JobAnnotations
+from .metadata_cache import MetadataCache
 from .project import Project
 from .task import Task
+from .transient_state import TransientStateModel
+
+
+class Client(TransientStateModel):
+    """Entry point for the CVAT API.
+
+    Authenticated CVAT SDK clients are kept in a pool and reused by all
+    projects, tasks, jobs and frames created from this client, so repeated
+    calls do not log in again. Close the client, or use it as a context
+    manager, to close the pooled connections. Task frames and project labels
+    are cached per client for `metadata_ttl` seconds.
+
+    Attributes:
+        username: CVAT username for basic authentication
+        password: CVAT password for basic authentication
+        token: Serialized `AccessToken`, used instead of username and password
+        host: CVAT server host
+        max_idle_clients: Maximum number of idle SDK clients kept open
+        frame_cache: Optional on-disk cache for downloaded frame images
+        metadata_ttl: Seconds until cached task frames and project labels expire
+        metadata_max_entries: Maximum number of cached metadata entries
+
+    Example:
+        ```python
+        with Client.from_env_file(".env.cvat.secrets") as client:
+            for frame in client.project(217969).task(906591).frames():
+                frame.pil_image()
+        ```
+    """
 
-
-class Client(BaseModel):
     username: str | None = None
     password: str | None = None
     token: str | None = None
+    host: str = "app.cvat.ai"
+    max_idle_clients: int = 4
+    frame_cache: Optional[FrameCache] = None
+    metadata_ttl: float = 300.0
+    metadata_max_entries: int = 1024
+
+    _pool: Optional[ClientPool] = PrivateAttr(default=None)
+    _pool_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _metadata_cache: Optional[MetadataCache] = PrivateAttr(default=None)
 
     @classmethod
     def from_env(cls, env_prefix: str | None = None) -> Client:
@@ -40,38 +80,89 @@ class Client(BaseModel):
 
     @contextmanager
     def cvat_client(self) -> Generator[CVATClient, Any, Any]:
+        """Borrow an authenticated CVAT SDK client from the pool."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ClientPool(
+                    connect=self.connect_cvat_client, max_idle=self.max_idle_clients
+                )
+            pool = self._pool
+
+        with pool.client() as client:
+            yield client
+
+    def set_max_idle_clients_(self, max_idle_clients: int) -> Client:
+        """Change how many idle SDK clients are kept open, also for a pool
+        that is already in use."""
+        with self._pool_lock:
+            self.max_idle_clients = max_idle_clients
+            if self._pool is not None:
+                self._pool.max_idle = max_idle_clients
+        return self
+
+    @property
+    def metadata_cache(self) -> MetadataCache:
+        """Cache of task frames and project labels shared by this client."""
+        with self._pool_lock:
+            if self._metadata_cache is None:
+                self._metadata_cache = MetadataCache(
+                    ttl=self.metadata_ttl, max_entries=self.metadata_max_entries
+                )
+            return self._metadata_cache
+
+    def connect_cvat_client(self) -> CVATClient:
+        """Create a new authenticated CVAT SDK client that is not pooled."""
         if self.login_method() == "token":
-            with self.token_cvat_client() as client:
-                yield client
+            return self._connect_token()
         elif self.login_method() == "basic":
-            with self.basic_cvat_client() as client:
-                yield client
+            return self._connect_basic()
         else:
             raise ValueError("Unsupported login method")
 
     @contextmanager
     def basic_cvat_client(self) -> Generator[CVATClient, None, None]:
-        with make_client(
-            host="app.cvat.ai", credentials=(self.username, self.password)
-        ) as client:
-            client.login((self.username, self.password))
+        with self._connect_basic() as client:
             yield client
 
     @contextmanager
     def token_cvat_client(self) -> Generator[CVATClient, None, None]:
-        with make_client(host="app.cvat.ai") as client:
-            token = AccessToken.deserialize(self.token)
+        with self._connect_token() as client:
+            yield client
 
-            # Only set Authorization header if we have a real API key (not session-based)
-            if token.api_key != "session-based-auth":
-                client.api_client.set_default_header(
-                    "Authorization", f"Token {token.api_key}"
-                )
+    def _connect_basic(self) -> CVATClient:
+        # Logs in with the credentials
+        return make_client(host=self.host, credentials=(self.username, self.password))
 
-            client.api_client.cookies["sessionid"] = token.sessionid
-            client.api_client.cookies["csrftoken"] = token.csrftoken
+    def _connect_token(self) -> CVATClient:
+        client = make_client(host=self.host)
+        token = AccessToken.deserialize(self.token)
 
-            yield client
+        # Only set Authorization header if we have a real API key (not session-based)
+        if token.api_key != "session-based-auth":
+            client.api_client.set_default_header(
+                "Authorization", f"Token {token.api_key}"
+            )
+
+        client.api_client.cookies["sessionid"] = token.sessionid
+        client.api_client.cookies["csrftoken"] = token.csrftoken
+        return client
+
+    def close(self) -> None:
+        """Close the pooled CVAT SDK clients.
+
+        The client can still be used afterwards and will connect again.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.close()
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def create_token(self) -> AccessToken:
         with self.basic_cvat_client() as client:
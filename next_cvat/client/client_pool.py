@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generator, List
+
+from cvat_sdk import Client as CVATClient
+from pydantic import BaseModel, PrivateAttr
+
+
+class ClientPool(BaseModel):
+    """Thread-safe pool of authenticated CVAT SDK clients.
+
+    Clients are created on demand with `connect` and returned to the pool after
+    use, so their login and keep-alive HTTP connections are reused by later
+    calls. Each client is only used by one borrower at a time. A client that
+    was in use when an exception was raised is closed instead of returned, in
+    case the error left its session in a bad state.
+
+    Attributes:
+        connect: Creates a new authenticated client
+        max_idle: Maximum number of idle clients kept open
+
+    Example:
+        ```python
+        pool = ClientPool(connect=lambda: make_client("app.cvat.ai", ...))
+
+        with pool.client() as cvat_client:
+            projects = cvat_client.projects.list()
+
+        pool.close()
+        ```
+    """
+
+    connect: Callable[[], CVATClient]
+    max_idle: int = 4
+
+    _idle: List[CVATClient] = PrivateAttr(default_factory=list)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _closed: bool = PrivateAttr(default=False)
+
+    @contextmanager
+    def client(self) -> Generator[CVATClient, None, None]:
+        """Borrow a client from the pool, connecting a new one if none is idle."""
+        with self._lock:
+            if self._closed:
+                raise ValueError("Client pool is closed")
+            cvat_client = self._idle.pop() if self._idle else None
+
+        if cvat_client is None:
+            cvat_client = self.connect()
+
+        try:
+            yield cvat_client
+        except BaseException:
+            cvat_client.close()
+            raise
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(cvat_client)
+                return
+        cvat_client.close()
+
+    def close(self) -> None:
+        """Close all idle clients. Borrowed clients are closed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for cvat_client in idle:
+            cvat_client.close()
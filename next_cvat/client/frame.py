@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 from typing import TYPE_CHECKING
 
 from cvat_sdk.api_client import models
@@ -20,9 +21,7 @@ class Frame(BaseModel, arbitrary_types_allowed=True):
         return self.frame_info
 
     def pil_image(self) -> Image.Image:
-        with self.task.cvat() as cvat_task:
-            frame_bytes = cvat_task.get_frame(self.id)
-            return Image.open(frame_bytes)
+        return Image.open(io.BytesIO(self.task.frame_bytes(self.id)))
 
     def _repr_html_(self) -> str:
         img = self.pil_image()
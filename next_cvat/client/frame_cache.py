@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import quote
+
+from pydantic import PrivateAttr
+
+from .transient_state import TransientStateModel
+
+
+class FrameCache(TransientStateModel):
+    """Content-addressed on-disk cache of downloaded frame images.
+
+    Image bytes are stored once per content digest under `objects/` and a
+    small reference file per server, task and frame under `refs/` points to
+    them, so identical frames in different tasks share storage. When the
+    objects grow larger than `max_bytes`, the least recently used ones are
+    removed until they fit `low_watermark * max_bytes`, so the directory is
+    only scanned once every so many downloads. Writes are atomic, so several
+    processes can share a cache directory.
+
+    Attributes:
+        directory: Directory of the cache, created on first write
+        max_bytes: Maximum total size of the cached images
+        low_watermark: Fraction of `max_bytes` that eviction frees space down to
+
+    Example:
+        ```python
+        client = Client.from_env_file(".env.cvat.secrets")
+        client.frame_cache = FrameCache(directory="frames", max_bytes=2 * 1024**3)
+
+        frame.pil_image()  # downloaded
+        frame.pil_image()  # read from disk
+        ```
+    """
+
+    directory: Path
+    max_bytes: int = 10 * 1024**3
+    low_watermark: float = 0.9
+
+    _size: Optional[int] = PrivateAttr(default=None)
+    _evicting: bool = PrivateAttr(default=False)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def get(
+        self, host: str, task_id: int, frame_id: int, quality: Optional[str] = None
+    ) -> Optional[bytes]:
+        """Cached image bytes of a frame, or None if it is not cached."""
+        try:
+            digest = self._ref_path(host, task_id, frame_id, quality).read_text()
+            object_path = self._object_path(digest)
+            data = object_path.read_bytes()
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Mark as recently used for the eviction
+        try:
+            os.utime(object_path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put_(
+        self,
+        host: str,
+        task_id: int,
+        frame_id: int,
+        data: bytes,
+        quality: Optional[str] = None,
+    ) -> FrameCache:
+        """Store the image bytes of a frame and evict old images if needed."""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            _write_atomic(object_path, data)
+            with self._lock:
+                if self._size is not None:
+                    self._size += len(data)
+
+        _write_atomic(self._ref_path(host, task_id, frame_id, quality), digest.encode())
+        self.evict_()
+        return self
+
+    def evict_(self) -> FrameCache:
+        """Remove least recently used images if the cache is larger than
+        `max_bytes`, until it fits `low_watermark * max_bytes`."""
+        with self._lock:
+            if self._evicting or (
+                self._size is not None and self._size <= self.max_bytes
+            ):
+                return self
+            # Scan without holding the lock, other threads keep counting
+            self._evicting = True
+            size_before = self._size
+
+        try:
+            objects = sorted(self._object_stats(), key=lambda item: item[0].st_mtime_ns)
+            size = sum(stat.st_size for stat, _ in objects)
+            if size > self.max_bytes:
+                target = self.max_bytes * self.low_watermark
+                for stat, path in objects:
+                    if size <= target:
+                        break
+                    path.unlink(missing_ok=True)
+                    size -= stat.st_size
+        finally:
+            with self._lock:
+                self._evicting = False
+
+        with self._lock:
+            if size_before is None or self._size is None:
+                self._size = size
+            else:
+                # Keep the images added while scanning
+                self._size += size - size_before
+        return self
+
+    def clear_(self) -> FrameCache:
+        """Remove all cached images and references."""
+        with self._lock:
+            for subdirectory in ("objects", "refs"):
+                for path in (self.directory / subdirectory).glob("**/*"):
+                    if path.is_file():
+                        path.unlink(missing_ok=True)
+            self._size = 0
+        return self
+
+    def _objects(self):
+        return (
+            path
+            for path in (self.directory / "objects").glob("*/*")
+            if not path.name.endswith(".tmp")
+        )
+
+    def _object_stats(self):
+        for path in self._objects():
+            try:
+                yield path.stat(), path
+            except FileNotFoundError:
+                # Evicted by another process
+                pass
+
+    def _object_path(self, digest: str) -> Path:
+        if len(digest) != 32:
+            raise ValueError(f"Invalid digest {digest}")
+        return self.directory / "objects" / digest[:2] / digest
+
+    def _ref_path(
+        self, host: str, task_id: int, frame_id: int, quality: Optional[str]
+    ) -> Path:
+        name = f"{frame_id}.{quality or 'default'}"
+        return self.directory / "refs" / quote(host, safe="") / str(task_id) / name
+
+
+def _write_atomic(path: Union[str, Path], data: bytes) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple, TypeVar
+
+from pydantic import PrivateAttr
+
+from .transient_state import TransientStateModel
+
+T = TypeVar("T")
+
+
+class MetadataCache(TransientStateModel):
+    """Thread-safe cache of CVAT metadata such as task frames and project labels.
+
+    Entries expire `ttl` seconds after they were loaded and the least recently
+    used entries are dropped when there are more than `max_entries`. Methods
+    that change metadata on the server invalidate the affected entries. The
+    entries are not pickled or copied, copies start empty.
+
+    Attributes:
+        ttl: Seconds until an entry is loaded again
+        max_entries: Maximum number of cached entries
+
+    Example:
+        ```python
+        cache = MetadataCache(ttl=60)
+
+        labels = cache.get_or_load(
+            ("app.cvat.ai", "project", 217969, "labels"), cvat_project.get_labels
+        )
+        cache.invalidate_(("app.cvat.ai", "project", 217969, "labels"))
+        ```
+    """
+
+    ttl: float = 300.0
+    max_entries: int = 1024
+
+    _entries: OrderedDict[Hashable, Tuple[float, Any]] = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Cached value for the key, calling `load` if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # Load without holding the lock so slow requests do not block other keys
+        value = load()
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate_(self, key: Hashable) -> MetadataCache:
+        """Remove an entry so that it is loaded again on the next access."""
+        with self._lock:
+            self._entries.pop(key, None)
+        return self
+
+    def clear_(self) -> MetadataCache:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+        return self
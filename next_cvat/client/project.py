@@ -4,7 +4,6 @@ import json
 import tempfile
 import zipfile
 from contextlib import contextmanager
-from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Generator, Union
 
@@ -88,7 +87,8 @@ class Project(BaseModel):
             # Get project details to get the organization ID
             project = client.projects.retrieve(self.id)
 
-            # Set organization header
+            # Set organization header, only for this request since the client
+            # is returned to the pool
             client.api_client.set_default_header("X-Organization", "NextMLAB")
 
             # Create task in the project
@@ -99,7 +99,10 @@ class Project(BaseModel):
                 image_quality=image_quality,
                 status="annotation",
             )
-            task = client.tasks.create(spec=spec)
+            try:
+                task = client.tasks.create(spec=spec)
+            finally:
+                client.api_client.default_headers.pop("X-Organization", None)
             return Task(project=self, id=task.id)
 
     def task(self, task_id: int) -> Task:
@@ -111,22 +114,35 @@ class Project(BaseModel):
             return [Task(project=self, id=task.id) for task in project.get_tasks()]
 
     def __hash__(self) -> int:
-        return hash(self.model_dump_json())
+        return hash(self.id)
 
-    @lru_cache
     def labels(
         self, id: int | None = None, name: str | None = None
     ) -> list[models.Label]:
-        with self.cvat() as cvat_project:
-            labels = cvat_project.get_labels()
+        """Labels of the project, cached by the client for `metadata_ttl` seconds."""
+        labels = self.client.metadata_cache.get_or_load(
+            self._labels_key(), self._load_labels
+        )
+
+        if id is not None:
+            labels = [label for label in labels if label.id == id]
+
+        if name is not None:
+            labels = [label for label in labels if label.name == name]
 
-            if id is not None:
-                labels = [label for label in labels if label.id == id]
+        return list(labels)
 
-            if name is not None:
-                labels = [label for label in labels if label.name == name]
+    def invalidate_labels_(self) -> Project:
+        """Load the labels from CVAT again on the next call to `labels()`."""
+        self.client.metadata_cache.invalidate_(self._labels_key())
+        return self
+
+    def _labels_key(self) -> tuple:
+        return (self.client.host, "project", self.id, "labels")
 
-            return labels
+    def _load_labels(self) -> list[models.Label]:
+        with self.cvat() as cvat_project:
+            return cvat_project.get_labels()
 
     def label(self, name: str) -> models.Label:
         labels = self.labels(name=name)
@@ -147,3 +163,4 @@ class Project(BaseModel):
         """
         with self.client.cvat_client() as client:
             client.tasks.remove_by_ids([task_id])
+        self.task(task_id).invalidate_frames_()
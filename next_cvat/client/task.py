@@ -1,26 +1,41 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from functools import lru_cache
-from pathlib import Path
-from typing import TYPE_CHECKING, Generator, List, Union
+from pathlib import Path, PurePosixPath
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from cvat_sdk.api_client.exceptions import ApiException
 from cvat_sdk.api_client.model.data_request import DataRequest
 from cvat_sdk.core.proxies.tasks import Task as CVATTask
-from pydantic import BaseModel
+from pydantic import PrivateAttr
 
 from .frame import Frame
 from .job import Job
+from .transient_state import TransientStateModel
 
 if TYPE_CHECKING:
     from .project import Project
 
 
-class Task(BaseModel):
+class Task(TransientStateModel):
     project: Project
     id: int
 
+    _frame_indices_source: Optional[List[Frame]] = PrivateAttr(default=None)
+    _frame_indices_cache: Any = PrivateAttr(default=None)
+
     @contextmanager
     def cvat(self) -> Generator[CVATTask, None, None]:
         with self.project.client.cvat_client() as cvat_client:
@@ -52,13 +67,21 @@ class Task(BaseModel):
             f"{k}={v}" for k, v in params.items() if v is not None
         )
 
-        frames = self.frames()
+        frames_by_id, frames_by_name, frames_by_image_name = self._frame_indices()
+
+        if frame_id is not None:
+            frames = [frames_by_id[frame_id]] if frame_id in frames_by_id else []
+        elif name is not None:
+            frames = frames_by_name.get(name, [])
+        elif image_name is not None:
+            frames = frames_by_image_name.get(image_name, [])
+        else:
+            frames = list(frames_by_id.values())
 
         frames = [
             frame
             for frame in frames
-            if (frame.id == frame_id or frame_id is None)
-            and (frame.frame_info.name == name or name is None)
+            if (frame.frame_info.name == name or name is None)
             and (Path(frame.frame_info.name).name == image_name or image_name is None)
         ]
 
@@ -69,11 +92,46 @@ class Task(BaseModel):
         else:
             return frames[0]
 
+    def _frame_indices(
+        self,
+    ) -> Tuple[Dict[int, Frame], Dict[str, List[Frame]], Dict[str, List[Frame]]]:
+        """Frames by id, full name and image name, built once per `frames()`."""
+        frames = self.frames()
+        if self._frame_indices_source is not frames:
+            frames_by_id = {}
+            frames_by_name = defaultdict(list)
+            frames_by_image_name = defaultdict(list)
+            for frame in frames:
+                frames_by_id[frame.id] = frame
+                frames_by_name[frame.frame_info.name].append(frame)
+                frames_by_image_name[Path(frame.frame_info.name).name].append(frame)
+
+            self._frame_indices_cache = (
+                frames_by_id,
+                dict(frames_by_name),
+                dict(frames_by_image_name),
+            )
+            self._frame_indices_source = frames
+        return self._frame_indices_cache
+
     def __hash__(self) -> int:
-        return hash(self.model_dump_json())
+        return hash((self.project.id, self.id))
 
-    @lru_cache
     def frames(self) -> list[Frame]:
+        """Frames of the task, cached by the client for `metadata_ttl` seconds."""
+        return self.project.client.metadata_cache.get_or_load(
+            self._frames_key(), self._load_frames
+        )
+
+    def invalidate_frames_(self) -> Task:
+        """Load the frames from CVAT again on the next call to `frames()`."""
+        self.project.client.metadata_cache.invalidate_(self._frames_key())
+        return self
+
+    def _frames_key(self) -> tuple:
+        return (self.project.client.host, "task", self.id, "frames")
+
+    def _load_frames(self) -> list[Frame]:
         with self.cvat() as cvat_task:
             # Get task data directly
             task_data = cvat_task.get_meta()
@@ -86,6 +144,82 @@ class Task(BaseModel):
                 if i not in deleted_frames  # Skip deleted frames
             ]
 
+    def frame_bytes(self, frame_id: int, quality: Optional[str] = None) -> bytes:
+        """
+        Encoded image bytes of a frame, read from the client's frame cache if set
+
+        Args:
+            frame_id: ID of the frame (the frame index, 0-based)
+            quality: "compressed" or "original", defaults to the server default
+        """
+        client = self.project.client
+        frame_cache = client.frame_cache
+        if frame_cache is not None:
+            data = frame_cache.get(client.host, self.id, frame_id, quality=quality)
+            if data is not None:
+                return data
+
+        params = {} if quality is None else dict(quality=quality)
+        with client.cvat_client() as cvat_client:
+            _, response = cvat_client.api_client.tasks_api.retrieve_data(
+                self.id, number=frame_id, type="frame", **params
+            )
+        data = response.data
+
+        if frame_cache is not None:
+            frame_cache.put_(client.host, self.id, frame_id, data, quality=quality)
+        return data
+
+    def download_frames_(
+        self,
+        frame_ids: Optional[Iterable[int]] = None,
+        dest: Optional[Union[str, Path]] = None,
+        workers: int = 8,
+        quality: Optional[str] = None,
+    ) -> Task:
+        """
+        Download frames concurrently with pooled CVAT clients
+
+        Frames are written to `dest` under their image names and stored in the
+        client's frame cache if one is set. Frames that are already cached are
+        not downloaded again.
+
+        Args:
+            frame_ids: Frames to download, defaults to all frames of the task
+            dest: Directory to write the images to, if None the frames are
+                only downloaded into the frame cache
+            workers: Number of concurrent downloads
+            quality: "compressed" or "original", defaults to the server default
+
+        Raises:
+            ValueError: If there is nowhere to store the frames or a frame
+                is not part of the task
+        """
+        if dest is None and self.project.client.frame_cache is None:
+            raise ValueError("Either dest or a client frame cache is required")
+
+        frames = {frame.id: frame for frame in self.frames()}
+        frame_ids = list(frames) if frame_ids is None else list(frame_ids)
+        missing = [frame_id for frame_id in frame_ids if frame_id not in frames]
+        if missing:
+            raise ValueError(f"Frames {missing} not found in task {self.id}")
+
+        def download(frame_id: int) -> None:
+            data = self.frame_bytes(frame_id, quality=quality)
+            if dest is not None:
+                # Keep subdirectories of the image name but never leave dest
+                parts = PurePosixPath(frames[frame_id].frame_info.name).parts
+                path = Path(dest).joinpath(
+                    *(part for part in parts if part not in ("/", ".."))
+                )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the results to raise download errors
+            list(executor.map(download, frame_ids))
+        return self
+
     def upload_images_(
         self,
         image_paths: Union[str, Path, List[Union[str, Path]]],
@@ -93,31 +227,35 @@ class Task(BaseModel):
     ) -> None:
         """
         Upload images to this task
-        
+
         Args:
             image_paths: Path or list of paths to images
             image_quality: Image quality (0-100) for compressed images
         """
         if isinstance(image_paths, (str, Path)):
             image_paths = [image_paths]
-        
+
         image_paths = [Path(p) for p in image_paths]
-        
+
         with self.cvat() as cvat_task:
-            cvat_task.upload_data(
-                resources=image_paths,
-                params={
-                    "image_quality": image_quality,
-                }
-            )
+            try:
+                cvat_task.upload_data(
+                    resources=image_paths,
+                    params={
+                        "image_quality": image_quality,
+                    },
+                )
+            finally:
+                # The frames have changed, even if the upload failed midway
+                self.invalidate_frames_()
 
     def delete_frame_(self, frame_id: int) -> None:
         """
         Delete a single frame from the task
-        
+
         Args:
             frame_id: ID of the frame to delete (this is the frame index, 0-based)
-            
+
         Raises:
             ValueError: If frame_id is invalid
             ApiException: If CVAT API call fails
@@ -125,28 +263,29 @@ class Task(BaseModel):
         with self.cvat() as cvat_task:
             try:
                 print(f"Deleting frame {frame_id}...")
-                
+
                 # Get the frame name before deletion
                 frames_before = cvat_task.get_frames_info()
                 if frame_id >= len(frames_before):
                     raise ValueError(f"Frame with ID {frame_id} not found")
                 frame_name = frames_before[frame_id].name
                 print(f"Frame name: {frame_name}")
-                
+
                 # Delete the frame using remove_frames_by_ids
                 # Note: frame_id is the frame index (0-based)
                 cvat_task.remove_frames_by_ids([frame_id])
-                
+
                 # Wait for the deletion to complete
                 print("Waiting for deletion to complete...")
                 from time import sleep
+
                 sleep(5)  # Give CVAT some time to process the deletion
-                
+
                 # Clear our frames cache since the frames have changed
-                self.frames.cache_clear()
+                self.invalidate_frames_()
                 print("Frame deleted successfully")
                 return
-                    
+
             except ApiException as e:
                 if "frames with id" in str(e) and "were not found" in str(e):
                     raise ValueError(f"Frame with ID {frame_id} not found") from e
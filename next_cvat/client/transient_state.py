@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class TransientStateModel(BaseModel):
+    """Model whose private attributes only hold transient state such as locks,
+    connection pools and caches.
+
+    The private attributes are ignored when comparing models, and pickled or
+    deep-copied models start with fresh private attributes, so the fields
+    alone define the model like for a model without private attributes.
+    """
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state["__pydantic_private__"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        super().__setstate__(state)
+        # Initializes the private attributes with their defaults
+        self.model_post_init(None)
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Any:
+        copied = type(self).__new__(type(self))
+        copied.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return copied
@@ -1,7 +1,7 @@
 from .attribute import Attribute
 from .box import Box
 from .ellipse import Ellipse
-from .image_annotation import ImageAnnotation
+from .image_annotation import ImageAnnotation, InstanceMaps
 from .job_status import JobStatus
 from .label import Label
 from .label_attribute import LabelAttribute
@@ -17,6 +17,7 @@ __all__ = [
     "Box",
     "Ellipse",
     "ImageAnnotation",
+    "InstanceMaps",
     "JobStatus",
     "Label",
     "LabelAttribute",
@@ -68,3 +68,18 @@ class Box(BaseModel):
             A numpy 2D array of booleans where True indicates the box interior
         """
         return self.polygon().segmentation(height=height, width=width)
+
+    def crop_segmentation(
+        self, height: int, width: int
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Create a boolean segmentation mask of the box, see
+        `Polygon.crop_segmentation`.
+
+        Args:
+            height: Height of the image
+            width: Width of the image
+
+        Returns:
+            The mask of the bounding box and its (top, left) offset in the image
+        """
+        return self.polygon().crop_segmentation(height=height, width=width)
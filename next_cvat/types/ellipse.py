@@ -91,10 +91,36 @@ class Ellipse(BaseModel):
         Returns:
             A numpy 2D array of booleans where True indicates the ellipse interior
         """
+        crop, (top, left) = self.crop_segmentation(height, width)
+        mask = np.zeros((height, width), dtype=bool)
+        mask[top : top + crop.shape[0], left : left + crop.shape[1]] = crop
+        return mask
+
+    def crop_segmentation(
+        self, height: int, width: int
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Create a boolean segmentation mask of the ellipse's bounding box.
+
+        Only the bounding box (clipped to the image) is rasterized, which is
+        much cheaper than `segmentation` for small ellipses in large images.
+
+        Args:
+            height: Height of the image
+            width: Width of the image
+
+        Returns:
+            The mask of the bounding box and its (top, left) offset in the image.
+            The mask is empty if the ellipse is outside of the image.
+        """
+        left = min(max(math.floor(self.cx - self.rx), 0), width)
+        top = min(max(math.floor(self.cy - self.ry), 0), height)
+        right = max(min(math.ceil(self.cx + self.rx) + 1, width), left)
+        bottom = max(min(math.ceil(self.cy + self.ry) + 1, height), top)
+
         # Create coordinate grids
-        y, x = np.ogrid[:height, :width]
+        y, x = np.ogrid[top:bottom, left:right]
 
         # Ellipse equation: ((x-h)/rx)^2 + ((y-k)/ry)^2 <= 1
         # where (h,k) is the center
-        mask = ((x - self.cx) / self.rx) ** 2 + ((y - self.cy) / self.ry) ** 2 <= 1
-        return mask
+        crop = ((x - self.cx) / self.rx) ** 2 + ((y - self.cy) / self.ry) ** 2 <= 1
+        return crop, (top, left)
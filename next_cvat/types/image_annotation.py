@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Mapping, Optional, Type, Union
 
+import numpy as np
 from pydantic import BaseModel
 
 from .box import Box
@@ -71,3 +72,177 @@ class ImageAnnotation(BaseModel):
     polylines: List[Polyline] = []
     ellipses: List[Ellipse] = []
     tags: List[Tag] = []
+
+    def label_map(
+        self,
+        label_indices: Mapping[str, int],
+        dtype: Type[np.integer] = np.uint8,
+        include_occluded: bool = True,
+        background: int = 0,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Render all shapes of the image into a single semantic label map.
+
+        Shapes are drawn in `z_order` so that shapes with a higher z_order
+        cover the ones below. Within the same z_order, occluded shapes are
+        drawn first, then boxes, polygons, masks and ellipses in list order.
+        Each shape is rasterized only within its bounding box and
+        written straight into the output, so the cost is close to the total
+        number of shape pixels. Polylines and tags have no area and are
+        ignored.
+
+        Args:
+            label_indices: Index to write for each label. Shapes with labels
+                that are not in the mapping are skipped.
+            dtype: Integer type of the label map, e.g. np.uint8 or np.uint16
+            include_occluded: Whether to draw occluded shapes
+            background: Index of pixels without shapes
+            out: Optional array with shape (height, width) to render into,
+                e.g. a buffer that is reused for many images
+
+        Returns:
+            Label map with shape (height, width), `out` if it was given
+
+        Raises:
+            ValueError: If an index does not fit into the dtype or `out` has
+                the wrong shape
+
+        Example:
+            ```python
+            label_map = image.label_map({"vegetation": 1, "road": 2})
+            Image.fromarray(label_map).save("target.png")
+            ```
+        """
+        if out is None:
+            out = np.empty((self.height, self.width), dtype=dtype)
+        elif out.shape != (self.height, self.width):
+            raise ValueError(
+                f"Output must have shape {(self.height, self.width)}, got {out.shape}"
+            )
+
+        _check_indices(out.dtype, [background, *label_indices.values()])
+        out.fill(background)
+
+        for shape in self._area_shapes(label_indices, include_occluded):
+            crop, (top, left) = shape.crop_segmentation(self.height, self.width)
+            out[top : top + crop.shape[0], left : left + crop.shape[1]][crop] = (
+                label_indices[shape.label]
+            )
+        return out
+
+    def instance_maps(
+        self,
+        label_indices: Mapping[str, int],
+        include_occluded: bool = True,
+        instance_out: Optional[np.ndarray] = None,
+        class_out: Optional[np.ndarray] = None,
+    ) -> InstanceMaps:
+        """Render all shapes of the image into an instance id map and a class
+        map in one pass.
+
+        Every box, polygon, mask and ellipse is an instance. Ids start at 1 in
+        drawing order, which is the same as for `label_map`, so overlaps are
+        resolved by `z_order`. Pixels without shapes are 0 in both maps.
+
+        Args:
+            label_indices: Class index for each label. Shapes with labels that
+                are not in the mapping are skipped.
+            include_occluded: Whether to draw occluded shapes
+            instance_out: Optional int32 array with shape (height, width) to
+                render the instance ids into, e.g. a `np.memmap` slice of a
+                dataset file
+            class_out: Optional integer array with shape (height, width) to
+                render the class indices into
+
+        Returns:
+            Instance map, class map and the class of each instance
+
+        Raises:
+            ValueError: If an output has the wrong shape or dtype or a class
+                index does not fit into the class map
+
+        Example:
+            ```python
+            instance_maps = np.lib.format.open_memmap(
+                "instances.npy", mode="w+", dtype=np.int32,
+                shape=(len(images), height, width),
+            )
+            for index, image in enumerate(images):
+                maps = image.instance_maps(
+                    {"vegetation": 1, "road": 2},
+                    instance_out=instance_maps[index],
+                )
+            ```
+        """
+        shape = (self.height, self.width)
+        if instance_out is None:
+            instance_out = np.empty(shape, dtype=np.int32)
+        elif instance_out.shape != shape or instance_out.dtype != np.int32:
+            raise ValueError(
+                f"Instance output must be an int32 array with shape {shape}"
+            )
+
+        if class_out is None:
+            class_out = np.empty(shape, dtype=np.int32)
+        elif class_out.shape != shape:
+            raise ValueError(f"Class output must have shape {shape}")
+
+        _check_indices(class_out.dtype, [0, *label_indices.values()])
+        instance_out.fill(0)
+        class_out.fill(0)
+
+        shapes = self._area_shapes(label_indices, include_occluded)
+        for instance_id, shape in enumerate(shapes, start=1):
+            crop, (top, left) = shape.crop_segmentation(self.height, self.width)
+            rows = slice(top, top + crop.shape[0])
+            cols = slice(left, left + crop.shape[1])
+            instance_out[rows, cols][crop] = instance_id
+            class_out[rows, cols][crop] = label_indices[shape.label]
+
+        return InstanceMaps(
+            instance_map=instance_out,
+            class_map=class_out,
+            instance_classes=np.array(
+                [0] + [label_indices[shape.label] for shape in shapes], dtype=np.int32
+            ),
+            instance_shapes=shapes,
+        )
+
+    def _area_shapes(
+        self, label_indices: Mapping[str, int], include_occluded: bool
+    ) -> List[Union[Box, Polygon, Mask, Ellipse]]:
+        """Shapes with an area in drawing order, see `label_map`."""
+        shapes = [
+            shape
+            for shapes in (self.boxes, self.polygons, self.masks, self.ellipses)
+            for shape in shapes
+            if shape.label in label_indices and (include_occluded or not shape.occluded)
+        ]
+        shapes.sort(key=lambda shape: (shape.z_order, not shape.occluded))
+        return shapes
+
+
+class InstanceMaps(BaseModel, arbitrary_types_allowed=True):
+    """Result of `ImageAnnotation.instance_maps`.
+
+    Attributes:
+        instance_map: Instance id of each pixel (int32), 0 for background
+        class_map: Class index of each pixel, 0 for background
+        instance_classes: Class index of each instance id (int32), so
+            `instance_classes[instance_map]` is the class map. Index 0 is the
+            background.
+        instance_shapes: Shape of each instance, `instance_shapes[i - 1]` for
+            instance id i
+    """
+
+    instance_map: np.ndarray
+    class_map: np.ndarray
+    instance_classes: np.ndarray
+    instance_shapes: List[Union[Box, Polygon, Mask, Ellipse]]
+
+
+def _check_indices(dtype: np.dtype, indices: List[int]) -> None:
+    info = np.iinfo(dtype)
+    for index in indices:
+        if not info.min <= index <= info.max:
+            raise ValueError(f"Label index {index} does not fit into {dtype}")
@@ -1,44 +1,69 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
 
 import numpy as np
 from cvat_sdk.api_client import models
 from PIL import Image
-from pydantic import BaseModel
+from pydantic import BaseModel, field_serializer, field_validator
 
 from .attribute import Attribute
 
 
-class Mask(BaseModel):
+class Mask(BaseModel, arbitrary_types_allowed=True):
     """A binary mask annotation in CVAT.
-    
+
     Masks are used to store pixel-wise segmentations efficiently using run-length encoding (RLE).
     They can be created from numpy arrays or PIL Images and support various operations.
-    
+
     Attributes:
         label: The label/class name for this mask
         source: The source of this annotation (e.g. "manual", "automatic")
         occluded: Whether this mask is occluded (0 for no, 1 for yes)
         z_order: The z-order/layer of this mask
-        rle: Run-length encoded string representing the mask
+        rle: Run lengths of the mask (uint32), alternating between background
+            and foreground and starting with background. Accepts CVAT's
+            comma-separated string and is serialized back to it.
         top: Top coordinate of the mask's bounding box
         left: Left coordinate of the mask's bounding box
         height: Height of the mask's bounding box
         width: Width of the mask's bounding box
         attributes: List of additional attributes for this mask
     """
+
     label: str
     source: str
     occluded: int
     z_order: int
-    rle: str
+    rle: np.ndarray
     top: int
     left: int
     height: int
     width: int
     attributes: List[Attribute]
 
+    @field_validator("rle", mode="before")
+    def parse_rle(cls, v):
+        """Parse run lengths from CVAT's string format ("83, 182, 29, ...")."""
+        return parse_rle(v)
+
+    @field_serializer("rle")
+    def serialize_rle(self, rle: np.ndarray) -> str:
+        return format_rle(rle)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Mask):
+            return NotImplemented
+
+        return (
+            type(self) is type(other)
+            and np.array_equal(self.rle, other.rle)
+            and {k: v for k, v in self.__dict__.items() if k != "rle"}
+            == {k: v for k, v in other.__dict__.items() if k != "rle"}
+        )
+
     @classmethod
     def from_segmentation(
         cls,
@@ -50,7 +75,7 @@ class Mask(BaseModel):
         attributes: List[Attribute] = [],
     ) -> Mask:
         """Create a Mask from a segmentation array or image.
-        
+
         Args:
             segmentation: Boolean numpy array or PIL Image to convert to mask
             label: The label/class name for this mask
@@ -58,10 +83,10 @@ class Mask(BaseModel):
             occluded: Whether this mask is occluded (default: 0)
             z_order: The z-order/layer of this mask (default: 0)
             attributes: List of additional attributes (default: [])
-            
+
         Returns:
             A new Mask instance
-            
+
         Raises:
             ValueError: If the segmentation is empty (all False)
         """
@@ -90,7 +115,7 @@ class Mask(BaseModel):
         width = right - left
 
         crop = segmentation[top:bottom, left:right]
-        rle = cls.rle_encode(crop)
+        rle = cls.rle_encode_runs(crop)
 
         return cls(
             label=label,
@@ -105,53 +130,482 @@ class Mask(BaseModel):
             attributes=attributes,
         )
 
+    @classmethod
+    def from_segmentations(
+        cls,
+        segmentations: np.ndarray,
+        labels: str | Sequence[str],
+        source: str = "next-cvat",
+        occluded: int = 0,
+        z_order: int = 0,
+        attributes: List[Attribute] = [],
+        workers: int = 1,
+    ) -> List[Mask]:
+        """Create masks from a stack of segmentations, e.g. model predictions.
+
+        Bounding boxes are computed for all segmentations at once and the
+        crops are run-length encoded together, which is much faster than
+        calling `from_segmentation` for each of them.
+
+        Args:
+            segmentations: Array with shape (N, height, width) where non-zero
+                values are foreground
+            labels: Label for all masks or one label per mask
+            source: The source of the masks (default: "next-cvat")
+            occluded: Whether the masks are occluded (default: 0)
+            z_order: The z-order/layer of the masks (default: 0)
+            attributes: Additional attributes of every mask (default: [])
+            workers: Number of threads used to encode the masks
+
+        Returns:
+            One mask per segmentation
+
+        Raises:
+            ValueError: If a segmentation is empty or the number of labels does
+                not match
+
+        Example:
+            ```python
+            masks = Mask.from_segmentations(predictions > 0.5, "vegetation")
+            ```
+        """
+        if isinstance(labels, str):
+            labels = [labels] * len(segmentations)
+        elif len(labels) != len(segmentations):
+            raise ValueError(
+                f"Got {len(labels)} labels for {len(segmentations)} segmentations"
+            )
+
+        if segmentations.dtype != bool:
+            segmentations = segmentations != 0
+
+        # Bounding boxes of all segmentations
+        rows = segmentations.any(axis=2)
+        cols = segmentations.any(axis=1)
+        empty = ~rows.any(axis=1)
+        if empty.any():
+            raise ValueError(
+                f"Cannot create mask from empty segmentation {np.argmax(empty)}"
+            )
+        tops = rows.argmax(axis=1)
+        bottoms = rows.shape[1] - rows[:, ::-1].argmax(axis=1)
+        lefts = cols.argmax(axis=1)
+        rights = cols.shape[1] - cols[:, ::-1].argmax(axis=1)
+
+        crops = [
+            segmentation[top:bottom, left:right]
+            for segmentation, top, bottom, left, right in zip(
+                segmentations, tops, bottoms, lefts, rights
+            )
+        ]
+        return [
+            cls(
+                label=label,
+                source=source,
+                occluded=occluded,
+                z_order=z_order,
+                rle=rle,
+                top=top,
+                left=left,
+                height=bottom - top,
+                width=right - left,
+                attributes=attributes,
+            )
+            for label, rle, top, bottom, left, right in zip(
+                labels, _encode_crops(crops, workers), tops, bottoms, lefts, rights
+            )
+        ]
+
+    @classmethod
+    def from_label_map(
+        cls,
+        label_map: np.ndarray,
+        labels: Mapping[int, str],
+        source: str = "next-cvat",
+        occluded: int = 0,
+        z_order: int = 0,
+        attributes: List[Attribute] = [],
+        workers: int = 1,
+    ) -> List[Mask]:
+        """Create one mask per label from a label map, e.g. a semantic
+        segmentation prediction or `ImageAnnotation.label_map`.
+
+        Args:
+            label_map: Non-negative integer array with shape (height, width)
+            labels: Label for each index in the label map. Indices that are
+                not in the mapping, such as the background, are skipped.
+            source: The source of the masks (default: "next-cvat")
+            occluded: Whether the masks are occluded (default: 0)
+            z_order: The z-order/layer of the masks (default: 0)
+            attributes: Additional attributes of every mask (default: [])
+            workers: Number of threads used to encode the masks
+
+        Returns:
+            One mask for each label that occurs in the label map, in the order
+            of the indices
+
+        Example:
+            ```python
+            masks = Mask.from_label_map(
+                prediction.argmax(axis=0), {1: "vegetation", 2: "road"}
+            )
+            ```
+        """
+        height, width = label_map.shape
+        sorted_indices = np.array(sorted(labels), dtype=np.int64)
+        if len(sorted_indices) == 0:
+            return []
+
+        # Dense codes 1..len(labels) for the requested indices and 0 for any
+        # other value, so the counts below do not scale with the largest index
+        positions = np.searchsorted(sorted_indices, label_map)
+        np.minimum(positions, len(sorted_indices) - 1, out=positions)
+        codes = np.where(sorted_indices[positions] == label_map, positions + 1, 0)
+        n_codes = len(sorted_indices) + 1
+
+        # Which rows and columns contain each code, counted in one pass each
+        # over (row, code) and (column, code) pairs regardless of the number
+        # of labels
+        row_counts = np.bincount(
+            (np.arange(height, dtype=np.intp)[:, None] * n_codes + codes).ravel(),
+            minlength=height * n_codes,
+        ).reshape(height, n_codes)
+        column_counts = np.bincount(
+            (np.arange(width, dtype=np.intp)[None, :] * n_codes + codes).ravel(),
+            minlength=width * n_codes,
+        ).reshape(width, n_codes)
+
+        indices = []
+        crops = []
+        boxes = []
+        for code, index in enumerate(sorted_indices.tolist(), start=1):
+            rows = np.flatnonzero(row_counts[:, code])
+            if len(rows) == 0:
+                continue
+            # Only the bounding box of the index is compared
+            cols = np.flatnonzero(column_counts[:, code])
+            top, bottom = rows[0], rows[-1] + 1
+            left, right = cols[0], cols[-1] + 1
+            indices.append(index)
+            crops.append(codes[top:bottom, left:right] == code)
+            boxes.append((top, left, bottom - top, right - left))
+
+        return [
+            cls(
+                label=labels[index],
+                source=source,
+                occluded=occluded,
+                z_order=z_order,
+                rle=rle,
+                top=top,
+                left=left,
+                height=height,
+                width=width,
+                attributes=attributes,
+            )
+            for index, rle, (top, left, height, width) in zip(
+                indices, _encode_crops(crops, workers), boxes
+            )
+        ]
+
     def segmentation(self, height: int, width: int) -> np.ndarray:
         """Create a boolean segmentation mask.
-        
+
         Args:
             height: Height of the output mask
             width: Width of the output mask
-            
+
         Returns:
             A numpy 2D array of booleans where True indicates the mask
         """
-        small_mask = self.rle_decode()
+        crop, (top, left) = self.crop_segmentation(height, width)
         mask = np.zeros((height, width), dtype=bool)
-        mask[self.top : self.top + self.height, self.left : self.left + self.width] = (
-            small_mask
-        )
+        mask[top : top + crop.shape[0], left : left + crop.shape[1]] = crop
         return mask
 
+    def crop_segmentation(
+        self, height: int, width: int
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Create a boolean segmentation mask of the mask's bounding box.
+
+        Args:
+            height: Height of the image
+            width: Width of the image
+
+        Returns:
+            The decoded mask clipped to the image and its (top, left) offset in
+            the image
+        """
+        top = min(max(self.top, 0), height)
+        left = min(max(self.left, 0), width)
+        bottom = max(min(self.top + self.height, height), top)
+        right = max(min(self.left + self.width, width), left)
+
+        crop = self.rle_decode()[
+            top - self.top : bottom - self.top, left - self.left : right - self.left
+        ]
+        return crop, (top, left)
+
+    def area(self) -> int:
+        """Number of foreground pixels, computed from the runs without decoding."""
+        return int(self.rle[1::2].sum())
+
+    def row_extents(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Leftmost and rightmost foreground pixel of each row, computed from the
+        runs without decoding.
+
+        Returns:
+            Rows that contain foreground, the first foreground column in each of
+            these rows and one past the last, all in image coordinates (int64)
+        """
+        rows, x_starts, x_ends = self._row_segments()
+        is_first = np.ones(len(rows), dtype=bool)
+        is_first[1:] = rows[1:] != rows[:-1]
+        is_last = np.ones(len(rows), dtype=bool)
+        is_last[:-1] = is_first[1:]
+        return rows[is_first], x_starts[is_first], x_ends[is_last]
+
+    def centroid(self) -> Tuple[float, float]:
+        """Mean (x, y) pixel index of the foreground in image coordinates,
+        computed from the runs without decoding.
+
+        Raises:
+            ValueError: If the mask is empty
+        """
+        rows, x_starts, x_ends = self._row_segments()
+        lengths = x_ends - x_starts
+        area = lengths.sum()
+        if area == 0:
+            raise ValueError("Cannot compute centroid of empty mask")
+
+        # Sum of x over a segment is its length times its mean column
+        x_sum = ((x_starts + x_ends - 1) * lengths).sum() / 2
+        y_sum = (rows * lengths).sum()
+        return float(x_sum / area), float(y_sum / area)
+
+    def tight_bbox(self) -> Tuple[int, int, int, int]:
+        """Smallest box containing the foreground, computed from the runs
+        without decoding.
+
+        Returns:
+            (left, top, right, bottom) in image coordinates where right and
+            bottom are one past the last foreground column and row
+
+        Raises:
+            ValueError: If the mask is empty
+        """
+        rows, x_starts, x_ends = self._row_segments()
+        if len(rows) == 0:
+            raise ValueError("Cannot compute bounding box of empty mask")
+
+        return (
+            int(x_starts.min()),
+            int(rows[0]),
+            int(x_ends.max()),
+            int(rows[-1]) + 1,
+        )
+
+    def count_in_rect(self, left: int, top: int, right: int, bottom: int) -> int:
+        """Number of foreground pixels inside a rectangle, computed from the runs
+        without decoding.
+
+        Args:
+            left: First column of the rectangle in image coordinates
+            top: First row of the rectangle in image coordinates
+            right: One past the last column of the rectangle
+            bottom: One past the last row of the rectangle
+
+        Returns:
+            Number of foreground pixels in the rectangle
+        """
+        rows, x_starts, x_ends = self._row_segments()
+        in_rows = (rows >= top) & (rows < bottom)
+        lengths = np.minimum(x_ends[in_rows], right) - np.maximum(
+            x_starts[in_rows], left
+        )
+        return int(np.maximum(lengths, 0).sum())
+
+    def union(self, other: Mask) -> Mask:
+        """Pixels in either mask, see `_combine`."""
+        return self._combine(other, np.logical_or)
+
+    def intersection(self, other: Mask) -> Mask:
+        """Pixels in both masks, see `_combine`."""
+        return self._combine(other, np.logical_and)
+
+    def difference(self, other: Mask) -> Mask:
+        """Pixels in this mask but not in the other, see `_combine`."""
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def symmetric_difference(self, other: Mask) -> Mask:
+        """Pixels in exactly one of the masks, see `_combine`."""
+        return self._combine(other, np.logical_xor)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+
+    def iou(self, other: Mask) -> float:
+        """Intersection over union of the foreground of two masks, computed from
+        the runs without decoding.
+
+        Raises:
+            ValueError: If both masks are empty
+        """
+        intersection = self._intersection_area(other)
+        union = self.area() + other.area() - intersection
+        if union == 0:
+            raise ValueError("Cannot compute IoU of two empty masks")
+        return intersection / union
+
+    def dice(self, other: Mask) -> float:
+        """Dice coefficient of the foreground of two masks, computed from the
+        runs without decoding.
+
+        Raises:
+            ValueError: If both masks are empty
+        """
+        total = self.area() + other.area()
+        if total == 0:
+            raise ValueError("Cannot compute Dice coefficient of two empty masks")
+        return 2 * self._intersection_area(other) / total
+
+    def _combine(
+        self, other: Mask, operation: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    ) -> Mask:
+        """Combine two masks with a boolean operation by merging their runs.
+
+        The masks may have different bounding boxes and the work is proportional
+        to the number of runs, not pixels. The result keeps the label, source
+        and attributes of this mask and gets a tight bounding box. An empty
+        result, e.g. the intersection of disjoint masks, is a mask of the box
+        containing both masks with a single background run.
+
+        Args:
+            other: Mask to combine with
+            operation: Element-wise boolean function of the foreground of this
+                mask and the other
+        """
+        pieces, in_self, in_other = self._pieces(other)
+        selected = operation(in_self, in_other)
+        top, left, width, height = _common_frame(self, other)
+        if not selected.any():
+            return Mask(
+                label=self.label,
+                source=self.source,
+                occluded=self.occluded,
+                z_order=self.z_order,
+                rle=np.array([height * width], dtype=np.uint32),
+                top=top,
+                left=left,
+                height=height,
+                width=width,
+                attributes=self.attributes,
+            )
+
+        rows, x_starts, x_ends = _split_rows(
+            pieces[:-1][selected], pieces[1:][selected], width
+        )
+
+        # Encode the segments in the bounding box of the result
+        result_left = x_starts.min()
+        result_width = x_ends.max() - result_left
+        result_height = rows[-1] - rows[0] + 1
+        starts = (rows - rows[0]) * result_width + x_starts - result_left
+        ends = starts + (x_ends - x_starts)
+
+        return Mask(
+            label=self.label,
+            source=self.source,
+            occluded=self.occluded,
+            z_order=self.z_order,
+            rle=_intervals_rle(starts, ends, result_height * result_width),
+            top=top + rows[0],
+            left=left + result_left,
+            height=result_height,
+            width=result_width,
+            attributes=self.attributes,
+        )
+
+    def _intersection_area(self, other: Mask) -> int:
+        pieces, in_self, in_other = self._pieces(other)
+        return int(np.diff(pieces)[in_self & in_other].sum())
+
+    def _pieces(self, other: Mask) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Split the common frame of two masks at every run boundary of both.
+
+        Returns:
+            Boundaries of the pieces as flat indices in the common frame and
+            whether each piece is foreground in this mask and in the other
+        """
+        top, left, width, _ = _common_frame(self, other)
+        self_starts, self_ends = self._frame_intervals(top, left, width)
+        other_starts, other_ends = other._frame_intervals(top, left, width)
+        pieces = np.unique(
+            np.concatenate([self_starts, self_ends, other_starts, other_ends])
+        )
+        return (
+            pieces,
+            _covered(self_starts, self_ends, pieces[:-1]),
+            _covered(other_starts, other_ends, pieces[:-1]),
+        )
+
+    def _frame_intervals(
+        self, top: int, left: int, width: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Foreground segments as flat index intervals in a larger frame."""
+        rows, x_starts, x_ends = self._row_segments()
+        starts = (rows - top) * width + x_starts - left
+        return starts, starts + (x_ends - x_starts)
+
+    def _row_segments(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Split the foreground runs at row ends.
+
+        Returns:
+            Row, first column and one past the last column of each segment in
+            image coordinates, in row-major order
+        """
+        ends = np.cumsum(self.rle, dtype=np.int64)
+        starts = ends - self.rle
+        foreground = np.zeros(len(self.rle), dtype=bool)
+        foreground[1::2] = True
+        foreground &= ends > starts
+
+        rows, x_starts, x_ends = _split_rows(
+            starts[foreground], ends[foreground], self.width
+        )
+        return rows + self.top, x_starts + self.left, x_ends + self.left
+
     def rle_decode_slow(self) -> np.ndarray:
         """Original slower but verified RLE decoding implementation.
-        
+
         This method is kept for reference and verification purposes.
         For normal use, use rle_decode() instead.
-        
+
         Returns:
             A numpy 2D array of booleans representing the decoded mask
         """
-        s = self.rle.split(",")
         mask = np.empty((self.height * self.width), dtype=bool)
         index = 0
-        for i in range(len(s)):
+        for i, count in enumerate(self.rle.tolist()):
             if i % 2 == 0:
-                mask[index : index + int(s[i])] = False
+                mask[index : index + count] = False
             else:
-                mask[index : index + int(s[i])] = True
-            index += int(s[i])
+                mask[index : index + count] = True
+            index += count
         return mask.reshape(self.height, self.width)
 
     @classmethod
     def rle_encode_slow(cls, mask: np.ndarray) -> str:
         """Original slower but verified RLE encoding implementation.
-        
+
         This method is kept for reference and verification purposes.
         For normal use, use rle_encode() instead.
-        
+
         Args:
             mask: Boolean numpy array to encode
-            
+
         Returns:
             RLE-encoded string representation of the mask
         """
@@ -174,46 +628,85 @@ class Mask(BaseModel):
 
         return ",".join(map(str, counts))
 
-    def rle_decode(self) -> np.ndarray:
+    def rle_decode(self, out: np.ndarray | None = None) -> np.ndarray:
         """Optimized RLE decoding implementation.
-        
-        This is the preferred method for decoding RLE masks.
-        
+
+        This is the preferred method for decoding RLE masks. The runs are
+        expanded directly into a boolean array in a single linear pass.
+
+        Args:
+            out: Optional C-contiguous boolean array with shape (height, width)
+                to decode into, e.g. a view of a preallocated buffer that is
+                reused for many masks
+
         Returns:
-            A numpy 2D array of booleans representing the decoded mask
+            A numpy 2D array of booleans representing the decoded mask, `out`
+            if it was given
+
+        Raises:
+            ValueError: If the run lengths do not add up to height * width or
+                `out` has the wrong shape, dtype or memory layout
         """
-        counts = np.array([int(x) for x in self.rle.split(",")] if self.rle != "" else [])
+        counts = self.rle
         total_pixels = self.height * self.width
-        
-        # Calculate positions where values change
-        positions = np.cumsum(counts)
-        
-        # Create an array of indices
-        indices = np.arange(total_pixels)
-        
-        # Calculate which segment each index belongs to
-        segment_indices = np.searchsorted(positions, indices, side='right')
-        
-        # Odd-numbered segments should be True
-        mask = segment_indices % 2 == 1
-        
-        return mask.reshape(self.height, self.width)
+        if counts.sum() != total_pixels:
+            raise ValueError(
+                f"RLE run lengths do not add up to {self.height}x{self.width} pixels"
+            )
+
+        if out is None:
+            # Runs alternate between background and foreground
+            values = np.zeros(len(counts), dtype=bool)
+            values[1::2] = True
+            return np.repeat(values, counts).reshape(self.height, self.width)
+
+        if (
+            out.shape != (self.height, self.width)
+            or out.dtype != bool
+            or not out.flags.c_contiguous
+        ):
+            raise ValueError(
+                f"Output must be a C-contiguous boolean array with shape "
+                f"{(self.height, self.width)}"
+            )
+
+        # Mark the pixels where the value changes and propagate the value with
+        # a running xor. Consecutive boundaries at the same pixel (zero-length
+        # runs) cancel out.
+        flat = out.reshape(-1)
+        flat[:] = False
+        boundaries = np.cumsum(counts[:-1])
+        np.logical_xor.at(flat, boundaries[boundaries < total_pixels], True)
+        np.logical_xor.accumulate(flat, out=flat)
+        return out
 
     @classmethod
     def rle_encode(cls, mask: np.ndarray) -> str:
         """Optimized RLE encoding implementation.
-        
-        This is the preferred method for encoding RLE masks.
-        
+
+        This is the preferred method for encoding RLE masks as strings.
+
         Args:
             mask: Boolean numpy array to encode
-            
+
         Returns:
             RLE-encoded string representation of the mask
         """
+        return ",".join(map(str, cls.rle_encode_runs(mask).tolist()))
+
+    @classmethod
+    def rle_encode_runs(cls, mask: np.ndarray) -> np.ndarray:
+        """Encode a boolean mask as run lengths, see `rle`.
+
+        Args:
+            mask: Boolean numpy array to encode
+
+        Returns:
+            Run lengths of the mask (uint32)
+        """
         flat_mask = mask.ravel()  # faster than flatten()
         if len(flat_mask) == 0:
-            return "0"
+            return np.zeros(1, dtype=np.uint32)
 
         # Find runs using concatenated array trick
         n = len(flat_mask)
@@ -226,7 +719,7 @@ class Mask(BaseModel):
         if flat_mask[0]:
             counts = np.concatenate(([0], counts))
 
-        return ",".join(map(str, counts))
+        return counts.astype(np.uint32)
 
     def request(
         self,
@@ -244,8 +737,7 @@ class Mask(BaseModel):
         Returns:
             LabeledShapeRequest object for CVAT API
         """
-        # Convert RLE string to list of floats
-        points = [float(x) for x in self.rle.split(",")]
+        points = self.rle.astype(float).tolist()
 
         # Use the stored dimensions for bounding box
         right = self.left + self.width - 1  # Subtract 1 because coordinates are 0-based
@@ -304,7 +796,7 @@ class Mask(BaseModel):
 
     def _repr_html_(self) -> str:
         """Generate HTML representation for Jupyter notebooks.
-        
+
         Returns:
             HTML string containing an image of the mask and its metadata
         """
@@ -338,6 +830,133 @@ class Mask(BaseModel):
         """
 
 
+def parse_rle(rle: str | Sequence[int] | np.ndarray) -> np.ndarray:
+    """Parse run lengths from a comma-separated string or a sequence.
+
+    Raises:
+        ValueError: If the string contains anything but comma-separated integers
+    """
+    if isinstance(rle, str):
+        # NumPy warns about (and in future versions rejects) unparsed data
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            try:
+                runs = np.fromstring(rle, dtype=np.uint32, sep=",")
+            except (DeprecationWarning, ValueError):
+                raise ValueError(f"Invalid run lengths {rle[:100]}") from None
+        if len(runs) != rle.count(",") + 1 and rle.strip() != "":
+            raise ValueError(f"Invalid run lengths {rle[:100]}")
+        return runs
+    else:
+        return np.asarray(rle, dtype=np.uint32)
+
+
+def format_rle(rle: np.ndarray) -> str:
+    """Format run lengths as in CVAT XML files."""
+    return ", ".join(map(str, rle.tolist()))
+
+
+def _encode_crops(crops: List[np.ndarray], workers: int = 1) -> List[np.ndarray]:
+    """Run lengths of many boolean crops, see `Mask.rle_encode_runs`.
+
+    The crops are concatenated and their runs found in a single pass. With more
+    than one worker, chunks of crops are encoded in a thread pool.
+    """
+    if workers > 1 and len(crops) > 1:
+        chunk_size = -(-len(crops) // workers)
+        with ThreadPoolExecutor(workers) as executor:
+            chunks = executor.map(
+                _encode_crops,
+                [
+                    crops[start : start + chunk_size]
+                    for start in range(0, len(crops), chunk_size)
+                ],
+            )
+            return [rle for chunk in chunks for rle in chunk]
+
+    if len(crops) == 0:
+        return []
+
+    flat = np.concatenate([crop.ravel() for crop in crops])
+    offsets = np.cumsum([0] + [crop.size for crop in crops])
+
+    # Runs start where the value changes and at the start of every crop
+    is_run_start = np.empty(len(flat), dtype=bool)
+    is_run_start[0] = True
+    np.not_equal(flat[1:], flat[:-1], out=is_run_start[1:])
+    is_run_start[offsets[:-1]] = True
+    run_starts = np.flatnonzero(is_run_start)
+    crop_runs = np.searchsorted(run_starts, offsets)
+
+    rles = []
+    for index in range(len(crops)):
+        starts = run_starts[crop_runs[index] : crop_runs[index + 1]]
+        counts = np.diff(starts, append=offsets[index + 1])
+        if flat[offsets[index]]:
+            counts = np.concatenate(([0], counts))
+        rles.append(counts.astype(np.uint32))
+    return rles
+
+
+def _split_rows(
+    starts: np.ndarray, ends: np.ndarray, width: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split sorted, non-empty flat index intervals in a frame of the given
+    width at row ends.
+
+    Returns:
+        Row, first column and one past the last column of each segment
+    """
+    # Intervals that wrap around the right edge span several rows
+    first_rows = starts // width
+    n_rows = (ends - 1) // width - first_rows + 1
+    segment_starts = np.repeat(starts, n_rows)
+    segment_ends = np.repeat(ends, n_rows)
+    rows = np.repeat(first_rows, n_rows) + (
+        np.arange(n_rows.sum()) - np.repeat(np.cumsum(n_rows) - n_rows, n_rows)
+    )
+    row_starts = rows * width
+    x_starts = np.maximum(segment_starts, row_starts) - row_starts
+    x_ends = np.minimum(segment_ends, row_starts + width) - row_starts
+    return rows, x_starts, x_ends
+
+
+def _common_frame(mask: Mask, other: Mask) -> Tuple[int, int, int, int]:
+    """Top, left, width and height of the box containing both masks."""
+    top = min(mask.top, other.top)
+    left = min(mask.left, other.left)
+    right = max(mask.left + mask.width, other.left + other.width)
+    bottom = max(mask.top + mask.height, other.top + other.height)
+    return top, left, right - left, bottom - top
+
+
+def _covered(starts: np.ndarray, ends: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Check which points lie in one of the sorted, disjoint intervals."""
+    if len(starts) == 0:
+        return np.zeros(len(points), dtype=bool)
+
+    index = np.searchsorted(starts, points, side="right") - 1
+    return (index >= 0) & (points < ends[np.maximum(index, 0)])
+
+
+def _intervals_rle(starts: np.ndarray, ends: np.ndarray, n_pixels: int) -> np.ndarray:
+    """Run lengths of sorted, disjoint, non-empty foreground intervals, merging
+    intervals that touch."""
+    is_start = np.ones(len(starts), dtype=bool)
+    is_start[1:] = starts[1:] != ends[:-1]
+    is_end = np.ones(len(ends), dtype=bool)
+    is_end[:-1] = is_start[1:]
+    starts, ends = starts[is_start], ends[is_end]
+
+    rle = np.empty(2 * len(starts) + 1, dtype=np.uint32)
+    rle[0] = starts[0]
+    rle[1:-1:2] = ends - starts
+    rle[2:-1:2] = starts[1:] - ends[:-1]
+    rle[-1] = n_pixels - ends[-1]
+    # Like `Mask.rle_encode_runs`, without an empty run at the end
+    return rle if rle[-1] > 0 else rle[:-1]
+
+
 def test_rle_decode_encode():
     """
     Test that decoding an RLE string and then encoding the mask returns the original RLE string.
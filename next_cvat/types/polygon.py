@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from typing import List, Tuple
 
 import numpy as np
@@ -65,6 +66,50 @@ class Polygon(BaseModel):
         ImageDraw.Draw(mask).polygon(self.points, outline=1, fill=1)
         return np.array(mask).astype(bool)
 
+    def crop_segmentation(
+        self, height: int, width: int
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Create a boolean segmentation mask of the polygon's bounding box.
+
+        Only the bounding box (clipped to the image) is rasterized, which is
+        much cheaper than `segmentation` for small polygons in large images.
+        The fill is not exactly translation invariant, so a few boundary pixels
+        can differ from `segmentation`. Use `segmentation` when the mask must
+        match the full image rasterization exactly.
+
+        Args:
+            height: Height of the image
+            width: Width of the image
+
+        Returns:
+            The mask of the bounding box and its (top, left) offset in the image.
+            The mask is empty if the polygon is outside of the image.
+        """
+        xs = [x for x, _ in self.points]
+        ys = [y for _, y in self.points]
+
+        # One pixel margin for the outline, which is drawn at rounded coordinates
+        box_left = math.floor(min(xs)) - 1
+        box_top = math.floor(min(ys)) - 1
+        box_right = math.ceil(max(xs)) + 2
+        box_bottom = math.ceil(max(ys)) + 2
+
+        left = min(max(box_left, 0), width)
+        top = min(max(box_top, 0), height)
+        right = max(min(box_right, width), left)
+        bottom = max(min(box_bottom, height), top)
+
+        if right == left or bottom == top:
+            return np.zeros((bottom - top, right - left), dtype=bool), (top, left)
+
+        # Only draw the part of the bounding box inside the image, the canvas
+        # edges are then either image edges or lie outside of the polygon
+        crop = Image.new("L", (right - left, bottom - top), 0)
+        ImageDraw.Draw(crop).polygon(
+            [(x - left, y - top) for x, y in self.points], outline=1, fill=1
+        )
+        return np.array(crop).astype(bool), (top, left)
+
     def translate(self, dx: int, dy: int) -> Polygon:
         """Translate the polygon by (dx, dy).
 
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from types import ModuleType
+from typing import IO, Any, Iterator, Literal, Tuple, Union
+from xml.etree import ElementTree
+
+from pydantic import BaseModel
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - depends on the environment
+    lxml_etree = None
+
+XMLBackendName = Literal["auto", "lxml", "etree"]
+
+XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+
+
+class XMLBackend(BaseModel, frozen=True):
+    """XML implementation used to parse and serialize CVAT annotation files.
+
+    Both backends expose the ElementTree API and produce byte-identical output
+    (except for carriage returns in element text, which only lxml escapes), so
+    files written with one can be compared with files written with the other.
+    The `lxml` backend parses in C, supports very large documents and serializes
+    faster but requires the optional `lxml` package.
+
+    Attributes:
+        name: Either "lxml" or "etree" (the standard library implementation)
+
+    Example:
+        ```python
+        backend = XMLBackend.from_name("auto")  # lxml if installed
+        root = backend.etree.Element("annotations")
+        xml_bytes = backend.tostring(root)
+        ```
+    """
+
+    name: Literal["lxml", "etree"]
+
+    @classmethod
+    def from_name(cls, name: Union[XMLBackendName, XMLBackend] = "auto") -> XMLBackend:
+        """Select a backend by name.
+
+        Args:
+            name: "auto" uses lxml when it is installed and falls back to the
+                standard library, "lxml" requires lxml and "etree" always uses
+                the standard library
+
+        Raises:
+            ImportError: If "lxml" is requested but not installed
+            ValueError: If the name is unknown
+        """
+        if isinstance(name, XMLBackend):
+            return name
+        elif name == "auto":
+            return cls(name="etree" if lxml_etree is None else "lxml")
+        elif name == "lxml":
+            if lxml_etree is None:
+                raise ImportError(
+                    "The lxml XML backend requires lxml, install it with "
+                    "`pip install next-cvat[lxml]`"
+                )
+            return cls(name="lxml")
+        elif name == "etree":
+            return cls(name="etree")
+        else:
+            raise ValueError(f"Unknown XML backend {name}")
+
+    @property
+    def etree(self) -> ModuleType:
+        """Module with the ElementTree API (`Element`, `SubElement`, ...)."""
+        if self.name == "lxml":
+            return lxml_etree
+        else:
+            return ElementTree
+
+    def iterparse(
+        self, source: Union[str, IO[bytes]], events: Tuple[str, ...] = ("end",)
+    ) -> Iterator[Tuple[str, Any]]:
+        if self.name == "lxml":
+            return lxml_etree.iterparse(
+                source, events=events, huge_tree=True, remove_comments=True
+            )
+        else:
+            return ElementTree.iterparse(source, events=events)
+
+    def tostring(self, element: Any) -> bytes:
+        """Serialize an element to UTF-8 without XML declaration."""
+        if self.name == "lxml":
+            # lxml writes `<tag></tag>` for empty text where ElementTree writes
+            # `<tag />`, and `<tag/>` where ElementTree writes `<tag />`
+            for child in element.iter():
+                if child.text == "":
+                    child.text = None
+            xml_bytes = lxml_etree.tostring(
+                element, encoding="utf-8", xml_declaration=False
+            )
+            # Raw ">" is always escaped in serialized attributes and text, so
+            # these replacements only touch markup and character references
+            return xml_bytes.replace(b"/>", b" />").replace(b"&#9;", b"&#09;")
+        else:
+            return ElementTree.tostring(
+                element, encoding="utf-8", xml_declaration=False
+            )
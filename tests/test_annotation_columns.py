@@ -0,0 +1,69 @@
+import numpy as np
+
+from next_cvat import AnnotationColumns, Annotations
+from next_cvat.types import Attribute, Box, Polygon
+
+
+def test_annotation_columns_roundtrip():
+    """Test that columns built from XML or models convert back unchanged."""
+    annotations = Annotations.from_path("tests/mask_annotations.xml")
+
+    for columns in [
+        AnnotationColumns.from_path("tests/mask_annotations.xml"),
+        AnnotationColumns.from_annotations(annotations),
+    ]:
+        assert len(columns.images) == len(annotations.images)
+        assert len(columns.masks) == 3
+        assert columns.label_counts() == {"sand": 0, "vegetation": 3}
+        assert columns.to_annotations() == annotations
+
+
+def test_annotation_columns_statistics():
+    """Test vectorized statistics against the shape models."""
+    annotations = Annotations.from_path("tests/mask_annotations.xml")
+    image = annotations.images[0]
+    image.polygons.append(
+        Polygon(
+            label="sand",
+            source="manual",
+            occluded=0,
+            points=[(0, 0), (4, 0), (4, 3)],
+            z_order=0,
+            attributes=[],
+        )
+    )
+    image.boxes.append(
+        Box(
+            label="sand",
+            xtl=1,
+            ytl=2,
+            xbr=4,
+            ybr=6,
+            occluded=1,
+            z_order=0,
+            attributes=[Attribute(name="visible", value="no", spec_id=3)],
+        )
+    )
+    annotations.images.append(image.model_copy(update=dict(id="1", masks=[])))
+
+    columns = AnnotationColumns.from_annotations(annotations)
+
+    assert columns.boxes.area().tolist() == [12.0, 12.0]
+    assert columns.polygons.area().tolist() == [6.0, 6.0]
+    np.testing.assert_array_equal(
+        columns.masks.area(),
+        [mask.rle_decode().sum() for mask in annotations.images[0].masks],
+    )
+    assert columns.label_counts(shapes=["box", "polygon"]) == {
+        "sand": 4,
+        "vegetation": 0,
+    }
+    assert columns.boxes.image_index.tolist() == [0, 1]
+    assert columns.to_annotations() == annotations
+
+    filtered = AnnotationColumns.from_path(
+        "tests/mask_annotations.xml", labels=["sand"]
+    )
+    assert len(filtered.images) == 1
+    assert len(filtered.masks) == 0
+    assert filtered.masks.area().tolist() == []
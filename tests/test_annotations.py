@@ -2,8 +2,10 @@ import tempfile
 from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
 
 from next_cvat.annotations import Annotations
+from next_cvat.types import Polygon
 
 
 def test_read_mask_annotations():
@@ -174,6 +176,87 @@ def test_create_cvat_link_includes_frame(annotations_with_job_status):
     assert second_link.endswith("?frame=1"), "Second image in task should have frame=1"
 
 
+def test_create_cvat_links(annotations_with_job_status):
+    """Test that links are created in bulk and failures are collected."""
+    annotations = annotations_with_job_status
+    first, second = annotations.images
+    annotations.images.append(
+        second.model_copy(update=dict(id="3", name="other/image2.jpg"))
+    )
+    annotations.images.append(
+        first.model_copy(update=dict(id="4", name="image4.jpg", job_id=None))
+    )
+
+    result = annotations.create_cvat_links(
+        ["image1.jpg", "image2.jpg", "image4.jpg", "unknown.jpg", "image1.jpg"]
+    )
+
+    assert result.links == {"image1.jpg": annotations.create_cvat_link("image1.jpg")}
+    assert result.missing == ["image4.jpg", "unknown.jpg"]
+    assert result.ambiguous == {"image2.jpg": ["image2.jpg", "other/image2.jpg"]}
+
+
+def test_lookup_indexes_follow_mutations(annotations_with_job_status):
+    """Test that cached lookups are rebuilt when the lists change."""
+    annotations = annotations_with_job_status
+    first, second = annotations.images
+
+    assert annotations.create_cvat_link("image2.jpg").endswith("?frame=1")
+    assert annotations.get_completed_task_ids() == ["1"]
+    assert annotations.get_task_status("1") == {"example.com": "completed"}
+
+    annotations.images.insert(
+        0, first.model_copy(update=dict(id="0", name="image0.jpg"))
+    )
+    assert annotations.create_cvat_link("image2.jpg").endswith("?frame=2")
+
+    annotations.images.remove(second)
+    with pytest.raises(ValueError, match="not found"):
+        annotations.create_cvat_link("image2.jpg")
+
+    annotations.images = [second]
+    assert annotations.create_cvat_link("image2.jpg").endswith("?frame=0")
+
+    annotations.job_status.append(
+        annotations.job_status[0].model_copy(update=dict(job_id=101, state="new"))
+    )
+    assert annotations.get_completed_task_ids() == []
+    assert annotations.get_task_status("1") == {"example.com": "new"}
+
+    annotations.tasks.clear()
+    assert annotations.get_task_status("1") == {}
+
+
+def test_lookup_indexes_follow_reassigned_lists(annotations_with_job_status):
+    """Test that lists assigned after loading are tracked too."""
+    annotations = annotations_with_job_status
+    first, second = annotations.images
+
+    annotations.images = [first, second]
+    assert annotations.create_cvat_link("image2.jpg").endswith("?frame=1")
+
+    annotations.images[0] = second.model_copy(update=dict(name="other.jpg"))
+    assert annotations.create_cvat_link("image2.jpg").endswith("?frame=0")
+
+
+def test_lookup_indexes_do_not_affect_equality(annotations_with_job_status):
+    """Test that cached lookups are not compared, copied or pickled."""
+    import copy
+    import pickle
+
+    annotations = annotations_with_job_status
+    other = Annotations(**dict(annotations))
+
+    annotations.get_completed_task_ids()
+    annotations.create_cvat_link("image2.jpg")
+    assert annotations == other
+
+    restored = pickle.loads(pickle.dumps(annotations))
+    assert restored == annotations
+    assert restored.images.indexes == {}
+    assert copy.deepcopy(annotations) == annotations
+
+
 @pytest.fixture
 def annotations_with_job_status(tmp_path):
     """Create test annotations with multiple images in the same task and job status"""
@@ -233,3 +316,274 @@ def annotations_with_job_status(tmp_path):
     from next_cvat import Annotations
 
     return Annotations.from_path(xml_path, job_status_path)
+
+
+def test_from_path_streams_images_in_order(tmp_path):
+    """Test that the incremental parser keeps image order and shapes."""
+    images_xml = "".join(
+        f"""
+  <image id="{index}" name="image{index}.jpg" width="100" height="100" task_id="1">
+    <box label="test" source="manual" occluded="0" xtl="1" ytl="2" xbr="3" ybr="4" z_order="0">
+      <attribute name="index">{index}</attribute>
+    </box>
+    <tag label="test" source="manual"></tag>
+  </image>"""
+        for index in range(5)
+    )
+    xml_path = tmp_path / "annotations.xml"
+    xml_path.write_text(
+        f"""<?xml version="1.0" encoding="utf-8"?>
+<annotations>
+  <version>1.1</version>
+  <meta>
+    <project>
+      <id>1</id>
+      <name>Test Project</name>
+      <created>2024-01-01 12:00:00</created>
+      <updated>2024-01-01 12:00:00</updated>
+      <labels>
+        <label>
+          <name>test</name>
+          <color>#ff0000</color>
+          <type>any</type>
+        </label>
+      </labels>
+    </project>
+    <tasks>
+      <task>
+        <id>1</id>
+        <name>Task 1</name>
+        <segments>
+          <segment>
+            <url>https://app.cvat.ai/api/jobs/101</url>
+          </segment>
+        </segments>
+      </task>
+    </tasks>
+  </meta>{images_xml}
+</annotations>"""
+    )
+
+    annotations = Annotations.from_path(xml_path)
+
+    assert annotations.version == "1.1"
+    assert [image.id for image in annotations.images] == ["0", "1", "2", "3", "4"]
+    for index, image in enumerate(annotations.images):
+        assert image.job_id == "101"
+        assert len(image.boxes) == 1
+        assert image.boxes[0].attributes[0].value == str(index)
+        assert len(image.tags) == 1
+
+
+def test_iter_images_is_lazy(annotations_with_job_status, tmp_path):
+    """Test that iter_images yields the same images as from_path one by one."""
+    xml_path = tmp_path / "annotations.xml"
+
+    images = Annotations.iter_images(xml_path)
+    first = next(images)
+    assert first.name == "image1.jpg"
+    assert first.job_id == "example.com"
+
+    assert [first, *images] == annotations_with_job_status.images
+
+
+def test_from_path_filters(tmp_path):
+    """Test that label, task, subset and shape filters are applied while parsing."""
+    xml_path = tmp_path / "annotations.xml"
+    xml_path.write_text(
+        """<?xml version="1.0" encoding="utf-8"?>
+<annotations>
+  <version>1.1</version>
+  <meta>
+    <project>
+      <id>1</id>
+      <name>Test Project</name>
+      <created>2024-01-01 12:00:00</created>
+      <updated>2024-01-01 12:00:00</updated>
+      <labels>
+      </labels>
+    </project>
+  </meta>
+  <image id="1" name="image1.jpg" width="100" height="100" task_id="1" subset="train">
+    <box label="car" source="manual" occluded="0" xtl="1" ytl="2" xbr="3" ybr="4" z_order="0"></box>
+    <box label="person" source="manual" occluded="0" xtl="1" ytl="2" xbr="3" ybr="4" z_order="0"></box>
+    <polygon label="car" source="manual" occluded="0" points="1,2;3,4;5,6" z_order="0"></polygon>
+    <tag label="car" source="manual"></tag>
+  </image>
+  <image id="2" name="image2.jpg" width="100" height="100" task_id="2" subset="val">
+    <box label="car" source="manual" occluded="0" xtl="1" ytl="2" xbr="3" ybr="4" z_order="0"></box>
+  </image>
+</annotations>"""
+    )
+
+    annotations = Annotations.from_path(xml_path, labels=["car"])
+    assert [len(image.boxes) for image in annotations.images] == [1, 1]
+    assert annotations.images[0].boxes[0].label == "car"
+    assert len(annotations.images[0].polygons) == 1
+    assert len(annotations.images[0].tags) == 1
+
+    annotations = Annotations.from_path(xml_path, task_ids=[2])
+    assert [image.id for image in annotations.images] == ["2"]
+
+    annotations = Annotations.from_path(xml_path, subsets=["train"], shapes=["box"])
+    assert [image.id for image in annotations.images] == ["1"]
+    assert len(annotations.images[0].boxes) == 2
+    assert annotations.images[0].polygons == []
+    assert annotations.images[0].tags == []
+
+    images = list(Annotations.iter_images(xml_path, labels="person", subsets="val"))
+    assert [image.id for image in images] == ["2"]
+    assert images[0].boxes == []
+
+    with pytest.raises(ValueError, match="Unknown shape kinds"):
+        Annotations.from_path(xml_path, shapes=["boxes"])
+
+
+def test_from_path_cache(annotations_with_job_status, tmp_path, monkeypatch):
+    """Test that parsed annotations are cached and invalidated on changes."""
+    xml_path = tmp_path / "annotations.xml"
+    job_status_path = tmp_path / "job_status.json"
+
+    annotations = Annotations.from_path(xml_path, job_status_path, cache=True)
+    assert annotations == annotations_with_job_status
+    assert (tmp_path / "annotations.xml.cache").exists()
+
+    parse = Annotations._parse
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("Expected the cached annotations to be used")
+
+    monkeypatch.setattr(Annotations, "_parse", fail_parse)
+    assert Annotations.from_path(xml_path, job_status_path, cache=True) == annotations
+
+    # Same content with a new modification time is still a cache hit
+    xml_path.write_text(xml_path.read_text())
+    assert Annotations.from_path(xml_path, job_status_path, cache=True) == annotations
+
+    # Different filters, job status or XML content invalidate the cache
+    for change in [
+        lambda: Annotations.from_path(xml_path, cache=True),
+        lambda: Annotations.from_path(
+            xml_path, job_status_path, labels=["test"], cache=True
+        ),
+        lambda: job_status_path.write_text("[]"),
+        lambda: xml_path.write_text(xml_path.read_text().replace("image2", "image3")),
+    ]:
+        monkeypatch.setattr(Annotations, "_parse", parse)
+        change()
+        monkeypatch.setattr(Annotations, "_parse", fail_parse)
+        with pytest.raises(AssertionError, match="cached annotations"):
+            Annotations.from_path(xml_path, job_status_path, cache=True)
+
+
+def test_from_path_parallel_matches_serial(annotations_with_job_status, tmp_path):
+    """Test that the parallel loader returns the same result as the serial one."""
+    xml_path = tmp_path / "annotations.xml"
+
+    for path in [xml_path, "tests/mask_annotations.xml"]:
+        serial = Annotations.from_path(path)
+        for workers in [2, 3]:
+            assert Annotations.from_path(path, workers=workers) == serial
+
+    assert (
+        Annotations.from_path(xml_path, task_ids=["1"], workers=2).images
+        == annotations_with_job_status.images
+    )
+
+
+def test_xml_writer_streams_images(tmp_path):
+    """Test writing images from a generator and reading polygons back."""
+    xml_path = "tests/mask_annotations.xml"
+    original = Annotations.from_path(xml_path)
+    original.images[0].polygons.append(
+        Polygon(
+            label="Deformity",
+            source="manual",
+            occluded=0,
+            points=[(1.5, 2.0), (10.0, 2.0), (10.0, 12.25)],
+            z_order=0,
+            attributes=[],
+        )
+    )
+    original.save_xml_(tmp_path / "polygons.xml")
+    assert Annotations.from_path(tmp_path / "polygons.xml") == original
+
+    header = Annotations.header_from_path(xml_path)
+    assert header.images == []
+    assert header.project == original.project
+
+    output_path = tmp_path / "streamed.xml"
+    with header.xml_writer(output_path) as writer:
+        writer.write_images_(Annotations.iter_images(xml_path))
+
+    assert Annotations.from_path(output_path) == Annotations.from_path(xml_path)
+
+
+def test_xml_writer_leaves_no_partial_file(tmp_path):
+    """Test that a failed export neither writes nor truncates the target."""
+    xml_path = "tests/mask_annotations.xml"
+    header = Annotations.header_from_path(xml_path)
+    output_path = tmp_path / "streamed.xml"
+
+    def failing_images():
+        yield from Annotations.iter_images(xml_path)
+        raise RuntimeError("Export failed")
+
+    with pytest.raises(RuntimeError):
+        with header.xml_writer(output_path) as writer:
+            writer.write_images_(failing_images())
+    assert list(tmp_path.iterdir()) == []
+
+    output_path.write_text("previous")
+    with pytest.raises(RuntimeError):
+        with header.xml_writer(output_path) as writer:
+            writer.write_images_(failing_images())
+    assert list(tmp_path.iterdir()) == [output_path]
+    assert output_path.read_text() == "previous"
+
+
+def test_from_path_without_validation(tmp_path):
+    """Test that trusted parsing builds the same models as validated parsing."""
+    shapes_xml = """
+    <box label="test" occluded="0" xtl="1" ytl="2.5" xbr="3" ybr="4" z_order="0" rotation="0">
+      <attribute name="color">red</attribute>
+      <attribute name="empty"></attribute>
+    </box>
+    <polygon label="test" source="manual" occluded="1" points="1,2;3.5,4;5,6" z_order="2"></polygon>
+    <polyline label="test" source="manual" occluded="0" points="1,2;3,4" z_order="0"></polyline>
+    <ellipse label="test" cx="5" cy="6" rx="2" ry="1"></ellipse>
+    <tag label="test"></tag>"""
+    xml_path = tmp_path / "annotations.xml"
+    xml_path.write_text(
+        f"""<?xml version="1.0" encoding="utf-8"?>
+<annotations>
+  <version>1.1</version>
+  <meta>
+    <project>
+      <id>1</id>
+      <name>Test Project</name>
+      <created>2024-01-01 12:00:00</created>
+      <updated>2024-01-01 12:00:00</updated>
+      <labels></labels>
+    </project>
+  </meta>
+  <image id="0" name="image0.jpg" width="100" height="100">{shapes_xml}
+  </image>
+</annotations>"""
+    )
+
+    for path in [xml_path, "tests/mask_annotations.xml"]:
+        validated = Annotations.from_path(path)
+        trusted = Annotations.from_path(path, validate=False)
+        assert trusted == validated
+        for trusted_image, image in zip(trusted.images, validated.images):
+            assert repr(trusted_image) == repr(image)
+            assert trusted_image.model_dump(exclude_unset=True) == image.model_dump(
+                exclude_unset=True
+            )
+
+    # Malformed shapes still raise the validation error
+    xml_path.write_text(xml_path.read_text().replace('xtl="1"', 'xtl="left"'))
+    for validate in [True, False]:
+        with pytest.raises(ValidationError):
+            Annotations.from_path(xml_path, validate=validate)
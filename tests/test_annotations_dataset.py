@@ -0,0 +1,56 @@
+import pytest
+
+from next_cvat import AnnotationColumns, Annotations
+from next_cvat.types import JobStatus
+
+pa = pytest.importorskip("pyarrow")
+pc = pytest.importorskip("pyarrow.compute")
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+@pytest.mark.parametrize("partition_by", [None, ["subset", "task_id"]])
+def test_dataset_roundtrip(tmp_path, format, partition_by):
+    """Test that annotations survive a Parquet or Arrow dataset roundtrip."""
+    annotations = Annotations.from_path("tests/mask_annotations.xml")
+    annotations.job_status = [
+        JobStatus(
+            task_id=annotations.images[0].task_id,
+            job_id=1,
+            task_name="Task",
+            stage="annotation",
+            state="completed",
+            assignee={"username": "annotator"},
+        )
+    ]
+
+    annotations.save_dataset_(tmp_path, format=format, partition_by=partition_by)
+    assert (tmp_path / f"meta.{format}").exists()
+    assert Annotations.from_dataset(tmp_path) == annotations
+
+    subset = annotations.images[0].subset
+    selected = Annotations.from_dataset(tmp_path, filter=pc.field("subset") == subset)
+    assert selected.images == annotations.images
+
+    filtered = AnnotationColumns.from_dataset(
+        tmp_path, filter=pc.field("subset") != subset
+    )
+    assert len(filtered.images) == 0
+    assert len(filtered.masks) == 0
+
+
+def test_dataset_tables():
+    """Test the Arrow table layout."""
+    columns = AnnotationColumns.from_path("tests/mask_annotations.xml")
+    tables = columns.to_arrow()
+
+    masks = tables["masks"]
+    assert masks.num_rows == 3
+    # 64-bit list offsets, more than 2**31 runs must not wrap around
+    assert masks.schema.field("rle").type == pa.large_list(pa.uint32())
+    assert pa.types.is_large_list(tables["polygons"].schema.field("points").type)
+    assert pa.types.is_large_list(masks.schema.field("attributes").type)
+    assert masks["label"].cast(pa.string()).to_pylist() == ["vegetation"] * 3
+    assert pc.sum(pc.list_value_length(masks["rle"])).as_py() == len(columns.masks.rle)
+
+    with pytest.raises(ValueError, match="Cannot partition"):
+        columns.save_dataset_("unused", partition_by=["width"])
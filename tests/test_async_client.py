@@ -0,0 +1,102 @@
+import asyncio
+import copy
+import pickle
+import threading
+import time
+
+from next_cvat import AsyncClient, Client
+from next_cvat.client.client_pool import ClientPool
+
+
+def test_async_client_bounds_concurrency():
+    client = AsyncClient(client=Client(token="token"), max_concurrency=3)
+    assert client.client.max_idle_clients >= 3
+
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def request(index):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return index
+
+    async def main():
+        async with client:
+            return await asyncio.gather(*[client.run(request, i) for i in range(12)])
+
+    assert asyncio.run(main()) == list(range(12))
+    assert max_running == 3
+
+
+def test_async_client_resizes_pool_of_client():
+    client = Client(token="token", max_idle_clients=2)
+    pool = ClientPool(connect=lambda: None, max_idle=2)
+    client._pool = pool
+
+    async_client = AsyncClient(client=client, max_concurrency=8)
+
+    assert async_client.client is client
+    assert client.max_idle_clients == 8
+    assert pool.max_idle == 8
+
+    asyncio.run(async_client.close())
+    assert client._pool is None
+
+
+def test_async_client_cancels_queued_calls():
+    client = AsyncClient(client=Client(token="token"), max_concurrency=1)
+    started = []
+
+    def request(index):
+        started.append(index)
+        time.sleep(0.05)
+        return index
+
+    async def main():
+        async with client:
+            calls = [asyncio.ensure_future(client.run(request, i)) for i in range(5)]
+            await asyncio.sleep(0.01)
+            for call in calls[1:]:
+                call.cancel()
+            assert await calls[0] == 0
+            await asyncio.gather(*calls[1:], return_exceptions=True)
+
+    asyncio.run(main())
+    assert started == [0]
+
+
+def test_async_client_runs_in_several_event_loops():
+    client = AsyncClient(client=Client(token="token"), max_concurrency=1)
+
+    def request(index):
+        time.sleep(0.01)
+        return index
+
+    async def main():
+        return await asyncio.gather(*[client.run(request, i) for i in range(3)])
+
+    assert asyncio.run(main()) == [0, 1, 2]
+    assert asyncio.run(main()) == [0, 1, 2]
+
+    asyncio.run(client.close())
+    assert asyncio.run(main()) == [0, 1, 2]
+    asyncio.run(client.close())
+
+
+def test_async_client_pickle_copy_and_equality():
+    client = AsyncClient(client=Client(token="token"), max_concurrency=2)
+    asyncio.run(client.run(lambda: None))
+
+    for copied in [pickle.loads(pickle.dumps(client)), copy.deepcopy(client)]:
+        assert copied == client
+        assert copied._executor is None
+        assert copied._semaphore is None
+
+    assert client != AsyncClient(client=Client(token="token"), max_concurrency=3)
+    asyncio.run(client.close())
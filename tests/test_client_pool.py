@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from next_cvat.client.client_pool import ClientPool
+
+
+class FakeCVATClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_client_pool_reuses_clients():
+    created = []
+
+    def connect():
+        created.append(FakeCVATClient())
+        return created[-1]
+
+    pool = ClientPool(connect=connect, max_idle=2)
+
+    with pool.client() as first:
+        pass
+    with pool.client() as second:
+        pass
+    assert first is second
+    assert len(created) == 1
+
+    # Concurrent borrowers get different clients
+    with pool.client() as first, pool.client() as second, pool.client() as third:
+        assert len({id(first), id(second), id(third)}) == 3
+    assert len(created) == 3
+    # Only max_idle clients are kept open
+    assert [client.closed for client in created] == [True, False, False]
+
+    # Clients that were in use when an error occurred are discarded
+    with pytest.raises(RuntimeError):
+        with pool.client() as failed:
+            raise RuntimeError("Session expired")
+    assert failed.closed
+
+    pool.close()
+    assert all(client.closed for client in created)
+    with pytest.raises(ValueError, match="closed"):
+        with pool.client():
+            pass
+
+
+def test_client_pool_is_thread_safe():
+    created = []
+    lock = threading.Lock()
+
+    def connect():
+        with lock:
+            created.append(FakeCVATClient())
+            return created[-1]
+
+    pool = ClientPool(connect=connect, max_idle=8)
+    in_use = set()
+
+    def borrow():
+        for _ in range(200):
+            with pool.client() as client:
+                with lock:
+                    assert id(client) not in in_use
+                    in_use.add(id(client))
+                with lock:
+                    in_use.remove(id(client))
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) <= 8
+
+
+def test_client_pickles_and_copies_without_pool():
+    import copy
+    import pickle
+
+    from next_cvat import Client
+
+    client = Client(username="user", password="password")
+    other = Client(username="user", password="password")
+    client._pool = ClientPool(connect=FakeCVATClient)
+    with client._pool.client():
+        pass
+    assert client == other
+
+    task = client.project(1).task(2)
+    for copied in [pickle.loads(pickle.dumps(task)), copy.deepcopy(task)]:
+        assert copied == task
+        assert copied.project.client._pool is None
+        assert copied.project.client._pool_lock is not client._pool_lock
@@ -0,0 +1,108 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from next_cvat.types import Box, Ellipse, Polygon
+
+
+def test_crop_segmentation_matches_full_segmentation():
+    """Test that the crops are the bounding box of the full segmentation."""
+    shapes = [
+        Polygon(
+            label="test",
+            source="manual",
+            occluded=0,
+            points=[(12.0, 30.0), (40.5, 22.0), (33.0, 55.2)],
+            z_order=0,
+            attributes=[],
+        ),
+        Box(
+            label="test",
+            xtl=-5.0,
+            ytl=50.0,
+            xbr=20.0,
+            ybr=70.0,
+            occluded=0,
+            z_order=0,
+            attributes=[],
+        ),
+        Ellipse(label="test", cx=90.0, cy=10.5, rx=15.2, ry=6.0),
+    ]
+
+    for shape in shapes:
+        crop, (top, left) = shape.crop_segmentation(height=64, width=100)
+        full = shape.segmentation(height=64, width=100)
+
+        rows, cols = np.nonzero(full)
+        assert crop.sum() == full.sum() > 0
+        assert top <= rows.min() and rows.max() < top + crop.shape[0] <= 64
+        assert left <= cols.min() and cols.max() < left + crop.shape[1] <= 100
+        assert np.array_equal(
+            full[top : top + crop.shape[0], left : left + crop.shape[1]], crop
+        )
+
+    # Shapes outside of the image give empty crops
+    outside = Ellipse(label="test", cx=-50.0, cy=10.0, rx=5.0, ry=5.0)
+    crop, _ = outside.crop_segmentation(height=64, width=100)
+    assert not crop.any()
+
+
+def full_canvas_segmentation(points, height, width):
+    image = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(image).polygon(points, outline=1, fill=1)
+    return np.array(image).astype(bool)
+
+
+def test_polygon_crossing_image_edge_matches_full_canvas():
+    """Test polygons that cross the image edge against drawing on the full image."""
+    for points in [
+        [(-30000.0, -30000.0), (50.0, 10.0), (90.0, 90.0)],
+        [(-20.0, 30.0), (60.0, -15.5), (130.0, 70.0), (40.0, 95.0)],
+        [(80.0, 20.0), (140.0, 50.0), (90.0, 120.0), (60.0, 60.0)],
+        [(10.0, 10.0), (20000.0, 15.0), (15.0, 20000.0)],
+    ]:
+        polygon = Polygon(
+            label="test",
+            source="manual",
+            occluded=0,
+            points=points,
+            z_order=0,
+            attributes=[],
+        )
+        assert np.array_equal(
+            polygon.segmentation(height=100, width=100),
+            full_canvas_segmentation(points, height=100, width=100),
+        )
+
+
+def test_random_interior_polygons_match_full_canvas():
+    """Test that the segmentation of random polygons is exactly the full image
+    rasterization."""
+    rng = np.random.default_rng(0)
+    cases = [
+        ([(42.0, 17.0), (44.0, 7.0), (35.0, 29.0), (28.0, 44.0), (4.0, 45.0)], 50, 60)
+    ]
+    for _ in range(500):
+        height, width = (int(size) for size in rng.integers(20, 120, size=2))
+        n_points = rng.integers(3, 9)
+        points = [
+            (float(x), float(y))
+            for x, y in zip(
+                rng.uniform(0, width - 1, size=n_points),
+                rng.uniform(0, height - 1, size=n_points),
+            )
+        ]
+        cases.append((points, height, width))
+
+    for points, height, width in cases:
+        polygon = Polygon(
+            label="test",
+            source="manual",
+            occluded=0,
+            points=points,
+            z_order=0,
+            attributes=[],
+        )
+        assert np.array_equal(
+            polygon.segmentation(height, width),
+            full_canvas_segmentation(points, height, width),
+        )
@@ -0,0 +1,101 @@
+import copy
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+import next_cvat
+from next_cvat.client.frame_cache import FrameCache
+
+HOST = "app.cvat.ai"
+
+
+def test_frame_cache_get_put(tmp_path):
+    cache = FrameCache(directory=tmp_path)
+
+    assert cache.get(HOST, 1, 0) is None
+
+    cache.put_(HOST, 1, 0, b"image")
+
+    assert cache.get(HOST, 1, 0) == b"image"
+    assert cache.get(HOST, 1, 0, quality="original") is None
+    assert cache.get(HOST, 2, 0) is None
+    assert cache.get("https://cvat.example.com:8080", 1, 0) is None
+
+
+def test_frame_cache_deduplicates(tmp_path):
+    cache = FrameCache(directory=tmp_path)
+
+    cache.put_(HOST, 1, 0, b"image").put_("other.host", 2, 5, b"image")
+
+    assert cache.get("other.host", 2, 5) == b"image"
+    assert len(list(cache._objects())) == 1
+
+
+def test_frame_cache_evicts_least_recently_used(tmp_path):
+    cache = FrameCache(directory=tmp_path, max_bytes=10, low_watermark=1.0)
+
+    cache.put_(HOST, 1, 0, b"a" * 4).put_(HOST, 1, 1, b"b" * 4)
+    for frame_id, mtime in [(0, 1_000_000), (1, 2_000_000)]:
+        digest = cache._ref_path(HOST, 1, frame_id, None).read_text()
+        os.utime(cache._object_path(digest), (mtime, mtime))
+
+    cache.get(HOST, 1, 0)
+    cache.put_(HOST, 1, 2, b"c" * 4)
+
+    assert cache.get(HOST, 1, 0) == b"a" * 4
+    assert cache.get(HOST, 1, 1) is None
+    assert cache.get(HOST, 1, 2) == b"c" * 4
+
+
+def test_frame_cache_evicts_to_low_watermark(tmp_path, monkeypatch):
+    cache = FrameCache(directory=tmp_path, max_bytes=100, low_watermark=0.5)
+    scans = []
+    objects = FrameCache._objects
+    monkeypatch.setattr(
+        FrameCache, "_objects", lambda self: scans.append(1) or objects(self)
+    )
+
+    for frame_id in range(30):
+        cache.put_(HOST, 1, frame_id, bytes([frame_id]) * 10)
+
+    # One scan for the initial size, then one whenever the cache overflows
+    assert len(scans) == 1 + 4
+    assert cache._size == sum(path.stat().st_size for path in objects(cache))
+    assert cache._size <= 100
+    assert cache.get(HOST, 1, 29) is not None
+
+
+def test_frame_cache_clear(tmp_path):
+    cache = FrameCache(directory=tmp_path).put_(HOST, 1, 0, b"image")
+
+    cache.clear_()
+
+    assert cache.get(HOST, 1, 0) is None
+
+
+def test_frame_cache_pickles_and_compares_by_fields(tmp_path):
+    cache = FrameCache(directory=tmp_path).put_(HOST, 1, 0, b"image")
+    client = next_cvat.Client(token="token", frame_cache=cache)
+
+    assert cache == FrameCache(directory=tmp_path)
+    for copied in [pickle.loads(pickle.dumps(client)), copy.deepcopy(client)]:
+        assert copied == client
+        assert copied.frame_cache.get(HOST, 1, 0) == b"image"
+
+
+def test_download_frames(tmp_path):
+    if not Path(".env.cvat.secrets").exists():
+        pytest.skip("No secrets file found")
+
+    client = next_cvat.Client.from_env_file(".env.cvat.secrets")
+    client.frame_cache = FrameCache(directory=tmp_path / "cache")
+
+    task = client.project(198488).task(999670)
+    task.download_frames_(frame_ids=[0, 1], dest=tmp_path / "images")
+
+    frame = task.frame(frame_id=0)
+    assert (tmp_path / "images" / frame.frame_info.name).read_bytes() == (
+        client.frame_cache.get(client.host, task.id, 0)
+    )
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from next_cvat.types import Box, Ellipse, ImageAnnotation, Mask, Polygon
+
+
+def test_label_map_respects_z_order_and_occlusion():
+    segmentation = np.zeros((20, 30), dtype=bool)
+    segmentation[0:10, 0:10] = True
+
+    image = ImageAnnotation(
+        id="1",
+        name="image.jpg",
+        width=30,
+        height=20,
+        boxes=[
+            Box(
+                label="road",
+                xtl=5.0,
+                ytl=5.0,
+                xbr=25.0,
+                ybr=15.0,
+                occluded=0,
+                z_order=1,
+                attributes=[],
+            )
+        ],
+        polygons=[
+            Polygon(
+                label="other",
+                source="manual",
+                occluded=0,
+                points=[(0.0, 0.0), (29.0, 0.0), (29.0, 19.0)],
+                z_order=0,
+                attributes=[],
+            )
+        ],
+        masks=[
+            Mask.from_segmentation(segmentation, label="vegetation", z_order=1),
+        ],
+        ellipses=[
+            Ellipse(label="vegetation", cx=20.0, cy=10.0, rx=3.0, ry=3.0, occluded=1)
+        ],
+    )
+    label_indices = {"vegetation": 1, "road": 2}
+
+    label_map = image.label_map(label_indices)
+
+    expected = np.zeros((20, 30), dtype=np.uint8)
+    expected[image.ellipses[0].segmentation(20, 30)] = 1
+    expected[image.boxes[0].segmentation(20, 30)] = 2
+    expected[segmentation] = 1
+    assert label_map.dtype == np.uint8
+    assert np.array_equal(label_map, expected)
+
+    # The occluded ellipse at z_order 0 is covered by the box at z_order 1
+    assert label_map[10, 20] == 2
+
+    # Within the same z_order occluded shapes are drawn first
+    assert label_map[7, 7] == 1
+    image.masks[0] = image.masks[0].model_copy(update=dict(occluded=1))
+    assert image.label_map(label_indices)[7, 7] == 2
+
+    buffer = np.full((20, 30), 7, dtype=np.uint16)
+    assert image.label_map(label_indices, out=buffer, include_occluded=False) is buffer
+    assert set(np.unique(buffer)) == {0, 2}
+
+    with pytest.raises(ValueError, match="does not fit"):
+        image.label_map({"road": 256})
+
+
+def test_instance_maps_into_memmap(tmp_path):
+    first = np.zeros((20, 30), dtype=bool)
+    first[2:12, 3:15] = True
+    second = np.zeros((20, 30), dtype=bool)
+    second[8:18, 10:25] = True
+
+    image = ImageAnnotation(
+        id="1",
+        name="image.jpg",
+        width=30,
+        height=20,
+        masks=[
+            Mask.from_segmentation(second, label="road", z_order=1),
+            Mask.from_segmentation(first, label="vegetation"),
+        ],
+        ellipses=[Ellipse(label="unknown", cx=5.0, cy=5.0, rx=2.0, ry=2.0)],
+    )
+    instance_out = np.lib.format.open_memmap(
+        tmp_path / "instances.npy", mode="w+", dtype=np.int32, shape=(2, 20, 30)
+    )
+
+    maps = image.instance_maps(
+        {"vegetation": 1, "road": 2}, instance_out=instance_out[1]
+    )
+
+    expected = np.zeros((20, 30), dtype=np.int32)
+    expected[first] = 1
+    expected[second] = 2
+    assert np.shares_memory(maps.instance_map, instance_out)
+    assert np.array_equal(instance_out[1], expected)
+    assert maps.instance_classes.tolist() == [0, 1, 2]
+    assert maps.instance_shapes == [image.masks[1], image.masks[0]]
+    assert np.array_equal(maps.class_map, maps.instance_classes[maps.instance_map])
+    assert np.array_equal(
+        maps.class_map > 0, image.label_map({"vegetation": 1, "road": 2}) > 0
+    )
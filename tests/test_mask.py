@@ -47,3 +47,150 @@ def test_mask_from_rgba():
     mask_from_pil = Mask.from_segmentation(rgba_image, label="test")
     result_from_pil = mask_from_pil.segmentation(height=10, width=10)
     assert np.array_equal(result_from_pil, expected), "RGBA PIL Image mask conversion failed"
+
+
+def test_mask_rle_is_stored_as_array():
+    mask = Mask(
+        label="test",
+        source="test",
+        occluded=0,
+        z_order=0,
+        rle="0, 3, 2, 5, 4, 1",
+        top=0,
+        left=0,
+        height=5,
+        width=3,
+        attributes=[],
+    )
+
+    assert mask.rle.dtype == np.uint32
+    assert mask.rle.tolist() == [0, 3, 2, 5, 4, 1]
+    assert mask.model_dump()["rle"] == "0, 3, 2, 5, 4, 1"
+    assert Mask.model_validate_json(mask.model_dump_json()) == mask
+    assert mask != mask.model_copy(update=dict(rle=np.array([0, 3, 2, 5, 5])))
+    assert mask.request(frame=0, label_id=1).points[:6] == [0, 3, 2, 5, 4, 1]
+
+    with pytest.raises(ValueError):
+        Mask(**dict(mask, rle="0, 3, x"))
+
+
+def test_mask_metrics_from_runs():
+    """Test that metrics computed from the runs match the decoded mask."""
+    rng = np.random.default_rng(0)
+    segmentation = np.zeros((40, 50), dtype=bool)
+    segmentation[5:30, 10:45] = rng.random((25, 35)) < 0.6
+    mask = Mask.from_segmentation(segmentation, label="test")
+
+    rows, cols = np.nonzero(segmentation)
+    assert mask.area() == segmentation.sum()
+    assert np.allclose(mask.centroid(), (cols.mean(), rows.mean()))
+    assert mask.tight_bbox() == (
+        cols.min(),
+        rows.min(),
+        cols.max() + 1,
+        rows.max() + 1,
+    )
+
+    extent_rows, lefts, rights = mask.row_extents()
+    assert extent_rows.tolist() == np.unique(rows).tolist()
+    assert lefts.tolist() == [cols[rows == row].min() for row in extent_rows]
+    assert rights.tolist() == [cols[rows == row].max() + 1 for row in extent_rows]
+
+    assert mask.count_in_rect(0, 0, 50, 40) == segmentation.sum()
+    assert mask.count_in_rect(12, 7, 20, 25) == segmentation[7:25, 12:20].sum()
+    assert mask.count_in_rect(0, 0, 5, 5) == 0
+
+    empty = Mask(**dict(mask, rle=str(mask.height * mask.width)))
+    assert empty.area() == 0
+    with pytest.raises(ValueError, match="empty"):
+        empty.centroid()
+
+
+def test_mask_set_operations_from_runs():
+    """Test that set operations on the runs match operations on the arrays."""
+    rng = np.random.default_rng(0)
+    first = np.zeros((40, 50), dtype=bool)
+    first[5:30, 10:35] = rng.random((25, 25)) < 0.7
+    second = np.zeros((40, 50), dtype=bool)
+    second[15:38, 20:48] = rng.random((23, 28)) < 0.7
+    first_mask = Mask.from_segmentation(first, label="test")
+    second_mask = Mask.from_segmentation(second, label="test")
+
+    assert first_mask | second_mask == Mask.from_segmentation(first | second, "test")
+    assert first_mask & second_mask == Mask.from_segmentation(first & second, "test")
+    assert first_mask - second_mask == Mask.from_segmentation(first & ~second, "test")
+    assert first_mask ^ second_mask == Mask.from_segmentation(first ^ second, "test")
+
+    assert np.isclose(
+        first_mask.iou(second_mask), (first & second).sum() / (first | second).sum()
+    )
+    assert np.isclose(
+        first_mask.dice(second_mask),
+        2 * (first & second).sum() / (first.sum() + second.sum()),
+    )
+
+    # Empty results are masks of the common frame without foreground
+    corner = np.zeros((40, 50), dtype=bool)
+    corner[:3, :3] = True
+    disjoint = Mask.from_segmentation(corner, "test")
+    for empty in [first_mask - first_mask, disjoint & second_mask]:
+        assert empty.area() == 0
+        assert not empty.segmentation(height=40, width=50).any()
+        assert empty.iou(first_mask) == 0.0
+    empty = first_mask - first_mask
+    assert (empty.top, empty.left, empty.height, empty.width) == (
+        first_mask.top,
+        first_mask.left,
+        first_mask.height,
+        first_mask.width,
+    )
+    assert empty | second_mask == second_mask
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_masks_from_segmentations(workers):
+    rng = np.random.default_rng(0)
+    segmentations = rng.random((5, 20, 30)) < 0.1
+    segmentations[1] = False
+    segmentations[1, 19, 29] = True
+    segmentations[2] = True
+    labels = ["a", "b", "c", "d", "e"]
+
+    masks = Mask.from_segmentations(segmentations, labels, workers=workers)
+
+    assert masks == [
+        Mask.from_segmentation(segmentation, label)
+        for segmentation, label in zip(segmentations, labels)
+    ]
+
+    segmentations[3] = False
+    with pytest.raises(ValueError, match="empty segmentation 3"):
+        Mask.from_segmentations(segmentations, "a", workers=workers)
+
+
+def test_masks_from_label_map():
+    rng = np.random.default_rng(0)
+    label_map = rng.integers(0, 4, (20, 30)).astype(np.uint8)
+    label_map[:5] = 0
+
+    masks = Mask.from_label_map(label_map, {1: "a", 3: "c", 5: "e"})
+
+    assert masks == [
+        Mask.from_segmentation(label_map == 1, "a"),
+        Mask.from_segmentation(label_map == 3, "c"),
+    ]
+
+
+def test_masks_from_label_map_with_large_unused_index():
+    label_map = np.zeros((40, 50), dtype=np.int32)
+    label_map[3:9, 4:12] = 1
+    label_map[20:30, 30:45] = 2
+    label_map[0, 0] = 2**31 - 1
+
+    masks = Mask.from_label_map(label_map, {1: "a", 2: "b", 7: "g"})
+
+    assert masks == [
+        Mask.from_segmentation(label_map == 1, "a"),
+        Mask.from_segmentation(label_map == 2, "b"),
+    ]
+    assert Mask.from_label_map(label_map, {}) == []
@@ -1,4 +1,5 @@
 import time
+import tracemalloc
 from typing import Tuple
 
 import numpy as np
@@ -213,3 +214,70 @@ def test_edge_cases():
             f"Decoding mismatch for case shape {test_case.shape}:\n"
             f"Different elements: {np.sum(fast_decoded != slow_decoded)}"
         )
+
+
+def test_large_mask_decoding_is_linear():
+    """Test that decoding a large mask is fast and only allocates the output."""
+    height, width = 4000, 4000
+    rows, cols = np.ogrid[:height, :width]
+    disk = (rows - 2000) ** 2 + (cols - 2000) ** 2 < 1500**2
+
+    mask = Mask(
+        label="test",
+        source="test",
+        occluded=0,
+        z_order=0,
+        rle=Mask.rle_encode(disk),
+        top=0,
+        left=0,
+        height=height,
+        width=width,
+        attributes=[],
+    )
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    decoded_mask = mask.rle_decode()
+    decoding_time = time.perf_counter() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\nDecoding {height}x{width} mask:")
+    print(f"Time: {decoding_time:.4f} seconds")
+    print(f"Peak memory: {peak_memory / 1e6:.1f} MB")
+
+    assert np.array_equal(decoded_mask, disk)
+    assert decoding_time < 0.5, f"Decoding took too long: {decoding_time:.4f} seconds"
+    assert peak_memory < 2 * disk.nbytes, f"Decoding used {peak_memory} bytes"
+
+    # Decoding into a reused buffer does not allocate a mask-sized array
+    buffer = np.ones((height, width), dtype=bool)
+    tracemalloc.start()
+    assert mask.rle_decode(out=buffer) is buffer
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert np.array_equal(buffer, disk)
+    assert peak_memory < disk.nbytes / 10, f"Decoding used {peak_memory} bytes"
+
+
+def test_rle_decode_validates_run_lengths():
+    """Test that run lengths that do not cover the mask are rejected."""
+    mask = Mask(
+        label="test",
+        source="test",
+        occluded=0,
+        z_order=0,
+        rle="1,2",
+        top=0,
+        left=0,
+        height=2,
+        width=2,
+        attributes=[],
+    )
+
+    with pytest.raises(ValueError, match="do not add up"):
+        mask.rle_decode()
+
+    with pytest.raises(ValueError, match="Output must be"):
+        Mask(**dict(mask, rle="1,3")).rle_decode(out=np.zeros((2, 2), dtype=np.uint8))
@@ -0,0 +1,83 @@
+import copy
+import pickle
+import time
+
+from next_cvat import Client
+from next_cvat.client.metadata_cache import MetadataCache
+from next_cvat.client.task import Task
+
+
+def test_metadata_cache_loads_once():
+    cache = MetadataCache()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return [1, 2]
+
+    assert cache.get_or_load("key", load) == [1, 2]
+    assert cache.get_or_load("key", load) == [1, 2]
+    assert len(calls) == 1
+
+    cache.invalidate_("key")
+    cache.get_or_load("key", load)
+    assert len(calls) == 2
+
+
+def test_metadata_cache_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = MetadataCache(ttl=10)
+
+    cache.get_or_load("key", lambda: "old")
+    now[0] += 5
+    assert cache.get_or_load("key", lambda: "new") == "old"
+    now[0] += 10
+    assert cache.get_or_load("key", lambda: "new") == "new"
+
+
+def test_metadata_cache_evicts_least_recently_used():
+    cache = MetadataCache(max_entries=2)
+
+    cache.get_or_load("a", lambda: "a")
+    cache.get_or_load("b", lambda: "b")
+    cache.get_or_load("a", lambda: "unused")
+    cache.get_or_load("c", lambda: "c")
+
+    assert cache.get_or_load("a", lambda: "reloaded") == "a"
+    assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+
+
+def test_task_frames_cached_per_client(monkeypatch):
+    calls = []
+
+    def load_frames(self):
+        calls.append(self.id)
+        return []
+
+    monkeypatch.setattr(Task, "_load_frames", load_frames)
+    client = Client(username="user", password="password")
+
+    client.project(1).task(2).frames()
+    client.project(1).task(2).frames()
+    client.project(1).task(3).frames()
+    assert calls == [2, 3]
+
+    client.project(1).task(2).invalidate_frames_().frames()
+    assert calls == [2, 3, 2]
+
+    Client(username="user", password="password").project(1).task(2).frames()
+    assert calls == [2, 3, 2, 2]
+
+
+def test_client_copies_start_with_empty_metadata_cache(monkeypatch):
+    monkeypatch.setattr(Task, "_load_frames", lambda self: [])
+    client = Client(username="user", password="password")
+    client.project(1).task(2).frames()
+
+    assert client == Client(username="user", password="password")
+    for copied in [pickle.loads(pickle.dumps(client)), copy.deepcopy(client)]:
+        assert copied == client
+        assert copied.metadata_cache is not client.metadata_cache
+        assert copied.metadata_cache._entries == {}
+    assert pickle.loads(pickle.dumps(client.metadata_cache))._entries == {}
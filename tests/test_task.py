@@ -57,4 +57,39 @@ def test_delete_frame(tmp_path):
     finally:
         # Clean up - delete the task
         project.delete_task_(task.id)
-        print(f"Cleaned up task {task.id}") 
\ No newline at end of file
+        print(f"Cleaned up task {task.id}") 
+
+
+def test_frame_lookup(monkeypatch):
+    from cvat_sdk.api_client import models
+
+    from next_cvat.client.frame import Frame
+    from next_cvat.client.task import Task
+
+    task = Client(username="user", password="password").project(1).task(2)
+    frames = [
+        Frame(
+            task=task,
+            id=frame_id,
+            frame_info=models.FrameMeta(
+                width=10, height=10, name=name, related_files=0
+            ),
+        )
+        for frame_id, name in enumerate(["a/1.png", "a/2.png", "b/2.png"])
+    ]
+    monkeypatch.setattr(Task, "frames", lambda self: frames)
+
+    assert task.frame(frame_id=1) is frames[1]
+    assert task.frame(name="b/2.png") is frames[2]
+    assert task.frame(image_name="1.png") is frames[0]
+    assert task.frame(image_name="2.png", name="a/2.png") is frames[1]
+
+    with pytest.raises(ValueError, match="Multiple frames"):
+        task.frame(image_name="2.png")
+    with pytest.raises(ValueError, match="not found"):
+        task.frame(frame_id=1, image_name="1.png")
+    with pytest.raises(ValueError, match="not found"):
+        task.frame(image_name="3.png")
+
+    # The lookup indexes are not part of the task
+    assert task == Client(username="user", password="password").project(1).task(2)
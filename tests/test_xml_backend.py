@@ -0,0 +1,38 @@
+import pytest
+
+from next_cvat import Annotations, Attribute
+from next_cvat.xml_backend import XMLBackend
+
+
+def test_backends_write_identical_bytes(tmp_path):
+    """Test that lxml and ElementTree produce the same XML file."""
+    pytest.importorskip("lxml")
+
+    annotations = Annotations.from_path("tests/mask_annotations.xml", backend="etree")
+    assert Annotations.from_path("tests/mask_annotations.xml", backend="lxml") == (
+        annotations
+    )
+
+    annotations.images[0].masks[0].attributes.append(
+        Attribute(name="note", value='a "quoted" <tag> & \ttab')
+    )
+    annotations.images[0].masks[1].attributes.append(Attribute(name="empty", value=""))
+
+    etree_path = tmp_path / "etree.xml"
+    lxml_path = tmp_path / "lxml.xml"
+    annotations.save_xml_(etree_path, backend="etree")
+    annotations.save_xml_(lxml_path, backend="lxml")
+
+    assert etree_path.read_bytes() == lxml_path.read_bytes()
+    assert Annotations.from_path(lxml_path, backend="lxml") == Annotations.from_path(
+        etree_path, backend="etree"
+    )
+
+
+def test_backend_selection():
+    """Test automatic and explicit backend selection."""
+    assert XMLBackend.from_name("etree").name == "etree"
+    assert XMLBackend.from_name("auto").name in ("lxml", "etree")
+
+    with pytest.raises(ValueError, match="Unknown XML backend"):
+        XMLBackend.from_name("minidom")